@@ -0,0 +1,26 @@
+"""add_bid_max_amount
+
+Revision ID: 361c40eb8758
+Revises: fcc478226fa3
+Create Date: 2026-10-18 11:03:27.940112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '361c40eb8758'
+down_revision: Union[str, None] = 'fcc478226fa3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('bids', sa.Column('max_amount', sa.Numeric(precision=12, scale=2), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('bids', 'max_amount')
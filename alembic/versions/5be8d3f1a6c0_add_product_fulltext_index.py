@@ -0,0 +1,27 @@
+"""add_product_fulltext_index
+
+Revision ID: 5be8d3f1a6c0
+Revises: a41c6e0b9d27
+Create Date: 2026-10-18 15:52:18.604117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5be8d3f1a6c0'
+down_revision: Union[str, None] = 'a41c6e0b9d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ft_products_title_description', 'products', ['title', 'description'], unique=False, mysql_prefix='FULLTEXT'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ft_products_title_description', table_name='products')
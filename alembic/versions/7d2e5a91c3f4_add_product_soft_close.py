@@ -0,0 +1,28 @@
+"""add_product_soft_close
+
+Revision ID: 7d2e5a91c3f4
+Revises: 361c40eb8758
+Create Date: 2026-10-18 13:42:09.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2e5a91c3f4'
+down_revision: Union[str, None] = '361c40eb8758'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('products', sa.Column('soft_close_window_seconds', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('products', sa.Column('soft_close_extension_seconds', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('products', 'soft_close_extension_seconds')
+    op.drop_column('products', 'soft_close_window_seconds')
@@ -0,0 +1,47 @@
+"""add_product_bid_count_and_sort_indexes
+
+Revision ID: 9a2c4e7d1b35
+Revises: e81b4d6f0a52
+Create Date: 2026-10-18 21:14:06.582913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a2c4e7d1b35'
+down_revision: Union[str, None] = 'e81b4d6f0a52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_products_category_end_id', 'products', ['category_id', 'auction_end_at', 'id']),
+    ('ix_products_price_id', 'products', ['current_price', 'id']),
+    ('ix_products_status_price_id', 'products', ['status', 'current_price', 'id']),
+    ('ix_products_category_price_id', 'products', ['category_id', 'current_price', 'id']),
+    ('ix_products_bids_id', 'products', ['bid_count', 'id']),
+    ('ix_products_status_bids_id', 'products', ['status', 'bid_count', 'id']),
+    ('ix_products_category_bids_id', 'products', ['category_id', 'bid_count', 'id']),
+]
+
+
+def upgrade() -> None:
+    op.add_column('products', sa.Column('bid_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        """
+        UPDATE products SET bid_count = (
+            SELECT COUNT(*) FROM bids b WHERE b.product_id = products.id
+        )
+        """
+    )
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    op.drop_column('products', 'bid_count')
@@ -0,0 +1,39 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: a41c6e0b9d27
+Revises: 7d2e5a91c3f4
+Create Date: 2026-10-18 15:07:44.281930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41c6e0b9d27'
+down_revision: Union[str, None] = '7d2e5a91c3f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_products_created_id', 'products', ['created_at', 'id']),
+    ('ix_products_status_created_id', 'products', ['status', 'created_at', 'id']),
+    ('ix_products_seller_created_id', 'products', ['seller_id', 'created_at', 'id']),
+    ('ix_products_category_created_id', 'products', ['category_id', 'created_at', 'id']),
+    ('ix_bids_product_created_id', 'bids', ['product_id', 'created_at', 'id']),
+    ('ix_bids_bidder_created_id', 'bids', ['bidder_id', 'created_at', 'id']),
+    ('ix_orders_buyer_created_id', 'orders', ['buyer_id', 'created_at', 'id']),
+    ('ix_orders_seller_created_id', 'orders', ['seller_id', 'created_at', 'id']),
+    ('ix_favorites_user_created_product', 'favorites', ['user_id', 'created_at', 'product_id']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,26 @@
+"""add_product_version
+
+Revision ID: c3f7e1a29b84
+Revises: 5be8d3f1a6c0
+Create Date: 2026-10-18 18:52:40.318275
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f7e1a29b84'
+down_revision: Union[str, None] = '5be8d3f1a6c0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('products', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('products', 'version')
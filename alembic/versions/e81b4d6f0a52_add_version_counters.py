@@ -0,0 +1,31 @@
+"""add_version_counters
+
+Revision ID: e81b4d6f0a52
+Revises: c3f7e1a29b84
+Create Date: 2026-10-18 19:14:05.772931
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e81b4d6f0a52'
+down_revision: Union[str, None] = 'c3f7e1a29b84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    version_counters = op.create_table('version_counters',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('value', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(version_counters, [{'name': 'categories', 'value': 1}])
+
+
+def downgrade() -> None:
+    op.drop_table('version_counters')
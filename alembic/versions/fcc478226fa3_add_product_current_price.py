@@ -0,0 +1,55 @@
+"""add_product_current_price
+
+Revision ID: fcc478226fa3
+Revises: bc47fb228408
+Create Date: 2026-10-18 09:12:40.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fcc478226fa3'
+down_revision: Union[str, None] = 'bc47fb228408'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('products', sa.Column('current_price', sa.Numeric(precision=12, scale=2), nullable=True))
+    op.add_column('products', sa.Column('leading_bid_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('fk_products_leading_bid', 'products', 'bids', ['leading_bid_id'], ['id'])
+
+    # Backfill from existing bids: the leader is the highest bid, earliest first on ties
+    op.execute(
+        """
+        UPDATE products SET leading_bid_id = (
+            SELECT b.id FROM bids b
+            WHERE b.product_id = products.id
+            ORDER BY b.amount DESC, b.id ASC
+            LIMIT 1
+        )
+        """
+    )
+    op.execute(
+        """
+        UPDATE products SET current_price = COALESCE(
+            (SELECT MAX(b.amount) FROM bids b WHERE b.product_id = products.id),
+            starting_price
+        )
+        """
+    )
+    op.alter_column(
+        'products', 'current_price',
+        existing_type=sa.Numeric(precision=12, scale=2),
+        nullable=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('fk_products_leading_bid', 'products', type_='foreignkey')
+    op.drop_column('products', 'leading_bid_id')
+    op.drop_column('products', 'current_price')
@@ -8,11 +8,17 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import CurrentUser
 from app.core.database import get_db
+from app.core.singleflight import single_flight
 from app.models import Bid, Favorite, Product, ProductStatus, User
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
 
+def _shared_rows(db: Session, key: tuple, stmt) -> list[dict]:
+    """Run `stmt` once for every concurrent request with the same `key`."""
+    return single_flight.do(("analytics",) + key, lambda: [dict(row._mapping) for row in db.execute(stmt).all()])
+
+
 @router.get("/trending-products")
 def trending_products(
     db: Annotated[Session, Depends(get_db)],
@@ -29,7 +35,7 @@ def trending_products(
         .having(func.count(Favorite.product_id) >= min_favorites)
         .order_by(desc("favorite_count"))
     )
-    return [dict(row._mapping) for row in db.execute(stmt).all()]
+    return _shared_rows(db, ("trending-products", min_favorites), stmt)
 
 
 @router.get("/seller-bid-stats")
@@ -51,7 +57,7 @@ def seller_bid_stats(
         .having(func.count(Bid.id) >= 1)
         .order_by(desc("bid_count"))
     )
-    return [dict(row._mapping) for row in db.execute(stmt).all()]
+    return _shared_rows(db, ("seller-bid-stats", current_user.id), stmt)
 
 
 @router.get("/outbid-bids")
@@ -75,7 +81,7 @@ def outbid_bids(
         .where(Bid.bidder_id == current_user.id, Bid.amount < max_bid_subq.c.max_amount)
         .order_by(desc(max_bid_subq.c.max_amount))
     )
-    return [dict(row._mapping) for row in db.execute(stmt).all()]
+    return _shared_rows(db, ("outbid-bids", current_user.id), stmt)
 
 
 @router.get("/active-without-bids")
@@ -88,7 +94,7 @@ def active_without_bids(
         .where(Product.status == ProductStatus.ACTIVE, ~has_bids)
         .order_by(Product.auction_end_at.asc())
     )
-    return [dict(row._mapping) for row in db.execute(stmt).all()]
+    return _shared_rows(db, ("active-without-bids",), stmt)
 
 
 @router.get("/top-bidders")
@@ -107,4 +113,4 @@ def top_bidders(
         .having(func.count(Bid.id) >= min_bids)
         .order_by(desc("bid_count"))
     )
-    return [dict(row._mapping) for row in db.execute(stmt).all()]
+    return _shared_rows(db, ("top-bidders", min_bids), stmt)
@@ -1,24 +1,43 @@
+from datetime import datetime
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.core.security import create_access_token, get_password_hash, verify_password
-from app.models import User
-from app.schemas import Token, UserCreate, UserResponse
-from app.api.deps import CurrentUser
+from app.core.password_hasher import HasherBusy, password_hasher
+from app.core.refresh_tokens import issue_refresh_token, revoke_refresh_family, rotate_refresh_token
+from app.core.revocation import revocation_list
+from app.core.security import create_access_token
+from app.models import RevokedToken, User
+from app.schemas import RefreshRequest, Token, UserCreate, UserResponse
+from app.api.deps import CurrentUser, authenticate_token, oauth2_scheme
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+def _too_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many sign-in attempts, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 def register(
     user_in: UserCreate,
     db: Annotated[Session, Depends(get_db)],
 ):
     """Register a new user."""
+    # Hash before touching the database, so no pooled connection waits on bcrypt
+    try:
+        password_hash = password_hasher.hash(user_in.password)
+    except HasherBusy:
+        raise _too_busy()
+
     # Check if email already exists
     existing_user = db.query(User).filter(User.email == user_in.email).first()
     if existing_user:
@@ -30,7 +49,7 @@ def register(
     # Create new user
     user = User(
         email=user_in.email,
-        password_hash=get_password_hash(user_in.password),
+        password_hash=password_hash,
         full_name=user_in.full_name,
         phone_number=user_in.phone_number,
         role=user_in.role,
@@ -48,15 +67,56 @@ def login(
 ):
     """Login and get access token."""
     user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.password_hash):
+    user_id, role, password_hash = (user.id, user.role, user.password_hash) if user else (None, None, None)
+    # Hand the connection back to the pool while bcrypt runs; a login storm would otherwise drain it
+    db.rollback()
+
+    verified, new_hash = False, None
+    if user_id is not None:
+        try:
+            verified, new_hash = password_hasher.verify_and_update(form_data.password, password_hash)
+        except HasherBusy:
+            raise _too_busy()
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        # Stored at another bcrypt cost; rehash now that we have the password
+        db.query(User).filter(User.id == user_id).update({User.password_hash: new_hash}, synchronize_session=False)
+    refresh_token, family_id = issue_refresh_token(db, user_id)
+    db.commit()
 
-    access_token = create_access_token(data={"sub": user.id})
-    return Token(access_token=access_token)
+    access_token = create_access_token(data={"sub": user_id, "role": role.value, "sid": family_id})
+    return Token(access_token=access_token, refresh_token=refresh_token)
+
+
+@router.post("/refresh", response_model=Token)
+def refresh(
+    body: RefreshRequest,
+    db: Annotated[Session, Depends(get_db)],
+):
+    """Exchange a refresh token for a new access token and a new refresh token.
+
+    Each refresh token works once. Presenting one that was already used
+    logs out the session it belongs to.
+    """
+    invalid = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired refresh token",
+    )
+    rotated = rotate_refresh_token(db, body.refresh_token)
+    if rotated is None:
+        raise invalid
+    user_id, family_id, refresh_token = rotated
+    role = db.query(User.role).filter(User.id == user_id).scalar()
+    if role is None:
+        raise invalid
+
+    access_token = create_access_token(data={"sub": user_id, "role": role.value, "sid": family_id})
+    return Token(access_token=access_token, refresh_token=refresh_token)
 
 
 @router.get("/me", response_model=UserResponse)
@@ -66,6 +126,30 @@ def get_current_user_info(current_user: CurrentUser):
 
 
 @router.post("/logout")
-def logout():
-    """Logout (client should discard the token)."""
+def logout(
+    db: Annotated[Session, Depends(get_db)],
+    token: Annotated[str, Depends(oauth2_scheme)],
+):
+    """Logout by revoking the access token this request was made with and its session's refresh tokens."""
+    token_data = authenticate_token(db, token)
+    if token_data.jti is None or token_data.exp is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Token cannot be revoked",
+        )
+
+    if token_data.sid is not None:
+        revoke_refresh_family(db, token_data.sid)
+    db.add(
+        RevokedToken(
+            jti=token_data.jti,
+            user_id=token_data.sub,
+            expires_at=datetime.utcfromtimestamp(token_data.exp),
+        )
+    )
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()  # revoked by a concurrent logout
+    revocation_list.add(token_data.jti)
     return {"message": "Successfully logged out"}
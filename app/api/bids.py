@@ -1,16 +1,32 @@
 from __future__ import annotations
 
+import logging
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Annotated
+from decimal import Decimal
+from typing import Annotated, Optional, Sequence
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import desc
+from fastapi import APIRouter, Body, Depends, HTTPException, status
+from sqlalchemy import update
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import Session
 
 from app.api.deps import CurrentUser, RequireBuyer
-from app.core.database import get_db
+from app.core.auction_cache import AuctionState, auction_cache
+from app.core.auction_closer import auction_closer
+from app.core.config import settings
+from app.core.database import SessionLocal, get_db
+from app.core.events import event_broker
+from app.core.result_cache import product_tags, result_cache
+from app.core.group_commit import GroupCommitter
+from app.core.sequencer import KeyedSequencer
+from app.core.suggest import suggest_index
 from app.models import Bid, BidStatus, Order, OrderStatus, Product, ProductStatus, UserRole
-from app.schemas import BidCreate, BidResponse, OrderResponse
+from app.schemas import BidBatchResult, BidCreate, BidResponse, OrderResponse, OwnBidResponse, Page
+from app.utils.pagination import CursorParam, LimitParam, paginate
+from app.utils.proxy_bidding import ProxyBid, resolve_proxy_bids
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/bids", tags=["Bids"])
 
@@ -22,63 +38,379 @@ def get_bid_or_404(db: Session, bid_id: int) -> Bid:
     return bid
 
 
-@router.post("/", response_model=BidResponse, status_code=status.HTTP_201_CREATED)
+def _validate_bid(state: AuctionState, bid_in: BidCreate, bidder_id: int) -> None:
+    if not state.is_open(datetime.utcnow()):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Auction is not active")
+    if state.seller_id == bidder_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot bid on your own product")
+    if bidder_id == state.leading_bidder_id:
+        # The leader can only raise their ceiling; the price stays where it is
+        if (bid_in.max_amount or bid_in.amount) <= state.leading_ceiling:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="You are already the highest bidder")
+        return
+    if bid_in.amount < state.min_required:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Bid must be at least {state.min_required}",
+        )
+
+
+def _rejects_any(state: AuctionState, entries: Sequence[tuple[int, BidCreate]]) -> bool:
+    for bidder_id, bid_in in entries:
+        try:
+            _validate_bid(state, bid_in, bidder_id)
+        except HTTPException:
+            return True
+    return False
+
+
+@router.post("/", response_model=OwnBidResponse, status_code=status.HTTP_201_CREATED)
 def place_bid(
     bid_in: BidCreate,
     db: Annotated[Session, Depends(get_db)],
     current_user: RequireBuyer,
 ):
-    product = db.query(Product).filter(Product.id == bid_in.product_id).first()
-    if not product:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
-    if product.status != ProductStatus.ACTIVE or product.auction_end_at <= datetime.utcnow():
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Auction is not active")
-    if product.seller_id == current_user.id:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot bid on your own product")
+    if settings.BID_SEQUENCER_ENABLED or settings.BID_GROUP_COMMIT_ENABLED:
+        bidder_id = current_user.id
+        # Hand the pooled connection back while waiting; the writer uses its own session
+        db.close()
+        if settings.BID_SEQUENCER_ENABLED:
+            return bid_sequencer.submit(bid_in.product_id, (bidder_id, bid_in)).result()
+        return bid_group_committer.submit((bidder_id, bid_in)).result()
 
-    highest = (
-        db.query(Bid)
-        .filter(Bid.product_id == product.id)
-        .order_by(desc(Bid.amount))
-        .first()
-    )
-    min_required = product.starting_price if not highest else highest.amount + product.min_increment
-    if bid_in.amount < min_required:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Bid must be at least {min_required}",
-        )
+    result = _place_bids(db, bid_in.product_id, [(current_user.id, bid_in)])[0]
+    if isinstance(result, HTTPException):
+        raise result
+    return result
 
-    bid = Bid(product_id=product.id, bidder_id=current_user.id, amount=bid_in.amount)
-    db.add(bid)
-    db.flush()
 
-    if highest and highest.status == BidStatus.PENDING:
-        highest.status = BidStatus.OUTBID
+@router.post("/batch", response_model=list[BidBatchResult])
+def place_bids_batch(
+    bids_in: Annotated[list[BidCreate], Body(min_length=1, max_length=settings.BID_BATCH_MAX_SIZE)],
+    db: Annotated[Session, Depends(get_db)],
+    current_user: RequireBuyer,
+):
+    """Place bids on many lots at once; one result per bid, in request order.
+
+    A rejected bid does not affect the others. Accepted bids are committed
+    together. A bid that failed unexpectedly is reported as a 500 in its own
+    slot, since bids on other products may already be committed.
+    """
+    results = _place_bids_many(db, [(current_user.id, bid_in) for bid_in in bids_in])
+    batch = []
+    for result in results:
+        if isinstance(result, HTTPException):
+            batch.append(BidBatchResult(status_code=result.status_code, detail=result.detail))
+        elif isinstance(result, Exception):
+            logger.error("Bid in batch failed", exc_info=result)
+            batch.append(
+                BidBatchResult(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+            )
+        else:
+            batch.append(BidBatchResult(status_code=status.HTTP_201_CREATED, bid=OwnBidResponse.model_validate(result)))
+    return batch
+
+
+@dataclass
+class _Settlement:
+    """Bids on one product staged in the current transaction, not yet committed."""
+
+    state: AuctionState
+    results: list
+    lost_race: bool = False
+    leader: Optional[Bid] = None
+    written: list[Bid] = field(default_factory=list)
+    auction_end_at: Optional[datetime] = None
+
+
+def _place_bids(db: Session, product_id: int, entries: Sequence[tuple[int, BidCreate]]) -> list:
+    """Validate, resolve and commit bids on one product in a single transaction.
+
+    Returns one `Bid` or `HTTPException` per entry. Validation runs against the
+    cached auction state, so an acceptable bid needs no read before its
+    compare-and-set. Other workers' writes are not in this process's cache,
+    so a rejection is only returned once fresh state confirms it.
+    """
+    for _ in range(3):
+        cached = auction_cache.get(product_id) is not None
+        state = auction_cache.load(db, product_id)
+        if state is not None and cached and _rejects_any(state, entries):
+            # Another worker may have moved the auction; never refuse a bid on this process's copy alone
+            state = auction_cache.reload(db, product_id)
+        if state is None:
+            not_found = HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+            return [not_found] * len(entries)
+        settlement = _stage_bids(db, state, entries)
+        if not settlement.lost_race:
+            break
+        db.rollback()
+        auction_cache.invalidate(product_id)
+    else:
+        conflict = HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Outbid by a concurrent bid, please retry")
+        return [conflict if result is None else result for result in settlement.results]
 
     db.commit()
-    db.refresh(bid)
-    return bid
+    _publish(db, [settlement])
+    return settlement.results
+
+
+def _stage_bids(db: Session, state: AuctionState, entries: Sequence[tuple[int, BidCreate]]) -> _Settlement:
+    """Settle bids against `state` and write them without committing.
+
+    Valid entries and the current leader are settled as proxy bids in one
+    pass: every entry is stored, losers as OUTBID at the amount they entered
+    so their ceiling stays private, and the winner at the resolved price. When the leader's proxy defends, an
+    automatic bid is written on their behalf. `lost_race` is set, and nothing
+    written, if another writer moved the product after `state` was read.
+    """
+    settlement = _Settlement(state=state, results=[])
+    challengers: list[ProxyBid] = []
+    for seq, (bidder_id, bid_in) in enumerate(entries):
+        try:
+            _validate_bid(state, bid_in, bidder_id)
+        except HTTPException as exc:
+            settlement.results.append(exc)
+            continue
+        settlement.results.append(None)
+        challengers.append(ProxyBid(bidder_id, bid_in.amount, bid_in.max_amount or bid_in.amount, seq))
+    if not challengers:
+        return settlement
+
+    incumbent = None
+    if state.leading_bid_id is not None:
+        incumbent = ProxyBid(state.leading_bidder_id, state.current_price, state.leading_ceiling, -1)
+    resolution = resolve_proxy_bids(incumbent, challengers, state.current_price, state.min_increment)
+    end_at = state.end_after_bid(datetime.utcnow())
 
+    # Compare-and-set against the leader the resolution was based on. Only the
+    # product row is locked; a batch that lost a race to another worker sees
+    # zero rows updated and is resolved again against fresh state.
+    if not _advance_price(db, state, resolution.price, end_at):
+        settlement.lost_race = True
+        return settlement
 
-@router.get("/me", response_model=list[BidResponse])
+    winner = resolution.winner
+    leader = None
+    for challenger in challengers:
+        entry = entries[challenger.seq][1]
+        if challenger is winner:
+            # A leader raising a plain bid keeps the old price; the amount they entered becomes their ceiling
+            ceiling = challenger.max_amount if challenger.max_amount > resolution.price else entry.max_amount
+            bid = Bid(product_id=state.product_id, bidder_id=challenger.bidder_id, amount=resolution.price,
+                      max_amount=ceiling, status=BidStatus.PENDING)
+            leader = bid
+        else:
+            bid = Bid(product_id=state.product_id, bidder_id=challenger.bidder_id, amount=challenger.amount,
+                      max_amount=entry.max_amount, status=BidStatus.OUTBID)
+        settlement.results[challenger.seq] = bid
+        settlement.written.append(bid)
+    if leader is None:
+        leader = Bid(product_id=state.product_id, bidder_id=winner.bidder_id, amount=resolution.price,
+                     max_amount=state.leading_max_amount, status=BidStatus.PENDING)
+        settlement.written.append(leader)
+
+    db.add_all(settlement.written)
+    db.flush()
+    _set_leader(db, state.product_id, leader.id, len(settlement.written))
+    settlement.leader = leader
+    settlement.auction_end_at = end_at
+    return settlement
+
+
+def _publish(db: Session, settlements: Sequence[_Settlement]) -> None:
+    """Reload committed bids and write the new leaders through to the cache and closer."""
+    written = [bid for s in settlements for bid in s.written]
+    if not written:
+        return
+    # Reload server defaults such as created_at in one query instead of a refresh per bid
+    db.query(Bid).filter(Bid.id.in_([bid.id for bid in written])).all()
+    tags: set[str] = set()
+    for s in settlements:
+        if s.written:
+            suggest_index.record_bids(s.state.product_id, len(s.written), s.auction_end_at)
+            tags |= product_tags(s.state.category_id, s.state.seller_id, s.state.status)
+        if s.leader is None:
+            continue
+        leader = s.leader
+        auction_cache.record_bid(
+            s.state.product_id, leader.id, leader.amount, leader.bidder_id, leader.max_amount, s.auction_end_at
+        )
+        if s.auction_end_at != s.state.auction_end_at:
+            auction_closer.schedule(s.state.product_id, s.auction_end_at)
+        event_broker.publish(
+            s.state.product_id,
+            "BidPlaced",
+            current_price=leader.amount,
+            leading_bid_id=leader.id,
+            auction_end_at=s.auction_end_at,
+        )
+    # A bid moves prices and counts but no product between lists; batch with other bids
+    result_cache.invalidate_soon(*tags)
+
+
+def _to_responses(results: Sequence) -> list:
+    return [OwnBidResponse.model_validate(r) if isinstance(r, Bid) else r for r in results]
+
+
+def _sequenced_place_bids(product_id: int, entries: Sequence[tuple[int, BidCreate]]) -> list:
+    db = SessionLocal()
+    try:
+        return _to_responses(_place_bids(db, product_id, entries))
+    finally:
+        db.close()
+
+
+def _place_bids_many(db: Session, items: Sequence[tuple[int, BidCreate]]) -> list:
+    """Write bids for many products in one transaction, one savepoint per product.
+
+    Returns one `Bid` or exception per item, and raises only if the group's
+    commit fails, in which case nothing was written. Auction state for every product
+    is read with a single `IN` query on a cache miss. A product another
+    process moved in the meantime is rolled back to its savepoint and retried
+    on its own after the group commits.
+
+    Products are staged in id order, so concurrent groups take product row
+    locks in the same order. A database error while staging, such as a
+    deadlock, ends the whole transaction rather than one savepoint; the group
+    is then rolled back and every product placed in its own transaction.
+    """
+    by_product: dict[int, list[int]] = {}
+    for index, (_, bid_in) in enumerate(items):
+        by_product.setdefault(bid_in.product_id, []).append(index)
+
+    results: list = [None] * len(items)
+    settled: list[tuple[list[int], _Settlement]] = []
+    retry: list[tuple[int, list[int]]] = []
+    cached = {product_id for product_id in by_product if auction_cache.get(product_id) is not None}
+    states = auction_cache.load_many(db, by_product)
+    try:
+        for product_id in sorted(by_product):
+            indices = by_product[product_id]
+            state = states.get(product_id)
+            if state is not None and product_id in cached and _rejects_any(state, [items[i] for i in indices]):
+                state = auction_cache.reload(db, product_id)
+            if state is None:
+                for i in indices:
+                    results[i] = HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+                continue
+            savepoint = db.begin_nested()
+            try:
+                settlement = _stage_bids(db, state, [items[i] for i in indices])
+            except DBAPIError:
+                raise
+            except Exception as exc:
+                savepoint.rollback()
+                for i in indices:
+                    results[i] = exc
+                continue
+            if settlement.lost_race:
+                savepoint.rollback()
+                auction_cache.invalidate(product_id)
+                retry.append((product_id, indices))
+                continue
+            savepoint.commit()
+            settled.append((indices, settlement))
+    except DBAPIError:
+        logger.warning("Group of %d bids failed, placing them per product", len(items), exc_info=True)
+        db.rollback()
+        settled = []
+        retry = [(product_id, by_product[product_id]) for product_id in sorted(by_product)]
+    else:
+        db.commit()
+        _publish(db, [s for _, s in settled])
+    for indices, settlement in settled:
+        for i, result in zip(indices, settlement.results):
+            results[i] = result
+
+    for product_id, indices in retry:
+        try:
+            placed = _place_bids(db, product_id, [items[i] for i in indices])
+        except Exception as exc:
+            # Other products may already be committed; fail only this one
+            db.rollback()
+            placed = [exc] * len(indices)
+        for i, result in zip(indices, placed):
+            results[i] = result
+    return results
+
+
+def _group_place_bids(items: Sequence[tuple[int, BidCreate]]) -> list:
+    db = SessionLocal()
+    try:
+        return _to_responses(_place_bids_many(db, items))
+    finally:
+        db.close()
+
+
+# Opt-in: serializes bids per product in-process so a hot auction is written by
+# one worker at a time instead of many requests contending for its row lock.
+bid_sequencer = KeyedSequencer(_sequenced_place_bids, max_workers=settings.BID_SEQUENCER_WORKERS)
+
+# Opt-in: bids arriving within a few milliseconds share one transaction and one commit.
+bid_group_committer = GroupCommitter(
+    _group_place_bids,
+    window_seconds=settings.BID_GROUP_COMMIT_WINDOW_MS / 1000,
+    max_batch=settings.BID_GROUP_COMMIT_MAX_BATCH,
+)
+
+
+def _advance_price(db: Session, state: AuctionState, price: Decimal, auction_end_at: datetime) -> bool:
+    """Compare-and-set `current_price` and `auction_end_at` if the product still has the leader and end `state` saw."""
+    leader_unchanged = (
+        Product.leading_bid_id.is_(None)
+        if state.leading_bid_id is None
+        else Product.leading_bid_id == state.leading_bid_id
+    )
+    result = db.execute(
+        update(Product)
+        .where(
+            Product.id == state.product_id,
+            Product.status == ProductStatus.ACTIVE,
+            Product.auction_end_at > datetime.utcnow(),
+            Product.auction_end_at == state.auction_end_at,
+            Product.current_price == state.current_price,
+            leader_unchanged,
+        )
+        .values(current_price=price, auction_end_at=auction_end_at, version=Product.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def _set_leader(db: Session, product_id: int, bid_id: int, bids_written: int) -> None:
+    """Point the product at its new leading bid, count the bids written and mark every other pending bid outbid."""
+    db.execute(
+        update(Product)
+        .where(Product.id == product_id)
+        .values(leading_bid_id=bid_id, bid_count=Product.bid_count + bids_written)
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        update(Bid)
+        .where(Bid.product_id == product_id, Bid.id != bid_id, Bid.status == BidStatus.PENDING)
+        .values(status=BidStatus.OUTBID)
+        .execution_options(synchronize_session=False)
+    )
+
+
+@router.get("/me", response_model=Page[OwnBidResponse])
 def list_my_bids(
     db: Annotated[Session, Depends(get_db)],
     current_user: CurrentUser,
+    cursor: Optional[str] = CursorParam,
+    limit: int = LimitParam,
 ):
-    return (
-        db.query(Bid)
-        .filter(Bid.bidder_id == current_user.id)
-        .order_by(Bid.created_at.desc())
-        .all()
-    )
+    query = db.query(Bid).filter(Bid.bidder_id == current_user.id)
+    return paginate(query, Bid.created_at, Bid.id, cursor, limit)
 
 
-@router.get("/product/{product_id}", response_model=list[BidResponse])
+@router.get("/product/{product_id}", response_model=Page[BidResponse])
 def list_product_bids(
     product_id: int,
     db: Annotated[Session, Depends(get_db)],
     current_user: CurrentUser,
+    cursor: Optional[str] = CursorParam,
+    limit: int = LimitParam,
 ):
     product = db.query(Product).filter(Product.id == product_id).first()
     if not product:
@@ -86,12 +418,8 @@ def list_product_bids(
     if current_user.role != UserRole.ADMIN and product.seller_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view bids")
 
-    return (
-        db.query(Bid)
-        .filter(Bid.product_id == product_id)
-        .order_by(Bid.created_at.desc())
-        .all()
-    )
+    query = db.query(Bid).filter(Bid.product_id == product_id)
+    return paginate(query, Bid.created_at, Bid.id, cursor, limit)
 
 
 @router.post("/{bid_id}/accept", response_model=OrderResponse)
@@ -116,6 +444,7 @@ def accept_bid(
     bid.status = BidStatus.ACCEPTED
     product.accepted_bid_id = bid.id
     product.status = ProductStatus.CLOSED
+    product.version = Product.version + 1
 
     db.query(Bid).filter(
         Bid.product_id == product.id,
@@ -134,6 +463,13 @@ def accept_bid(
     db.add(order)
     db.commit()
     db.refresh(order)
+    auction_cache.update_product(product)
+    auction_closer.unschedule(product.id)
+    suggest_index.remove(product.id)
+    result_cache.invalidate(*product_tags(product.category_id, product.seller_id, ProductStatus.ACTIVE, product.status))
+    event_broker.publish(
+        product.id, "AuctionClosed", status=product.status, winning_bid_id=bid.id, final_price=bid.amount
+    )
     return order
 
 
@@ -151,6 +487,7 @@ def reject_bid(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to reject bids")
 
     bid.status = BidStatus.REJECTED
+    product.version = Product.version + 1
     db.commit()
     db.refresh(bid)
     return bid
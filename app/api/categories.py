@@ -1,18 +1,25 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import RequireAdmin
 from app.core.database import get_db
+from app.core.versions import CATEGORIES, bump_version, current_version
 from app.models import Category
 from app.schemas import CategoryCreate, CategoryResponse
+from app.utils.http_cache import etag_matches, make_etag, not_modified, set_etag
 
 router = APIRouter(prefix="/categories", tags=["Categories"])
 
 
 @router.get("/", response_model=list[CategoryResponse])
-def list_categories(db: Annotated[Session, Depends(get_db)]):
+def list_categories(request: Request, response: Response, db: Annotated[Session, Depends(get_db)]):
+    # Read the version first: a concurrent write can then only make the body newer than its ETag
+    etag = make_etag(CATEGORIES, current_version(db, CATEGORIES))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return db.query(Category).order_by(Category.name.asc()).all()
 
 
@@ -28,6 +35,7 @@ def create_category(
 
     category = Category(name=category_in.name)
     db.add(category)
+    bump_version(db, CATEGORIES)
     db.commit()
     db.refresh(category)
     return category
@@ -1,65 +1,144 @@
 from __future__ import annotations
 
+import hashlib
+import time
 from typing import Annotated, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.revocation import revocation_list
+from app.core.user_cache import UserIdentity, user_cache
 from app.models import User, UserRole
 from app.schemas import TokenPayload
+from app.utils.ttl_cache import TTLCache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
+
+# Verified payloads by token digest, each kept until its token's exp, so a reused token is checked once
+token_cache = TTLCache(settings.TOKEN_CACHE_SIZE)
 
 
 def get_current_user(
     db: Annotated[Session, Depends(get_db)],
     token: Annotated[str, Depends(oauth2_scheme)],
-) -> User:
-    credentials_exception = HTTPException(
+) -> UserIdentity:
+    return _user_from_token(db, token)
+
+
+def get_optional_current_user(
+    db: Annotated[Session, Depends(get_db)],
+    token: Annotated[Optional[str], Depends(optional_oauth2_scheme)],
+) -> Optional[UserIdentity]:
+    """The caller if a bearer token was sent, else None; an invalid token is still a 401."""
+    if token is None:
+        return None
+    return _user_from_token(db, token)
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _forbidden() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Insufficient permissions",
+    )
+
+
+def _decode_token(token: str) -> TokenPayload:
+    # The digest covers the signature, so a tampered token never matches a verified one
+    key = hashlib.sha256(token.encode()).digest()
+    token_data = token_cache.get(key)
+    if token_data is not None:
+        return token_data
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: Optional[int] = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-        token_data = TokenPayload(sub=user_id)
-    except JWTError:
-        raise credentials_exception
-
-    user = db.query(User).filter(User.id == token_data.sub).first()
+        if payload.get("sub") is None:
+            raise _credentials_exception()
+        token_data = TokenPayload(
+            sub=payload["sub"],
+            role=payload.get("role"),
+            jti=payload.get("jti"),
+            exp=payload.get("exp"),
+            sid=payload.get("sid"),
+        )
+    except (JWTError, ValidationError):
+        raise _credentials_exception()
+    if "exp" in payload:
+        token_cache.set(key, token_data, ttl_seconds=payload["exp"] - time.time())
+    return token_data
+
+
+def authenticate_token(db: Session, token: str) -> TokenPayload:
+    """Verify a bearer token and check that it was not revoked; raises 401 otherwise."""
+    token_data = _decode_token(token)
+    # Checked on every request: a cached payload says nothing about revocations since
+    if token_data.jti is not None and revocation_list.is_revoked(db, token_data.jti):
+        raise _credentials_exception()
+    return token_data
+
+
+def _user_from_token(db: Session, token: str) -> UserIdentity:
+    return _load_user(db, authenticate_token(db, token).sub)
+
+
+def _load_user(db: Session, user_id: int) -> UserIdentity:
+    identity = user_cache.get(user_id)
+    if identity is not None:
+        return identity
+    generation = user_cache.generation()
+    user = db.query(User).filter(User.id == user_id).first()
     if user is None:
-        raise credentials_exception
-    return user
+        raise _credentials_exception()
+    return user_cache.put(user, generation)
 
 
 def get_current_active_user(
-    current_user: Annotated[User, Depends(get_current_user)],
-) -> User:
+    current_user: Annotated[UserIdentity, Depends(get_current_user)],
+) -> UserIdentity:
     return current_user
 
 
-def require_role(required_roles: list[UserRole]):
+def require_role(required_roles: list[UserRole], fresh: bool = False):
+    """Dependency that admits only users with one of `required_roles`.
+
+    With AUTH_TRUST_TOKEN_ROLE the role claim decides, and the caller is
+    built from the token's claims without looking the user up; endpoints
+    that need the user's other fields pass `fresh=True`.
+    """
     def role_checker(
-        current_user: Annotated[User, Depends(get_current_user)],
-    ) -> User:
+        db: Annotated[Session, Depends(get_db)],
+        token: Annotated[str, Depends(oauth2_scheme)],
+    ) -> UserIdentity:
+        token_data = authenticate_token(db, token)
+        if settings.AUTH_TRUST_TOKEN_ROLE and token_data.role is not None:
+            if token_data.role not in required_roles:
+                raise _forbidden()
+            if not fresh:
+                return UserIdentity.from_claims(token_data.sub, token_data.role)
+            return _load_user(db, token_data.sub)
+        current_user = _load_user(db, token_data.sub)
         if current_user.role not in required_roles:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Insufficient permissions",
-            )
+            raise _forbidden()
         return current_user
     return role_checker
 
 
 # Convenience dependencies
-CurrentUser = Annotated[User, Depends(get_current_active_user)]
-RequireBuyer = Annotated[User, Depends(require_role([UserRole.BUYER, UserRole.ADMIN]))]
-RequireSeller = Annotated[User, Depends(require_role([UserRole.SELLER, UserRole.ADMIN]))]
-RequireAdmin = Annotated[User, Depends(require_role([UserRole.ADMIN]))]
+CurrentUser = Annotated[UserIdentity, Depends(get_current_active_user)]
+OptionalUser = Annotated[Optional[UserIdentity], Depends(get_optional_current_user)]
+RequireBuyer = Annotated[UserIdentity, Depends(require_role([UserRole.BUYER, UserRole.ADMIN]))]
+RequireSeller = Annotated[UserIdentity, Depends(require_role([UserRole.SELLER, UserRole.ADMIN]))]
+RequireAdmin = Annotated[UserIdentity, Depends(require_role([UserRole.ADMIN]))]
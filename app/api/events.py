@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.events import event_broker, format_event
+from app.models import Product
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+
+def _snapshot(product_id: int) -> Optional[str]:
+    db = SessionLocal()
+    try:
+        product = db.query(Product).filter(Product.id == product_id).first()
+        if not product:
+            return None
+        return format_event("Snapshot", {
+            "product_id": product.id,
+            "status": product.status,
+            "current_price": product.current_price,
+            "leading_bid_id": product.leading_bid_id,
+            "auction_end_at": product.auction_end_at,
+        })
+    finally:
+        db.close()
+
+
+@router.get("/products/{product_id}")
+async def stream_product_events(product_id: int):
+    """Server-sent events for one product: a `Snapshot`, then `BidPlaced` and `AuctionClosed` deltas.
+
+    The subscription starts before the snapshot is read, so no event can fall
+    between the two. Clients that get disconnected reconnect and receive a
+    fresh snapshot; there is no replay.
+    """
+    subscription = event_broker.subscribe(product_id, settings.EVENTS_HEARTBEAT_SECONDS)
+    try:
+        snapshot = await run_in_threadpool(_snapshot, product_id)
+    except Exception:
+        subscription.close()
+        raise
+    if snapshot is None:
+        subscription.close()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+
+    async def stream():
+        try:
+            yield snapshot
+            async for message in subscription:
+                yield message
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
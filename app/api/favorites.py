@@ -1,4 +1,4 @@
-from typing import Annotated
+from typing import Annotated, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
@@ -6,25 +6,29 @@ from sqlalchemy.orm import Session
 from app.api.deps import CurrentUser
 from app.core.database import get_db
 from app.models import Favorite, Product, ProductStatus
-from app.schemas import FavoriteCreate, FavoriteResponse
+from app.schemas import FavoriteCreate, FavoriteResponse, Page
+from app.utils.pagination import CursorParam, LimitParam, paginate
 
 router = APIRouter(prefix="/favorites", tags=["Favorites"])
 
 
-@router.get("/", response_model=list[FavoriteResponse])
+@router.get("/", response_model=Page[FavoriteResponse])
 def list_favorites(
     db: Annotated[Session, Depends(get_db)],
     current_user: CurrentUser,
+    cursor: Optional[str] = CursorParam,
+    limit: int = LimitParam,
 ):
-    return (
+    query = (
         db.query(Favorite)
         .join(Product, Product.id == Favorite.product_id)
         .filter(
             Favorite.user_id == current_user.id,
             Product.status != ProductStatus.EXPIRED,
         )
-        .all()
     )
+    # A user favorites a product once, so product_id breaks created_at ties
+    return paginate(query, Favorite.created_at, Favorite.product_id, cursor, limit)
 
 
 @router.post("/", response_model=FavoriteResponse, status_code=status.HTTP_201_CREATED)
@@ -1,4 +1,4 @@
-from typing import Annotated
+from typing import Annotated, Optional
 
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
@@ -6,34 +6,31 @@ from sqlalchemy.orm import Session
 from app.api.deps import CurrentUser
 from app.core.database import get_db
 from app.models import Order, UserRole
-from app.schemas import OrderResponse
+from app.schemas import OrderResponse, Page
+from app.utils.pagination import CursorParam, LimitParam, paginate
 
 router = APIRouter(prefix="/orders", tags=["Orders"])
 
 
-@router.get("/me", response_model=list[OrderResponse])
+@router.get("/me", response_model=Page[OrderResponse])
 def list_my_orders(
     db: Annotated[Session, Depends(get_db)],
     current_user: CurrentUser,
+    cursor: Optional[str] = CursorParam,
+    limit: int = LimitParam,
 ):
-    return (
-        db.query(Order)
-        .filter(Order.buyer_id == current_user.id)
-        .order_by(Order.created_at.desc())
-        .all()
-    )
+    query = db.query(Order).filter(Order.buyer_id == current_user.id)
+    return paginate(query, Order.created_at, Order.id, cursor, limit)
 
 
-@router.get("/sales", response_model=list[OrderResponse])
+@router.get("/sales", response_model=Page[OrderResponse])
 def list_my_sales(
     db: Annotated[Session, Depends(get_db)],
     current_user: CurrentUser,
+    cursor: Optional[str] = CursorParam,
+    limit: int = LimitParam,
 ):
     if current_user.role == UserRole.BUYER:
-        return []
-    return (
-        db.query(Order)
-        .filter(Order.seller_id == current_user.id)
-        .order_by(Order.created_at.desc())
-        .all()
-    )
+        return {"items": [], "next_cursor": None, "limit": limit}
+    query = db.query(Order).filter(Order.seller_id == current_user.id)
+    return paginate(query, Order.created_at, Order.id, cursor, limit)
@@ -7,7 +7,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import CurrentUser
+from app.core.auction_cache import auction_cache
 from app.core.database import get_db
+from app.core.result_cache import product_tags, result_cache
 from app.models import Order, OrderStatus, Payment, PaymentStatus, Product, ProductStatus
 from app.schemas import PaymentCreate, PaymentResponse
 
@@ -39,9 +41,14 @@ def create_payment(
 
     product = db.query(Product).filter(Product.id == order.product_id).first()
     if product:
+        previous_status = product.status
         product.status = ProductStatus.SOLD
+        product.version = Product.version + 1
 
     db.add(payment)
     db.commit()
     db.refresh(payment)
+    if product:
+        auction_cache.invalidate(product.id)
+        result_cache.invalidate(*product_tags(product.category_id, product.seller_id, previous_status, product.status))
     return payment
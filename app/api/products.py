@@ -3,47 +3,295 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import case, distinct, func
+from sqlalchemy.orm import Session, joinedload, selectinload
 
-from app.api.deps import CurrentUser, RequireSeller
+from app.api.deps import CurrentUser, OptionalUser, RequireSeller
+from app.core.auction_cache import auction_cache
+from app.core.auction_closer import auction_closer
+from app.core.config import settings
 from app.core.database import get_db
-from app.models import Product, ProductImage, ProductStatus, UserRole
-from app.schemas import ProductCreate, ProductImageCreate, ProductImageResponse, ProductResponse, ProductUpdate
+from app.core.result_cache import CachedResponse, product_list_tag, product_tags, result_cache
+from app.core.search import SearchFilters, search_backend
+from app.core.singleflight import single_flight
+from app.core.suggest import suggest_index
+from app.models import Bid, Favorite, Product, ProductImage, ProductStatus, UserRole
+from app.schemas import (
+    BidSummary,
+    CategoryFacet,
+    Page,
+    PriceFacet,
+    ProductCreate,
+    ProductDetailResponse,
+    ProductFacets,
+    ProductImageCreate,
+    ProductImageResponse,
+    ProductResponse,
+    ProductSort,
+    ProductSuggestion,
+    ProductUpdate,
+    SellerSummary,
+    StatusFacet,
+)
+from app.utils.http_cache import etag_matches, make_etag, not_modified, set_etag
+from app.utils.pagination import CursorParam, LimitParam, paginate_by
+from app.utils.ttl_cache import TTLCache
 
 router = APIRouter(prefix="/products", tags=["Products"])
 
+# The part of a product detail that is the same for every caller, keyed by (product_id, version)
+product_detail_cache = TTLCache(settings.PRODUCT_DETAIL_CACHE_SIZE, settings.PRODUCT_DETAIL_CACHE_TTL_SECONDS)
 
-def get_product_or_404(db: Session, product_id: int) -> Product:
-    product = db.query(Product).filter(Product.id == product_id).first()
+# Product counts per (category, status, price range), keyed by (seller_id, q); see product_facets
+product_facet_cache = TTLCache(settings.PRODUCT_FACET_CACHE_SIZE, settings.PRODUCT_FACET_CACHE_TTL_SECONDS)
+
+# Keyset and direction per list sort. Each key ends in the primary key and has an index per list filter.
+PRODUCT_SORTS = {
+    ProductSort.NEWEST: ((Product.created_at, Product.id), True),
+    ProductSort.ENDING_SOON: ((Product.auction_end_at, Product.id), False),
+    ProductSort.PRICE_LOW: ((Product.current_price, Product.id), False),
+    ProductSort.MOST_BIDS: ((Product.bid_count, Product.id), True),
+}
+
+
+def get_product_or_404(db: Session, product_id: int, *options) -> Product:
+    product = db.query(Product).options(*options).filter(Product.id == product_id).first()
     if not product:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
     return product
 
 
-@router.get("/", response_model=list[ProductResponse])
+@router.get("/", response_model=Page[ProductResponse])
 def list_products(
+    request: Request,
+    response: Response,
     db: Annotated[Session, Depends(get_db)],
     status_filter: Optional[ProductStatus] = Query(None, alias="status"),
     category_id: Optional[int] = None,
     seller_id: Optional[int] = None,
     q: Optional[str] = None,
+    sort: ProductSort = Query(ProductSort.NEWEST, description="Ignored with `q`, which ranks by relevance"),
+    cursor: Optional[str] = CursorParam,
+    limit: int = LimitParam,
 ):
+    if q:
+        filters = SearchFilters(status=status_filter, category_id=category_id, seller_id=seller_id)
+        return search_backend.search(db, q, filters, cursor, limit)
+
+    # Take the cache key before querying, so a concurrent write can only orphan what we store
+    cache_key = result_cache.key(
+        product_list_tag(status_filter, category_id, seller_id),
+        {
+            "status": status_filter,
+            "category_id": category_id,
+            "seller_id": seller_id,
+            "sort": sort,
+            "cursor": cursor,
+            "limit": limit,
+        },
+    )
+    cached = result_cache.get(cache_key)
+    if cached is not None:
+        return _cached_response(request, cached)
+
     query = db.query(Product)
     if status_filter:
         query = query.filter(Product.status == status_filter)
     if category_id:
         query = query.filter(Product.category_id == category_id)
+    if seller_id:
+        query = query.filter(Product.seller_id == seller_id)
+    columns, descending = PRODUCT_SORTS[sort]
+
+    if request.headers.get("if-none-match"):
+        # Revalidation: page through (id, version) only and skip the rows if nothing changed
+        keys = paginate_by(query.with_entities(Product.version, *columns), columns, cursor, limit, descending)
+        etag = _page_etag(keys["items"], keys["next_cursor"], limit)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        ids = [row.id for row in keys["items"]]
+        products = {p.id: p for p in db.query(Product).options(selectinload(Product.images)).filter(Product.id.in_(ids))}
+        page = {**keys, "items": [products[product_id] for product_id in ids if product_id in products]}
+    else:
+        page = paginate_by(query.options(selectinload(Product.images)), columns, cursor, limit, descending)
+    etag = _page_etag(page["items"], page["next_cursor"], limit)
+    if cache_key is None:
+        set_etag(response, etag)
+        return page
+
+    cached = CachedResponse(etag, Page[ProductResponse].model_validate(page).model_dump_json().encode())
+    result_cache.set(cache_key, cached)
+    return _cached_response(request, cached)
+
+
+def _cached_response(request: Request, cached: CachedResponse) -> Response:
+    if etag_matches(request, cached.etag):
+        return not_modified(cached.etag)
+    response = Response(content=cached.body, media_type="application/json")
+    set_etag(response, cached.etag)
+    return response
+
+
+def _page_etag(rows: list, next_cursor: Optional[str], limit: int) -> str:
+    # Each product's version covers everything ProductResponse shows, images included
+    return make_etag("products", [(row.id, row.version) for row in rows], next_cursor, limit)
+
+
+def _product_etag(product_id: int, version: int) -> str:
+    return make_etag("product", product_id, version)
+
+
+@router.get("/suggest", response_model=list[ProductSuggestion])
+def suggest_products(
+    db: Annotated[Session, Depends(get_db)],
+    prefix: str = Query(..., min_length=1, max_length=255),
+    limit: int = Query(settings.SUGGEST_MAX_LIMIT, ge=1, le=settings.SUGGEST_MAX_LIMIT),
+):
+    """Active auctions with a title word starting with `prefix`, most bid on first."""
+    return [
+        ProductSuggestion(id=product_id, title=title, bid_count=int(bid_count))
+        for product_id, title, bid_count in suggest_index.suggest(db, prefix, limit)
+    ]
+
+
+@router.get("/facets", response_model=ProductFacets)
+def product_facets(
+    db: Annotated[Session, Depends(get_db)],
+    status_filter: Optional[ProductStatus] = Query(None, alias="status"),
+    category_id: Optional[int] = None,
+    seller_id: Optional[int] = None,
+    q: Optional[str] = None,
+):
+    """Product counts per category, status and price range for the same filters as `list_products`.
+
+    Each facet leaves out its own filter, so picking a category still shows
+    how many products the other categories have. All three are summed from
+    one query grouped by (category, status, price range), which is small
+    enough to filter in Python and is reused for a few seconds. With `q`
+    only the products the search backend matches are counted.
+    """
+    edges = settings.PRODUCT_FACET_PRICE_BUCKETS
+    categories: dict[int, int] = {}
+    statuses: dict[ProductStatus, int] = {}
+    prices = [0] * len(edges)
+    for cell_category_id, cell_status, bucket, count in _facet_cells(db, seller_id, q or None):
+        in_category = not category_id or cell_category_id == category_id
+        in_status = not status_filter or cell_status == status_filter
+        if in_status:
+            categories[cell_category_id] = categories.get(cell_category_id, 0) + count
+        if in_category:
+            statuses[cell_status] = statuses.get(cell_status, 0) + count
+        if in_category and in_status:
+            prices[bucket] += count
+
+    return ProductFacets(
+        total=sum(prices),
+        categories=[
+            CategoryFacet(category_id=facet_id, count=count)
+            for facet_id, count in sorted(categories.items(), key=lambda item: (-item[1], item[0]))
+        ],
+        statuses=[StatusFacet(status=s, count=statuses[s]) for s in ProductStatus if s in statuses],
+        price_ranges=[
+            PriceFacet(min=edge, max=edges[i + 1] if i + 1 < len(edges) else None, count=prices[i])
+            for i, edge in enumerate(edges)
+        ],
+    )
+
+
+def _facet_cells(db: Session, seller_id: Optional[int], q: Optional[str]) -> list[tuple[int, ProductStatus, int, int]]:
+    key = (seller_id, q)
+    cells = product_facet_cache.get(key)
+    if cells is None:
+        cells = single_flight.do(("product-facets", *key), lambda: _count_facet_cells(db, seller_id, q))
+        product_facet_cache.set(key, cells)
+    return cells
+
+
+def _count_facet_cells(
+    db: Session, seller_id: Optional[int], q: Optional[str]
+) -> list[tuple[int, ProductStatus, int, int]]:
+    edges = settings.PRODUCT_FACET_PRICE_BUCKETS
+    # Highest edge first; prices below the lowest edge count in the first range
+    bucket = case(
+        *[(Product.current_price >= edge, i) for i, edge in reversed(list(enumerate(edges)))], else_=0
+    ).label("price_bucket")
+    query = db.query(Product.category_id, Product.status, bucket, func.count())
     if seller_id:
         query = query.filter(Product.seller_id == seller_id)
     if q:
-        query = query.filter(Product.title.ilike(f"%{q}%"))
-    return query.order_by(Product.created_at.desc()).all()
+        query = query.filter(search_backend.match_condition(db, q))
+    rows = query.group_by(Product.category_id, Product.status, bucket).all()
+    return [tuple(row) for row in rows]
 
 
 @router.get("/{product_id}", response_model=ProductResponse)
-def get_product(product_id: int, db: Annotated[Session, Depends(get_db)]):
-    return get_product_or_404(db, product_id)
+def get_product(product_id: int, request: Request, response: Response, db: Annotated[Session, Depends(get_db)]):
+    version = db.query(Product.version).filter(Product.id == product_id).scalar()
+    if version is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+    if etag_matches(request, _product_etag(product_id, version)):
+        return not_modified(_product_etag(product_id, version))
+    # Keyed on the version just read, so a caller never joins a read that began before a change it has seen
+    version, product = single_flight.do(("product", product_id, version), lambda: _read_product(db, product_id))
+    set_etag(response, _product_etag(product_id, version))
+    return product
+
+
+def _read_product(db: Session, product_id: int) -> tuple[int, ProductResponse]:
+    product = get_product_or_404(db, product_id, selectinload(Product.images))
+    return product.version, ProductResponse.model_validate(product)
+
+
+@router.get("/{product_id}/detail", response_model=ProductDetailResponse)
+def get_product_detail(
+    product_id: int,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: OptionalUser,
+):
+    """Everything a product page shows: the product, its images, bidding and favorite stats, and the seller.
+
+    Costs five queries, or two while the product's version is unchanged
+    since it was last assembled.
+    """
+    version = db.query(Product.version).filter(Product.id == product_id).scalar()
+    if version is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+    detail = product_detail_cache.get((product_id, version))
+    if detail is None:
+        # A hot product that just changed is missed by every reader at once; let one of them load it
+        detail = single_flight.do(("product-detail", product_id, version), lambda: _load_product_detail(db, product_id))
+        product_detail_cache.set((product_id, detail["version"]), detail)
+
+    # Favorites do not bump the product version, so they are always read live
+    user_id = current_user.id if current_user else None
+    favorite_count, favorited = (
+        db.query(func.count(), func.count(case((Favorite.user_id == user_id, 1))))
+        .filter(Favorite.product_id == product_id)
+        .one()
+    )
+    return ProductDetailResponse(**detail, favorite_count=favorite_count, is_favorited=favorited > 0)
+
+
+def _load_product_detail(db: Session, product_id: int) -> dict:
+    product = get_product_or_404(
+        db,
+        product_id,
+        joinedload(Product.seller),
+        joinedload(Product.leading_bid),
+        selectinload(Product.images),
+    )
+    bid_count, bidder_count = (
+        db.query(func.count(Bid.id), func.count(distinct(Bid.bidder_id))).filter(Bid.product_id == product_id).one()
+    )
+    return {
+        **ProductResponse.model_validate(product).model_dump(),
+        "version": product.version,
+        "high_bid": BidSummary.model_validate(product.leading_bid) if product.leading_bid else None,
+        "bid_count": bid_count,
+        "bidder_count": bidder_count,
+        "seller": SellerSummary.model_validate(product.seller),
+    }
 
 
 @router.post("/", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
@@ -62,12 +310,18 @@ def create_product(
         description=product_in.description,
         starting_price=product_in.starting_price,
         min_increment=product_in.min_increment,
+        current_price=product_in.starting_price,
         auction_end_at=product_in.auction_end_at,
+        soft_close_window_seconds=product_in.soft_close_window_seconds,
+        soft_close_extension_seconds=product_in.soft_close_extension_seconds,
         status=ProductStatus.ACTIVE,
     )
     db.add(product)
     db.commit()
     db.refresh(product)
+    auction_closer.schedule(product.id, product.auction_end_at)
+    suggest_index.update_product(product)
+    result_cache.invalidate(*product_tags(product.category_id, product.seller_id, product.status))
     return product
 
 
@@ -78,18 +332,33 @@ def update_product(
     db: Annotated[Session, Depends(get_db)],
     current_user: CurrentUser,
 ):
-    product = get_product_or_404(db, product_id)
+    # Locked until commit: a bid landing in between would otherwise have its price reset to starting_price below
+    product = db.query(Product).filter(Product.id == product_id).with_for_update().first()
+    if not product:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
     if current_user.role != UserRole.ADMIN and product.seller_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to update this product")
 
     if product_in.auction_end_at is not None and product_in.auction_end_at <= datetime.utcnow():
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Auction end must be in the future")
 
+    # Lists the product leaves need invalidating as well as the ones it joins
+    stale_tags = product_tags(product.category_id, product.seller_id, product.status)
     for field, value in product_in.model_dump(exclude_unset=True).items():
         setattr(product, field, value)
+    if product.leading_bid_id is None:
+        product.current_price = product.starting_price
+    product.version = Product.version + 1
 
     db.commit()
     db.refresh(product)
+    auction_cache.update_product(product)
+    if product.status == ProductStatus.ACTIVE:
+        auction_closer.schedule(product.id, product.auction_end_at)
+    else:
+        auction_closer.unschedule(product.id)
+    suggest_index.update_product(product)
+    result_cache.invalidate(*stale_tags, *product_tags(product.category_id, product.seller_id, product.status))
     return product
 
 
@@ -103,8 +372,13 @@ def delete_product(
     if current_user.role != UserRole.ADMIN and product.seller_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to delete this product")
 
+    tags = product_tags(product.category_id, product.seller_id, product.status)
     db.delete(product)
     db.commit()
+    auction_cache.invalidate(product_id)
+    auction_closer.unschedule(product_id)
+    suggest_index.remove(product_id)
+    result_cache.invalidate(*tags)
     return None
 
 
@@ -124,7 +398,10 @@ def add_product_image(
         image_url=image_in.image_url,
         position=image_in.position,
     )
+    tags = product_tags(product.category_id, product.seller_id, product.status)
     db.add(image)
+    product.version = Product.version + 1
     db.commit()
     db.refresh(image)
+    result_cache.invalidate(*tags)
     return image
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models import Bid, Product, ProductStatus
+
+
+@dataclass(frozen=True)
+class AuctionState:
+    """Snapshot of the fields `place_bid` needs to validate a bid."""
+
+    product_id: int
+    seller_id: int
+    status: ProductStatus
+    auction_end_at: datetime
+    starting_price: Decimal
+    min_increment: Decimal
+    current_price: Decimal
+    leading_bid_id: Optional[int] = None
+    leading_bidder_id: Optional[int] = None
+    leading_max_amount: Optional[Decimal] = None
+    soft_close_window_seconds: int = 0
+    soft_close_extension_seconds: int = 0
+    category_id: Optional[int] = None
+
+    @property
+    def min_required(self) -> Decimal:
+        if self.leading_bid_id is None:
+            return self.starting_price
+        return self.current_price + self.min_increment
+
+    @property
+    def leading_ceiling(self) -> Decimal:
+        """Highest amount the leader's proxy will bid; the current price for a plain bid."""
+        return max(self.leading_max_amount or self.current_price, self.current_price)
+
+    def is_open(self, now: datetime) -> bool:
+        return self.status == ProductStatus.ACTIVE and self.auction_end_at > now
+
+    def end_after_bid(self, now: datetime) -> datetime:
+        """The end time once a bid lands at `now`, extended if it falls in the soft-close window."""
+        if not self.soft_close_window_seconds:
+            return self.auction_end_at
+        if self.auction_end_at - now > timedelta(seconds=self.soft_close_window_seconds):
+            return self.auction_end_at
+        # Whole seconds, matching what a DATETIME column stores and compares against
+        extended = (now + timedelta(seconds=self.soft_close_extension_seconds)).replace(microsecond=0)
+        return max(self.auction_end_at, extended)
+
+
+class AuctionStateCache:
+    """Process-local cache of auction state for open auctions.
+
+    Entries are immutable and swapped under a lock, so readers never see a
+    half-applied update. Only ACTIVE products whose end time is still ahead
+    are kept. Writes made in this process are written through; writes made
+    by other workers are not seen, so an entry can lag the database. A bid
+    wrongly accepted on a stale entry fails the compare-and-set in
+    `place_bid`; before rejecting one, `place_bid` calls `reload`.
+
+    Entries whose auction has ended count as misses, and are purged at most
+    every `sweep_seconds`, so the cache does not grow with every lot ever bid on.
+    """
+
+    def __init__(self, sweep_seconds: float = 60.0) -> None:
+        self._lock = threading.Lock()
+        self._states: dict[int, AuctionState] = {}
+        self._sweep_seconds = sweep_seconds
+        self._swept_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def get(self, product_id: int) -> Optional[AuctionState]:
+        state = self._states.get(product_id)
+        if state is None or state.auction_end_at <= datetime.utcnow():
+            return None
+        return state
+
+    def load(self, db: Session, product_id: int) -> Optional[AuctionState]:
+        """Return the cached state, reading it from the database on a miss."""
+        state = self.get(product_id)
+        if state is not None:
+            return state
+
+        row = self._query(db).filter(Product.id == product_id).first()
+        if not row:
+            return None
+        state = self._from_row(*row)
+        self._store(state)
+        return state
+
+    def load_many(self, db: Session, product_ids: Iterable[int]) -> dict[int, AuctionState]:
+        """Like `load` for several products, reading every miss in one `IN` query."""
+        states = {}
+        missing = []
+        for product_id in set(product_ids):
+            state = self.get(product_id)
+            if state is None:
+                missing.append(product_id)
+            else:
+                states[product_id] = state
+        if missing:
+            for row in self._query(db).filter(Product.id.in_(missing)):
+                state = self._from_row(*row)
+                self._store(state)
+                states[state.product_id] = state
+        return states
+
+    def reload(self, db: Session, product_id: int) -> Optional[AuctionState]:
+        """Drop the entry and read the product again; for checks that must not act on stale state."""
+        self.invalidate(product_id)
+        return self.load(db, product_id)
+
+    @staticmethod
+    def _query(db: Session):
+        return db.query(Product, Bid.bidder_id, Bid.max_amount).outerjoin(Bid, Bid.id == Product.leading_bid_id)
+
+    @staticmethod
+    def _from_row(
+        product: Product, leading_bidder_id: Optional[int], leading_max_amount: Optional[Decimal]
+    ) -> AuctionState:
+        return AuctionState(
+            product_id=product.id,
+            seller_id=product.seller_id,
+            status=product.status,
+            auction_end_at=product.auction_end_at,
+            starting_price=product.starting_price,
+            min_increment=product.min_increment,
+            current_price=product.current_price,
+            leading_bid_id=product.leading_bid_id,
+            leading_bidder_id=leading_bidder_id,
+            leading_max_amount=leading_max_amount,
+            soft_close_window_seconds=product.soft_close_window_seconds,
+            soft_close_extension_seconds=product.soft_close_extension_seconds,
+            category_id=product.category_id,
+        )
+
+    def record_bid(
+        self,
+        product_id: int,
+        bid_id: int,
+        amount: Decimal,
+        bidder_id: int,
+        max_amount: Optional[Decimal] = None,
+        auction_end_at: Optional[datetime] = None,
+    ) -> None:
+        """Write through a committed leading bid; lower or stale amounts are ignored."""
+        with self._lock:
+            state = self._states.get(product_id)
+            if state is None:
+                return
+            if state.leading_bid_id is not None and amount <= state.current_price:
+                return
+            self._states[product_id] = replace(
+                state,
+                leading_bid_id=bid_id,
+                current_price=amount,
+                leading_bidder_id=bidder_id,
+                leading_max_amount=max_amount,
+                auction_end_at=auction_end_at or state.auction_end_at,
+            )
+
+    def update_product(self, product: Product) -> None:
+        """Write through product field changes made by update_product or accept_bid."""
+        with self._lock:
+            state = self._states.get(product.id)
+            if state is None:
+                return
+            if product.status != ProductStatus.ACTIVE or product.leading_bid_id != state.leading_bid_id:
+                del self._states[product.id]
+                return
+            self._states[product.id] = replace(
+                state,
+                seller_id=product.seller_id,
+                status=product.status,
+                auction_end_at=product.auction_end_at,
+                starting_price=product.starting_price,
+                min_increment=product.min_increment,
+                current_price=product.current_price,
+                soft_close_window_seconds=product.soft_close_window_seconds,
+                soft_close_extension_seconds=product.soft_close_extension_seconds,
+                category_id=product.category_id,
+            )
+
+    def invalidate(self, product_id: int) -> None:
+        with self._lock:
+            self._states.pop(product_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._states.clear()
+
+    def _store(self, state: AuctionState) -> None:
+        now = datetime.utcnow()
+        if state.status != ProductStatus.ACTIVE or state.auction_end_at <= now:
+            return
+        with self._lock:
+            if time.monotonic() - self._swept_at >= self._sweep_seconds:
+                self._swept_at = time.monotonic()
+                for product_id in [pid for pid, s in self._states.items() if s.auction_end_at <= now]:
+                    del self._states[product_id]
+            # Keep an entry written concurrently by record_bid if it is ahead of ours.
+            current = self._states.get(state.product_id)
+            if current is not None and current.leading_bid_id is not None and (
+                state.leading_bid_id is None or current.current_price >= state.current_price
+            ):
+                return
+            self._states[state.product_id] = state
+
+
+auction_cache = AuctionStateCache()
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.auction_cache import auction_cache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.events import event_broker
+from app.core.result_cache import product_tags, result_cache
+from app.core.suggest import suggest_index
+from app.models import Bid, BidStatus, Order, OrderStatus, Product, ProductStatus
+
+logger = logging.getLogger(__name__)
+
+
+class AuctionCloser:
+    """Moves ACTIVE products to CLOSED or EXPIRED once `auction_end_at` passes.
+
+    Upcoming end times live in a min-heap loaded once from
+    `ix_products_status_auction_end` and kept current by the product endpoints,
+    so the worker sleeps exactly until the next auction is due. Rescheduling is
+    lazy: `_scheduled` holds the authoritative end time per product and stale
+    heap entries are skipped when popped. A periodic sweep of that same index
+    range picks up auctions created or extended by other processes.
+
+    Only the running worker keeps a schedule: `schedule` and `unschedule` do
+    nothing until `start`, and `stop` drops the schedule, so a process that
+    is not the leader holds no entries and a new leader starts from the
+    database rather than from whatever it recorded earlier.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        chunk_size: int = 500,
+        sweep_seconds: float = 30.0,
+    ) -> None:
+        self._session_factory = session_factory
+        self._chunk_size = chunk_size
+        self._sweep_seconds = sweep_seconds
+        self._heap: list[tuple[datetime, int]] = []
+        self._scheduled: dict[int, datetime] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def schedule(self, product_id: int, auction_end_at: datetime) -> None:
+        with self._cond:
+            if self._thread is None or self._scheduled.get(product_id) == auction_end_at:
+                return
+            self._scheduled[product_id] = auction_end_at
+            heapq.heappush(self._heap, (auction_end_at, product_id))
+            if len(self._heap) > 2 * len(self._scheduled) + 1024:
+                self._compact()
+            if self._heap[0][1] == product_id:
+                self._cond.notify()
+
+    def unschedule(self, product_id: int) -> None:
+        with self._cond:
+            if self._thread is not None:
+                self._scheduled.pop(product_id, None)
+
+    def start(self) -> None:
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._heap, self._scheduled = [], {}
+            self._thread = threading.Thread(target=self._run, name="auction-closer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+        with self._cond:
+            self._thread = None
+            self._heap, self._scheduled = [], {}
+
+    def load(self) -> None:
+        """Fill the schedule from every ACTIVE product, streamed in index order."""
+        db = self._session_factory()
+        try:
+            stmt = (
+                select(Product.id, Product.auction_end_at)
+                .where(Product.status == ProductStatus.ACTIVE)
+                .order_by(Product.auction_end_at)
+                .execution_options(yield_per=10_000)
+            )
+            entries = [(end_at, product_id) for product_id, end_at in db.execute(stmt)]
+        finally:
+            db.close()
+        with self._cond:
+            # Replace the schedule, keeping only what was scheduled since start() while this query ran
+            scheduled = {product_id: end_at for end_at, product_id in entries}
+            scheduled.update(self._scheduled)
+            self._scheduled = scheduled
+            self._compact()
+            self._cond.notify()
+        logger.info("Auction closer scheduled %d active auctions", len(entries))
+
+    def close_due(self, product_ids: Iterable[int]) -> int:
+        """Close the given auctions that are due, one transaction per chunk."""
+        product_ids = list(product_ids)
+        closed = 0
+        for start in range(0, len(product_ids), self._chunk_size):
+            closed += self._close_chunk(product_ids[start:start + self._chunk_size])
+        return closed
+
+    def sweep(self) -> int:
+        """Close every ACTIVE auction past its end, whether or not it was scheduled here."""
+        closed = 0
+        while not self._stopping:
+            db = self._session_factory()
+            try:
+                due = [
+                    product_id
+                    for (product_id,) in db.query(Product.id)
+                    .filter(Product.status == ProductStatus.ACTIVE, Product.auction_end_at <= datetime.utcnow())
+                    .order_by(Product.auction_end_at)
+                    .limit(self._chunk_size)
+                ]
+            finally:
+                db.close()
+            if not due:
+                break
+            count = self._close_chunk(due)
+            closed += count
+            if count == 0:
+                break
+        return closed
+
+    def _run(self) -> None:
+        try:
+            self.load()
+        except Exception:
+            logger.exception("Auction closer failed to load the schedule")
+        next_sweep = 0.0
+        while True:
+            with self._cond:
+                if self._stopping:
+                    return
+                due = self._pop_due(datetime.utcnow())
+                if not due:
+                    now = datetime.utcnow()
+                    timeout = max(0.0, next_sweep - now.timestamp())
+                    if self._heap:
+                        timeout = min(timeout, max(0.0, (self._heap[0][0] - now).total_seconds()))
+                    if timeout > 0:
+                        self._cond.wait(timeout)
+                        continue
+            try:
+                if due:
+                    self.close_due(due)
+                if datetime.utcnow().timestamp() >= next_sweep:
+                    self.sweep()
+                    next_sweep = datetime.utcnow().timestamp() + self._sweep_seconds
+            except Exception:
+                # Whatever was due stays ACTIVE in the database and the next sweep retries it
+                logger.exception("Auction closer pass failed")
+                next_sweep = datetime.utcnow().timestamp() + self._sweep_seconds
+
+    def _pop_due(self, now: datetime) -> list[int]:
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < self._chunk_size:
+            end_at, product_id = heapq.heappop(self._heap)
+            if self._scheduled.get(product_id) == end_at:
+                del self._scheduled[product_id]
+                due.append(product_id)
+        return due
+
+    def _compact(self) -> None:
+        self._heap = [(end_at, product_id) for product_id, end_at in self._scheduled.items()]
+        heapq.heapify(self._heap)
+
+    def _close_chunk(self, product_ids: list[int]) -> int:
+        db = self._session_factory()
+        try:
+            now = datetime.utcnow()
+            products = (
+                db.query(Product)
+                .filter(Product.id.in_(product_ids), Product.status == ProductStatus.ACTIVE)
+                .with_for_update()
+                .all()
+            )
+            due = []
+            for product in products:
+                if product.auction_end_at > now:
+                    # Extended since it was scheduled, possibly by another worker
+                    self.schedule(product.id, product.auction_end_at)
+                else:
+                    due.append(product)
+            if not due:
+                db.commit()
+                return 0
+
+            leader_ids = [p.leading_bid_id for p in due if p.leading_bid_id is not None]
+            winners = {
+                bid.id: bid
+                for bid in db.query(Bid).filter(Bid.id.in_(leader_ids), Bid.status == BidStatus.PENDING)
+            } if leader_ids else {}
+
+            for product in due:
+                product.version = Product.version + 1
+                bid = winners.get(product.leading_bid_id)
+                if bid is None:
+                    product.status = ProductStatus.EXPIRED
+                    continue
+                bid.status = BidStatus.ACCEPTED
+                product.accepted_bid_id = bid.id
+                product.status = ProductStatus.CLOSED
+                db.add(Order(
+                    product_id=product.id,
+                    buyer_id=bid.bidder_id,
+                    seller_id=product.seller_id,
+                    bid_id=bid.id,
+                    total_amount=bid.amount,
+                    status=OrderStatus.AWAITING_PAYMENT,
+                ))
+
+            closed = [
+                (p.id, p.status, p.accepted_bid_id, winners[p.accepted_bid_id].amount if p.accepted_bid_id else None)
+                for p in due
+            ]
+            tags = set().union(*(product_tags(p.category_id, p.seller_id, ProductStatus.ACTIVE, p.status) for p in due))
+            due_ids = [p.id for p in due]
+            db.flush()
+            db.query(Bid).filter(
+                Bid.product_id.in_(due_ids),
+                Bid.status == BidStatus.PENDING,
+            ).update({Bid.status: BidStatus.REJECTED}, synchronize_session=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        result_cache.invalidate(*tags)
+        for product_id, product_status, winning_bid_id, final_price in closed:
+            auction_cache.invalidate(product_id)
+            suggest_index.remove(product_id)
+            event_broker.publish(
+                product_id, "AuctionClosed", status=product_status, winning_bid_id=winning_bid_id, final_price=final_price
+            )
+        logger.info("Closed %d auctions", len(due_ids))
+        return len(due_ids)
+
+
+auction_closer = AuctionCloser(
+    chunk_size=settings.AUCTION_CLOSER_CHUNK_SIZE,
+    sweep_seconds=settings.AUCTION_CLOSER_SWEEP_SECONDS,
+)
@@ -1,13 +1,101 @@
-from pydantic_settings import BaseSettings
+from decimal import Decimal
 from functools import lru_cache
 
+from pydantic import model_validator
+from pydantic_settings import BaseSettings
+
 
 class Settings(BaseSettings):
     DATABASE_URL: str
     SECRET_KEY: str
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    # Access tokens are short-lived; clients renew them through POST /auth/refresh
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
     ALGORITHM: str = "HS256"
 
+    # bcrypt cost for new hashes; stored hashes at another cost are rehashed on the next login
+    BCRYPT_ROUNDS: int = 12
+    # Hashes run at once, and waiting, before login and register answer 429 (see app/core/password_hasher.py);
+    # 0 hashes on the request thread with no limit
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE: int = 8
+
+    # Route bids through a per-product in-process sequencer (see app/core/sequencer.py);
+    # cannot be combined with BID_GROUP_COMMIT_ENABLED
+    BID_SEQUENCER_ENABLED: bool = False
+    BID_SEQUENCER_WORKERS: int = 8
+
+    # Commit bids arriving within one window together (see app/core/group_commit.py)
+    BID_GROUP_COMMIT_ENABLED: bool = False
+    BID_GROUP_COMMIT_WINDOW_MS: float = 2.0
+    BID_GROUP_COMMIT_MAX_BATCH: int = 256
+
+    # Largest number of bids accepted by POST /bids/batch
+    BID_BATCH_MAX_SIZE: int = 100
+
+    # Background closing of auctions past auction_end_at (see app/core/auction_closer.py)
+    AUCTION_CLOSER_ENABLED: bool = True
+    AUCTION_CLOSER_CHUNK_SIZE: int = 500
+    AUCTION_CLOSER_SWEEP_SECONDS: float = 30.0
+
+    # How often workers poll for, and leaders re-check, background job leases (see app/core/leader.py)
+    LEADER_LEASE_INTERVAL_SECONDS: float = 2.0
+
+    # Live product events (see app/core/events.py); "redis" shares them across workers
+    EVENTS_BACKEND: str = "local"
+    EVENTS_REDIS_URL: str = "redis://localhost:6379/0"
+    EVENTS_QUEUE_SIZE: int = 64
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0
+
+    # Product search: "fulltext" (MySQL FULLTEXT), "memory" (in-process index) or "auto"
+    SEARCH_BACKEND: str = "auto"
+
+    # Most suggestions GET /products/suggest returns, and how many each trie node keeps
+    SUGGEST_MAX_LIMIT: int = 10
+
+    # GET /products/{id}/detail caches its shared part per product version; the TTL bounds seller staleness
+    PRODUCT_DETAIL_CACHE_SIZE: int = 1024
+    PRODUCT_DETAIL_CACHE_TTL_SECONDS: float = 60.0
+
+    # GET /products/facets: lower bounds of the price ranges, and how long counts are reused (0 disables)
+    PRODUCT_FACET_PRICE_BUCKETS: list[Decimal] = [Decimal(edge) for edge in (0, 25, 50, 100, 250, 500, 1000)]
+    PRODUCT_FACET_CACHE_SIZE: int = 256
+    PRODUCT_FACET_CACHE_TTL_SECONDS: float = 5.0
+
+    # Rendered list_products pages (see app/core/result_cache.py): "memory", "redis" or "none".
+    # "memory" is per worker and invalidates only its own copy, so with several workers a list
+    # can be up to the TTL out of date; use "redis" there
+    RESULT_CACHE_BACKEND: str = "memory"
+    RESULT_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    RESULT_CACHE_SIZE: int = 1024
+    RESULT_CACHE_TTL_SECONDS: float = 10.0
+    # Bids invalidate the lists they appear in at most this often (0 invalidates on every bid)
+    RESULT_CACHE_BID_BATCH_SECONDS: float = 1.0
+
+    # Authenticated users by id (see app/core/user_cache.py); other workers see role changes within the TTL
+    USER_CACHE_SIZE: int = 10_000
+    USER_CACHE_TTL_SECONDS: float = 60.0
+    # Verified access token payloads, kept until each token's exp (see app/api/deps.py); 0 disables
+    TOKEN_CACHE_SIZE: int = 10_000
+    # Revoked access tokens (see app/core/revocation.py): filter sizing, and how often each worker
+    # pulls revocations made by the others
+    REVOCATION_FILTER_CAPACITY: int = 100_000
+    REVOCATION_FILTER_ERROR_RATE: float = 0.001
+    REVOCATION_SYNC_SECONDS: float = 2.0
+    # Let require_role check the role signed into the access token instead of the stored one
+    # and skip the user lookup, so a role change or deleted account only applies once the
+    # user's current token expires
+    AUTH_TRUST_TOKEN_ROLE: bool = False
+
+    # Share one database read between concurrent identical requests (see app/core/singleflight.py)
+    SINGLE_FLIGHT_ENABLED: bool = True
+
+    @model_validator(mode="after")
+    def check_bid_writers(self) -> "Settings":
+        if self.BID_SEQUENCER_ENABLED and self.BID_GROUP_COMMIT_ENABLED:
+            raise ValueError("BID_SEQUENCER_ENABLED and BID_GROUP_COMMIT_ENABLED cannot both be set")
+        return self
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# deliver(product_id, message) hands a published message to the local subscribers
+Deliver = Callable[[int, str], None]
+
+
+class LocalBackend:
+    """Delivers straight to this process; enough for a single worker and for tests."""
+
+    def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    def publish(self, product_id: int, message: str) -> None:
+        self._deliver(product_id, message)
+
+    def close(self) -> None:
+        pass
+
+
+class RedisBackend:
+    """Shares events between workers through Redis pub/sub, one channel per product.
+
+    Requires the optional `redis` package.
+    """
+
+    prefix = "bidbay:product:"
+
+    def __init__(self, url: str) -> None:
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("EVENTS_BACKEND=redis requires the 'redis' package") from exc
+        self._client = redis.Redis.from_url(url)
+        self._pubsub = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, deliver: Deliver) -> None:
+        def handle(message: dict) -> None:
+            product_id = int(message["channel"].decode()[len(self.prefix):])
+            deliver(product_id, message["data"].decode())
+
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.psubscribe(**{f"{self.prefix}*": handle})
+        self._thread = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def publish(self, product_id: int, message: str) -> None:
+        self._client.publish(f"{self.prefix}{product_id}", message)
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "value"):  # enums
+        return value.value
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def format_event(event_type: str, data: dict) -> str:
+    """Render one server-sent event."""
+    return f"event: {event_type}\ndata: {json.dumps(data, default=_json_default)}\n\n"
+
+
+class EventBroker:
+    """Fans per-product events out to subscribers, typically SSE connections.
+
+    Publishing is thread-safe and cheap: the event is rendered once and each
+    event loop with subscribers on that product gets a single callback, which
+    then fills every subscriber queue. An idle subscriber costs one small
+    queue. A subscriber that falls `queue_size` events behind is
+    disconnected, so it can reconnect and start over from a fresh snapshot
+    rather than receive an incomplete stream.
+    """
+
+    def __init__(self, backend: Any = None, queue_size: int = 64) -> None:
+        self._backend = backend or LocalBackend()
+        self._queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers: dict[int, dict[asyncio.AbstractEventLoop, set[asyncio.Queue]]] = {}
+        self._started = False
+
+    def publish(self, product_id: int, event_type: str, **data: Any) -> None:
+        self._ensure_started()
+        message = format_event(event_type, {"product_id": product_id, **data})
+        try:
+            self._backend.publish(product_id, message)
+        except Exception:
+            # Live updates are best effort; the write that triggered them already committed
+            logger.exception("Failed to publish %s for product %d", event_type, product_id)
+
+    def subscribe(self, product_id: int, heartbeat_seconds: float = 15.0) -> "Subscription":
+        """Start receiving events for `product_id`; must be called on the event loop that reads them."""
+        self._ensure_started()
+        subscription = Subscription(self, product_id, asyncio.get_running_loop(), self._queue_size, heartbeat_seconds)
+        with self._lock:
+            self._subscribers.setdefault(product_id, {}).setdefault(subscription.loop, set()).add(subscription.queue)
+        return subscription
+
+    def _unsubscribe(self, subscription: "Subscription") -> None:
+        with self._lock:
+            loops = self._subscribers.get(subscription.product_id, {})
+            queues = loops.get(subscription.loop, set())
+            queues.discard(subscription.queue)
+            if not queues:
+                loops.pop(subscription.loop, None)
+            if not loops:
+                self._subscribers.pop(subscription.product_id, None)
+
+    def subscriber_count(self, product_id: Optional[int] = None) -> int:
+        with self._lock:
+            products = [product_id] if product_id is not None else list(self._subscribers)
+            return sum(len(q) for pid in products for q in self._subscribers.get(pid, {}).values())
+
+    def close(self) -> None:
+        self._backend.close()
+
+    def _ensure_started(self) -> None:
+        if self._started:
+            return
+        with self._lock:
+            if not self._started:
+                self._backend.start(self._deliver)
+                self._started = True
+
+    def _deliver(self, product_id: int, message: str) -> None:
+        with self._lock:
+            loops = list(self._subscribers.get(product_id, {}))
+        for loop in loops:
+            try:
+                loop.call_soon_threadsafe(self._fan_out, loop, product_id, message)
+            except RuntimeError:  # loop already closed
+                pass
+
+    def _fan_out(self, loop: asyncio.AbstractEventLoop, product_id: int, message: str) -> None:
+        with self._lock:
+            queues = list(self._subscribers.get(product_id, {}).get(loop, ()))
+        for queue in queues:
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Too far behind to catch up; end the stream so the client resubscribes
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+
+class Subscription:
+    """Rendered events for one product, with a comment line as keep-alive while idle."""
+
+    def __init__(
+        self,
+        broker: EventBroker,
+        product_id: int,
+        loop: asyncio.AbstractEventLoop,
+        queue_size: int,
+        heartbeat_seconds: float,
+    ) -> None:
+        self._broker = broker
+        self.product_id = product_id
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self._heartbeat = heartbeat_seconds
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> str:
+        try:
+            message = await asyncio.wait_for(self.queue.get(), self._heartbeat)
+        except asyncio.TimeoutError:
+            return ": keep-alive\n\n"
+        if message is None:
+            self.close()
+            raise StopAsyncIteration
+        return message
+
+    def close(self) -> None:
+        self._broker._unsubscribe(self)
+
+
+def _backend_from_settings() -> Any:
+    if settings.EVENTS_BACKEND == "redis":
+        return RedisBackend(settings.EVENTS_REDIS_URL)
+    return LocalBackend()
+
+
+event_broker = EventBroker(_backend_from_settings(), queue_size=settings.EVENTS_QUEUE_SIZE)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Optional, Sequence
+
+# handler(items) -> one result per item; an Exception instance fails that item only
+GroupHandler = Callable[[Sequence[Any]], Sequence[Any]]
+
+
+class GroupCommitter:
+    """Hands work submitted close together to `handler` as one batch.
+
+    A single flusher thread waits up to `window_seconds` after the first
+    submission, or until `max_batch` items are queued, then runs the batch.
+    Items arriving while a batch is being written queue up for the next one,
+    so batches grow with load while an idle system pays at most one window
+    of extra latency.
+    """
+
+    def __init__(self, handler: GroupHandler, window_seconds: float = 0.002, max_batch: int = 256) -> None:
+        self._handler = handler
+        self._window = window_seconds
+        self._max_batch = max_batch
+        self._cond = threading.Condition()
+        self._pending: list[tuple[Any, Future]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def submit(self, item: Any) -> Future:
+        future: Future = Future()
+        with self._cond:
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+                self._thread.start()
+            self._pending.append((item, future))
+            if len(self._pending) == 1 or len(self._pending) >= self._max_batch:
+                self._cond.notify()
+        return future
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                deadline = time.monotonic() + self._window
+                while len(self._pending) < self._max_batch and not self._stopping:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending[:self._max_batch], self._pending[self._max_batch:]
+
+            try:
+                results = self._handler([item for item, _ in batch])
+            except Exception as exc:  # the commit itself failed, so nothing in the batch landed
+                results = [exc] * len(batch)
+            for (_, future), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+from app.core.database import engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+
+class Lease(ABC):
+    """An exclusive, non-blocking lease on `name` shared by every process on the same database.
+
+    The lease belongs to a resource the operating system or the database frees
+    when the holder dies, so a crashed worker never has to time out.
+    """
+
+    @abstractmethod
+    def acquire(self) -> bool:
+        ...
+
+    @abstractmethod
+    def check(self) -> bool:
+        """Whether the lease is still held; releases it if it was lost."""
+
+    @abstractmethod
+    def release(self) -> None:
+        ...
+
+
+class AdvisoryLockLease(Lease):
+    """MySQL `GET_LOCK` held on a connection kept out of the pool.
+
+    MySQL drops the lock the moment that connection closes, including when the
+    process holding it is killed.
+    """
+
+    def __init__(self, name: str, engine: Engine) -> None:
+        self._name = name
+        self._engine = engine
+        self._conn: Optional[Connection] = None
+
+    def acquire(self) -> bool:
+        if self._conn is not None:
+            return self.check()
+        conn = self._engine.connect()
+        try:
+            acquired = conn.execute(text("SELECT GET_LOCK(:name, 0)"), {"name": self._name}).scalar() == 1
+            conn.commit()
+        except Exception:
+            conn.close()
+            raise
+        if not acquired:
+            conn.close()
+            return False
+        self._conn = conn
+        return True
+
+    def check(self) -> bool:
+        if self._conn is None:
+            return False
+        try:
+            held = self._conn.execute(
+                text("SELECT IS_USED_LOCK(:name) = CONNECTION_ID()"), {"name": self._name}
+            ).scalar() == 1
+            self._conn.commit()
+        except Exception:
+            logger.warning("Lost the connection holding lease %s", self._name, exc_info=True)
+            held = False
+        if not held:
+            self._discard()
+        return held
+
+    def release(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": self._name})
+            self._conn.commit()
+        except Exception:
+            logger.warning("Could not release lease %s cleanly", self._name, exc_info=True)
+        self._discard()
+
+    def _discard(self) -> None:
+        conn, self._conn = self._conn, None
+        try:
+            conn.invalidate()
+        finally:
+            conn.close()
+
+
+class FileLease(Lease):
+    """`flock` on a local file, standing in for advisory locks on SQLite.
+
+    Only processes on the same host see each other, which is also all SQLite
+    supports. POSIX only.
+    """
+
+    def __init__(self, name: str, directory: Optional[str] = None) -> None:
+        self._path = os.path.join(directory or tempfile.gettempdir(), f"{name}.lock")
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        # Imported on use so the app still imports where fcntl does not exist
+        import fcntl
+
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def check(self) -> bool:
+        return self._fd is not None
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        import fcntl
+
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+
+
+def lease_for(name: str, engine: Engine = default_engine) -> Lease:
+    """Pick the lease that matches the database the app runs on."""
+    # Scope the name to the database so two deployments on one server do not collide
+    scope = hashlib.sha1(engine.url.render_as_string(hide_password=True).encode()).hexdigest()[:12]
+    scoped = f"bidbay-{name}-{scope}"
+    if engine.dialect.name == "mysql":
+        return AdvisoryLockLease(scoped, engine)
+    return FileLease(scoped)
+
+
+class LeaderJob:
+    """Runs a background job in exactly one process at a time.
+
+    Every worker starts a LeaderJob; each one polls for the lease, and only the
+    holder calls `on_elected`. The holder re-checks its lease on the same
+    interval and calls `on_demoted` as soon as it loses it, so a follower can
+    take over within about one interval of the leader dying.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        on_elected: Callable[[], None],
+        on_demoted: Callable[[], None],
+        lease: Optional[Lease] = None,
+        interval_seconds: Optional[float] = None,
+    ) -> None:
+        self.name = name
+        self._on_elected = on_elected
+        self._on_demoted = on_demoted
+        self._lease = lease or lease_for(name)
+        self._interval = interval_seconds or settings.LEADER_LEASE_INTERVAL_SECONDS
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.is_leader = False
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=f"leader-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        try:
+            while not self._stopping.is_set():
+                try:
+                    if self.is_leader:
+                        if not self._lease.check():
+                            logger.warning("Lost leadership of %s", self.name)
+                            self._demote()
+                    elif self._lease.acquire():
+                        logger.info("Elected leader of %s (pid %d)", self.name, os.getpid())
+                        try:
+                            self._on_elected()
+                        except Exception:
+                            self._lease.release()
+                            raise
+                        self.is_leader = True
+                except Exception:
+                    logger.exception("Leader election for %s failed", self.name)
+                self._stopping.wait(self._interval)
+        finally:
+            if self.is_leader:
+                self._demote()
+
+    def _demote(self) -> None:
+        self.is_leader = False
+        try:
+            self._on_demoted()
+        finally:
+            self._lease.release()
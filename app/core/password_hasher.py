@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from app.core.config import settings
+from app.core.security import pwd_context
+
+T = TypeVar("T")
+
+
+class HasherBusy(Exception):
+    """Every hashing slot is taken; the caller should be asked to retry later."""
+
+
+class PasswordHasher:
+    """Runs bcrypt on its own small thread pool, admitting a bounded number of callers.
+
+    At most `max_workers` hashes run at once and `max_queue` more wait for a
+    worker; anyone beyond that gets `HasherBusy` immediately instead of
+    queueing. A login storm therefore holds at most `max_workers + max_queue`
+    request threads and a few cores, and every other endpoint keeps the rest.
+    bcrypt releases the GIL while hashing, so threads are enough.
+
+    `max_workers=0` hashes on the caller's thread with no limit.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int) -> None:
+        self.max_workers = max_workers
+        self._executor = (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash") if max_workers else None
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue) if max_workers else None
+        self.rejected = 0
+
+    def hash(self, password: str) -> str:
+        return self._run(pwd_context.hash, password)
+
+    def verify_and_update(self, password: str, password_hash: str) -> tuple[bool, Optional[str]]:
+        """Check a password; on success also return a new hash if the stored one uses outdated settings."""
+        return self._run(pwd_context.verify_and_update, password, password_hash)
+
+    def stats(self) -> dict:
+        return {"workers": self.max_workers, "rejected": self.rejected}
+
+    def _run(self, fn: Callable[..., T], *args) -> T:
+        if self._executor is None:
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise HasherBusy()
+        try:
+            future: Future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import RefreshToken
+
+
+def _digest(token: str) -> str:
+    # Refresh tokens are 256 random bits, so unlike passwords they need no slow hash
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def issue_refresh_token(db: Session, user_id: int, family_id: Optional[str] = None) -> tuple[str, str]:
+    """Add a refresh token to the caller's transaction and return (token, family_id).
+
+    Only its hash is stored, so the value returned here is the only copy.
+    Without `family_id` the token starts a new session.
+    """
+    token = secrets.token_urlsafe(32)
+    family_id = family_id or uuid.uuid4().hex
+    db.add(
+        RefreshToken(
+            user_id=user_id,
+            family_id=family_id,
+            token_hash=_digest(token),
+            expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+    )
+    return token, family_id
+
+
+def rotate_refresh_token(db: Session, token: str) -> Optional[tuple[int, str, str]]:
+    """Spend `token` and issue its successor; return (user_id, family_id, new token), or None if refused.
+
+    Commits or rolls back. A token that was already spent means someone
+    else holds a copy of it, so the whole family is revoked and every
+    holder has to log in again.
+    """
+    now = datetime.utcnow()
+    row = db.query(RefreshToken).filter(RefreshToken.token_hash == _digest(token)).with_for_update().first()
+    if row is None or row.revoked_at is not None or row.expires_at <= now:
+        db.rollback()
+        return None
+    user_id, family_id = row.user_id, row.family_id
+    if row.used_at is not None:
+        revoke_refresh_family(db, family_id)
+        db.commit()
+        return None
+
+    row.used_at = now
+    new_token, _ = issue_refresh_token(db, user_id, family_id)
+    db.commit()
+    return user_id, family_id, new_token
+
+
+def revoke_refresh_family(db: Session, family_id: str) -> None:
+    """Revoke every refresh token of one session as part of the caller's transaction."""
+    # Bulk UPDATE does not autoflush; include tokens issued earlier in this transaction
+    db.flush()
+    db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from app.core.config import settings
+from app.models import ProductStatus
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A rendered JSON body and its ETag."""
+
+    etag: str
+    body: bytes
+
+
+class MemoryResultBackend:
+    """Entries and tag generations in this process.
+
+    Invalidations reach only this worker; other workers serve their copy
+    until its TTL runs out.
+    """
+
+    name = "memory"
+
+    def __init__(self, maxsize: int, ttl_seconds: float) -> None:
+        self._entries = TTLCache(maxsize, ttl_seconds)
+        self._lock = threading.Lock()
+        self._generations: dict[str, int] = {}
+
+    def generation(self, tag: str) -> int:
+        return self._generations.get(tag, 0)
+
+    def bump(self, tags: set[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        return self._entries.get(key)
+
+    def set(self, key: str, value: CachedResponse) -> None:
+        self._entries.set(key, value)
+
+    def stats(self) -> dict:
+        stats = self._entries.stats()
+        return {"size": stats["size"], "maxsize": stats["maxsize"], "evictions": stats["evictions"]}
+
+
+class RedisResultBackend:
+    """Entries and tag generations in Redis, shared by every worker.
+
+    Entries expire through Redis TTLs; size and LRU eviction are Redis's
+    `maxmemory` policy. Requires the optional `redis` package.
+    """
+
+    name = "redis"
+    prefix = "bidbay:cache:"
+
+    def __init__(self, url: str, ttl_seconds: float) -> None:
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("RESULT_CACHE_BACKEND=redis requires the 'redis' package") from exc
+        self._client = redis.Redis.from_url(url)
+        self._ttl_ms = int(ttl_seconds * 1000)
+
+    def generation(self, tag: str) -> int:
+        return int(self._client.get(f"{self.prefix}gen:{tag}") or 0)
+
+    def bump(self, tags: set[str]) -> None:
+        pipe = self._client.pipeline(transaction=False)
+        for tag in tags:
+            pipe.incr(f"{self.prefix}gen:{tag}")
+        pipe.execute()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        raw = self._client.get(f"{self.prefix}{key}")
+        if raw is None:
+            return None
+        etag, _, body = raw.partition(b"\n")
+        return CachedResponse(etag.decode(), body)
+
+    def set(self, key: str, value: CachedResponse) -> None:
+        self._client.set(f"{self.prefix}{key}", value.etag.encode() + b"\n" + value.body, px=self._ttl_ms)
+
+    def stats(self) -> dict:
+        return {"evictions": self._client.info("stats").get("evicted_keys")}
+
+
+class ResultCache:
+    """Caches rendered responses under keys that carry the generation of a tag.
+
+    A tag names a set of rows a response depends on, such as the products of
+    one category. Writers bump the tags they touched after committing, so
+    new lookups compute new keys and never see older entries, which simply
+    age out. Read a key before running the query it caches: if a write lands
+    in between, the result is stored under the old generation and is never
+    served.
+
+    Writes that only move prices, such as bids, can use `invalidate_soon`:
+    their tags are bumped together at most once per `batch_seconds`, so a
+    busy auction does not empty every list it appears in on each bid.
+
+    Backend errors are logged and treated as misses, so the cache never
+    fails a request.
+    """
+
+    def __init__(self, backend: Any = None, batch_seconds: float = 0.0) -> None:
+        self._backend = backend
+        self._batch_seconds = batch_seconds
+        self._lock = threading.Lock()
+        self._pending: set[str] = set()
+        self._flushed_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._backend is not None
+
+    def key(self, tag: str, params: dict[str, Any]) -> Optional[str]:
+        if self._backend is None:
+            return None
+        self._flush_due()
+        try:
+            generation = self._backend.generation(tag)
+        except Exception:
+            logger.exception("Result cache lookup failed")
+            return None
+        normalized = json.dumps(sorted((k, v) for k, v in params.items() if v is not None), default=str)
+        digest = hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+        return f"{tag}@{generation}:{digest}"
+
+    def get(self, key: Optional[str]) -> Optional[CachedResponse]:
+        if key is None:
+            return None
+        try:
+            value = self._backend.get(key)
+        except Exception:
+            logger.exception("Result cache lookup failed")
+            value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: Optional[str], value: CachedResponse) -> None:
+        if key is None:
+            return
+        try:
+            self._backend.set(key, value)
+        except Exception:
+            logger.exception("Result cache store failed")
+
+    def invalidate(self, *tags: str) -> None:
+        if self._backend is None or not tags:
+            return
+        try:
+            self._backend.bump(set(tags))
+        except Exception:
+            # Entries under the old generation stay visible until their TTL
+            logger.exception("Result cache invalidation failed for %s", ", ".join(sorted(tags)))
+
+    def invalidate_soon(self, *tags: str) -> None:
+        """Invalidate `tags` within `batch_seconds`, together with other pending tags."""
+        if self._backend is None or not tags:
+            return
+        with self._lock:
+            self._pending.update(tags)
+        self._flush_due()
+
+    def _flush_due(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if not self._pending or now - self._flushed_at < self._batch_seconds:
+                return
+            tags, self._pending = self._pending, set()
+            self._flushed_at = now
+        self.invalidate(*tags)
+
+    def stats(self) -> dict:
+        if self._backend is None:
+            return {"backend": None}
+        try:
+            backend_stats = self._backend.stats()
+        except Exception:
+            logger.exception("Result cache stats failed")
+            backend_stats = {}
+        return {"backend": self._backend.name, "hits": self.hits, "misses": self.misses, **backend_stats}
+
+
+def product_list_tag(
+    status: Optional[ProductStatus] = None, category_id: Optional[int] = None, seller_id: Optional[int] = None
+) -> str:
+    """The tag a product list depends on.
+
+    Every product in a filtered list matches its narrowest filter, so that
+    filter's tag covers the whole list.
+    """
+    if category_id:
+        return f"products:category:{category_id}"
+    if seller_id:
+        return f"products:seller:{seller_id}"
+    if status:
+        return f"products:status:{ProductStatus(status).value}"
+    return "products:all"
+
+
+def product_tags(category_id: Optional[int], seller_id: Optional[int], *statuses: ProductStatus) -> set[str]:
+    """Every tag a write to one product touches; pass both statuses when it changes."""
+    tags = {"products:all"}
+    if category_id:
+        tags.add(f"products:category:{category_id}")
+    if seller_id:
+        tags.add(f"products:seller:{seller_id}")
+    tags.update(f"products:status:{ProductStatus(status).value}" for status in statuses if status)
+    return tags
+
+
+def _backend_from_settings() -> Any:
+    if settings.RESULT_CACHE_BACKEND == "redis":
+        return RedisResultBackend(settings.RESULT_CACHE_REDIS_URL, settings.RESULT_CACHE_TTL_SECONDS)
+    if settings.RESULT_CACHE_BACKEND == "memory":
+        return MemoryResultBackend(settings.RESULT_CACHE_SIZE, settings.RESULT_CACHE_TTL_SECONDS)
+    return None
+
+
+result_cache = ResultCache(_backend_from_settings(), settings.RESULT_CACHE_BID_BATCH_SECONDS)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import RevokedToken
+from app.utils.bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+# Inserts can commit out of id order, so each sync re-reads this many ids below the highest seen
+SYNC_OVERLAP_IDS = 1000
+
+
+class RevocationList:
+    """Revoked access tokens, mirrored from `revoked_tokens` into a per-process Bloom filter.
+
+    Every authenticated request asks `is_revoked`. For a token that was never
+    revoked, which is nearly all of them, the answer is one hash of its
+    `jti` against the filter; only a filter hit queries the table, which
+    settles false positives exactly.
+
+    At most every `sync_seconds` one request pulls the rows added since the
+    highest id this process has seen, so a revocation made by another worker
+    applies within that interval; the worker that made it calls `add` and
+    applies it at once. When the filter holds more than it was sized for, it
+    is rebuilt from the unexpired rows at twice their number.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        sync_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_seconds = sync_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._filter: Optional[BloomFilter] = None
+        self._last_id = 0
+        self._synced_at = 0.0
+        self.checks = 0
+        self.table_checks = 0
+
+    def is_revoked(self, db: Session, jti: str) -> bool:
+        self._sync(db)
+        self.checks += 1
+        if jti not in self._filter:
+            return False
+        self.table_checks += 1
+        return db.query(RevokedToken.id).filter(RevokedToken.jti == jti).first() is not None
+
+    def add(self, jti: str) -> None:
+        """Apply a committed revocation in this process without waiting for the next sync."""
+        with self._lock:
+            if self._filter is not None and jti not in self._filter:
+                self._filter.add(jti)
+
+    def stats(self) -> dict:
+        bloom = self._filter
+        return {
+            "entries": len(bloom) if bloom is not None else 0,
+            "capacity": bloom.capacity if bloom is not None else self.capacity,
+            "last_id": self._last_id,
+            "checks": self.checks,
+            "table_checks": self.table_checks,
+        }
+
+    def _sync(self, db: Session) -> None:
+        if self._filter is not None and self._clock() - self._synced_at < self.sync_seconds:
+            return
+        # Until the first load every caller must wait; after that, whoever finds the lock taken
+        # carries on with the current filter
+        if not self._lock.acquire(blocking=self._filter is None):
+            return
+        try:
+            if self._filter is None:
+                self._rebuild(db)
+            elif self._clock() - self._synced_at >= self.sync_seconds:
+                self._pull(db)
+            self._synced_at = self._clock()
+        finally:
+            self._lock.release()
+
+    def _pull(self, db: Session) -> None:
+        rows = (
+            db.query(RevokedToken.id, RevokedToken.jti)
+            .filter(RevokedToken.id > self._last_id - SYNC_OVERLAP_IDS)
+            .order_by(RevokedToken.id)
+            .all()
+        )
+        for row_id, jti in rows:
+            # Rows in the overlap were usually seen already; a filter hit needs no second add
+            if jti not in self._filter:
+                self._filter.add(jti)
+            self._last_id = max(self._last_id, row_id)
+        if len(self._filter) > self._filter.capacity:
+            self._rebuild(db)
+
+    def _rebuild(self, db: Session) -> None:
+        last_id = db.query(func.max(RevokedToken.id)).scalar() or 0
+        jtis = [jti for (jti,) in db.query(RevokedToken.jti).filter(RevokedToken.expires_at > datetime.utcnow())]
+        bloom = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+        for jti in jtis:
+            bloom.add(jti)
+        self._filter = bloom
+        self._last_id = last_id
+        logger.info("Loaded %d revoked tokens into a filter for %d", len(jtis), bloom.capacity)
+
+
+revocation_list = RevocationList(
+    settings.REVOCATION_FILTER_CAPACITY,
+    settings.REVOCATION_FILTER_ERROR_RATE,
+    settings.REVOCATION_SYNC_SECONDS,
+)
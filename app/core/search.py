@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import ColumnElement, and_, event, or_, select
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session, object_session, selectinload
+
+from app.core.config import settings
+from app.core.database import engine
+from app.models import Product, ProductStatus
+from app.utils.inverted_index import InvertedIndex
+from app.utils.pagination import decode_key, encode_key
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SearchDocument:
+    """The columns of a `Product` the search index holds, copied when it is flushed."""
+
+    product_id: int
+    title: str
+    description: Optional[str]
+    status: ProductStatus
+    category_id: int
+    seller_id: int
+
+    @classmethod
+    def from_product(cls, product: Product) -> SearchDocument:
+        return cls(
+            product_id=product.id,
+            title=product.title,
+            description=product.description,
+            status=product.status,
+            category_id=product.category_id,
+            seller_id=product.seller_id,
+        )
+
+
+@dataclass(frozen=True)
+class SearchFilters:
+    status: Optional[ProductStatus] = None
+    category_id: Optional[int] = None
+    seller_id: Optional[int] = None
+
+
+def _decode_search_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        score, product_id = decode_key(cursor)
+        return float(score), int(product_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+class FulltextSearchBackend:
+    """MySQL `MATCH ... AGAINST` over the `ft_products_title_description` FULLTEXT index."""
+
+    def search(self, db: Session, q: str, filters: SearchFilters, cursor: Optional[str], limit: int) -> dict:
+        score = match(Product.title, Product.description, against=q).in_natural_language_mode()
+        query = db.query(Product, score).options(selectinload(Product.images)).filter(score > 0)
+        if filters.status:
+            query = query.filter(Product.status == filters.status)
+        if filters.category_id:
+            query = query.filter(Product.category_id == filters.category_id)
+        if filters.seller_id:
+            query = query.filter(Product.seller_id == filters.seller_id)
+        if cursor:
+            last_score, last_id = _decode_search_cursor(cursor)
+            query = query.filter(or_(score < last_score, and_(score == last_score, Product.id < last_id)))
+        rows = query.order_by(score.desc(), Product.id.desc()).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            product, last_score = rows[-1]
+            next_cursor = encode_key([float(last_score), product.id])
+        return {"items": [product for product, _ in rows], "next_cursor": next_cursor, "limit": limit}
+
+    def match_condition(self, db: Session, q: str) -> ColumnElement[bool]:
+        """A filter on `Product` for every product `q` matches, for queries other than `search`."""
+        return match(Product.title, Product.description, against=q).in_natural_language_mode() > 0
+
+    def index_product(self, doc: SearchDocument) -> None:
+        pass  # MySQL maintains the FULLTEXT index itself
+
+    def remove_product(self, product_id: int) -> None:
+        pass
+
+
+class InMemorySearchBackend:
+    """Process-local inverted index for SQLite and tests.
+
+    Built from the database on first use and kept current with `Product`
+    changes committed through this process's ORM, so it only sees writes
+    made here.
+    """
+
+    def __init__(self) -> None:
+        self._index = InvertedIndex()
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def search(self, db: Session, q: str, filters: SearchFilters, cursor: Optional[str], limit: int) -> dict:
+        self._ensure_loaded(db)
+        after = _decode_search_cursor(cursor) if cursor else None
+        hits = self._index.search(
+            q,
+            limit + 1,
+            status=filters.status.value if filters.status else None,
+            category_id=filters.category_id,
+            seller_id=filters.seller_id,
+            after=after,
+        )
+        next_cursor = None
+        if len(hits) > limit:
+            hits = hits[:limit]
+            next_cursor = encode_key(list(hits[-1]))
+        ids = [product_id for _, product_id in hits]
+        products = (
+            {p.id: p for p in db.query(Product).options(selectinload(Product.images)).filter(Product.id.in_(ids))}
+            if ids
+            else {}
+        )
+        items = [products[product_id] for product_id in ids if product_id in products]
+        return {"items": items, "next_cursor": next_cursor, "limit": limit}
+
+    def match_condition(self, db: Session, q: str) -> ColumnElement[bool]:
+        """A filter on `Product` for every product `q` matches, for queries other than `search`."""
+        self._ensure_loaded(db)
+        return Product.id.in_(sorted(self._index.matching(q)))
+
+    def index_product(self, doc: SearchDocument) -> None:
+        if self._loaded:
+            self._index.add(
+                doc.product_id,
+                doc.title,
+                doc.description,
+                doc.status.value,
+                doc.category_id,
+                doc.seller_id,
+            )
+
+    def remove_product(self, product_id: int) -> None:
+        if self._loaded:
+            self._index.remove(product_id)
+
+    def _ensure_loaded(self, db: Session) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            stmt = select(
+                Product.id, Product.title, Product.description, Product.status, Product.category_id, Product.seller_id
+            ).execution_options(yield_per=10_000)
+            for product_id, title, description, product_status, category_id, seller_id in db.execute(stmt):
+                self._index.add(product_id, title, description, product_status.value, category_id, seller_id)
+            self._loaded = True
+            logger.info("Built in-memory search index for %d products", len(self._index))
+
+
+def _backend_from_settings():
+    name = settings.SEARCH_BACKEND
+    if name == "auto":
+        name = "fulltext" if engine.dialect.name == "mysql" else "memory"
+    if name == "fulltext":
+        return FulltextSearchBackend()
+    return InMemorySearchBackend()
+
+
+search_backend = _backend_from_settings()
+
+
+_CHANGED_PRODUCTS = "search_changed_products"
+
+
+def _collect(target: Product, doc: Optional[SearchDocument]) -> None:
+    # Indexing at flush would let searches find changes that are later rolled back
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_CHANGED_PRODUCTS, {})[target.id] = doc
+
+
+@event.listens_for(Product, "after_insert")
+@event.listens_for(Product, "after_update")
+def _collect_indexed_product(mapper, connection, target: Product) -> None:
+    _collect(target, SearchDocument.from_product(target))
+
+
+@event.listens_for(Product, "after_delete")
+def _collect_removed_product(mapper, connection, target: Product) -> None:
+    _collect(target, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changed_products(session: Session) -> None:
+    for product_id, doc in session.info.pop(_CHANGED_PRODUCTS, {}).items():
+        if doc is None:
+            search_backend.remove_product(product_id)
+        else:
+            search_backend.index_product(doc)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_products(session: Session) -> None:
+    session.info.pop(_CHANGED_PRODUCTS, None)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Sequence
+
+# handler(key, items) -> one result per item; an Exception instance fails that item only
+BatchHandler = Callable[[Hashable, Sequence[Any]], Sequence[Any]]
+
+
+class _Lane:
+    __slots__ = ("pending", "scheduled")
+
+    def __init__(self) -> None:
+        self.pending: deque[tuple[Any, Future]] = deque()
+        self.scheduled = False
+
+
+class KeyedSequencer:
+    """Runs work for the same key strictly in order, one batch at a time.
+
+    Each key behaves like a small actor: submissions queue on the key's lane and
+    a single drain task at a time processes everything queued so far as one
+    batch. Different keys drain in parallel on a bounded thread pool, so a hot
+    key never holds more than one worker.
+    """
+
+    def __init__(self, handler: BatchHandler, max_workers: int = 8, max_batch: int = 64) -> None:
+        self._handler = handler
+        self._max_batch = max_batch
+        self._lock = threading.Lock()
+        self._lanes: dict[Hashable, _Lane] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sequencer")
+
+    def submit(self, key: Hashable, item: Any) -> Future:
+        future: Future = Future()
+        with self._lock:
+            lane = self._lanes.get(key)
+            if lane is None:
+                lane = self._lanes[key] = _Lane()
+            lane.pending.append((item, future))
+            if not lane.scheduled:
+                lane.scheduled = True
+                self._executor.submit(self._drain, key, lane)
+        return future
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _drain(self, key: Hashable, lane: _Lane) -> None:
+        with self._lock:
+            batch = [lane.pending.popleft() for _ in range(min(len(lane.pending), self._max_batch))]
+
+        try:
+            results = self._handler(key, [item for item, _ in batch])
+        except Exception as exc:  # the whole batch failed, e.g. the database went away
+            results = [exc] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+        with self._lock:
+            if lane.pending:
+                self._executor.submit(self._drain, key, lane)
+            else:
+                lane.scheduled = False
+                del self._lanes[key]
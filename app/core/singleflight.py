@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from typing import Callable, Hashable, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Collapses concurrent identical reads into one.
+
+    The first caller for a key runs the function; callers arriving while it
+    is still running wait for it and share its result, or its exception.
+    Nothing outlives the call, but a joiner can get a result read before a
+    write it has already seen committed. Put the version the caller read into
+    the key where that matters, so it only joins reads at least that new.
+
+    Results are handed to other threads, so they must be plain data or
+    pydantic models, never ORM objects bound to the first caller's session.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+        self.runs = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        if not self.enabled:
+            return fn()
+        with self._lock:
+            future = self._calls.get(key)
+            if future is None:
+                future = self._calls[key] = Future()
+                leader = True
+                self.runs += 1
+            else:
+                leader = False
+                self.shared += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            self._finish(key)
+            future.set_exception(exc)
+            raise
+        self._finish(key)
+        future.set_result(result)
+        return result
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, "runs": self.runs, "shared": self.shared, "in_flight": len(self._calls)}
+
+    def _finish(self, key: Hashable) -> None:
+        with self._lock:
+            del self._calls[key]
+
+
+single_flight = SingleFlight(enabled=settings.SINGLE_FLIGHT_ENABLED)
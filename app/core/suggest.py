@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import Bid, Product, ProductStatus
+from app.utils.prefix_index import PrefixIndex
+
+logger = logging.getLogger(__name__)
+
+
+class SuggestIndex:
+    """Title autocomplete over active auctions, ranked by how many bids they have.
+
+    Loaded once from the database (at startup, or on first use) and then kept
+    current by the endpoints and the closer that change products and bids,
+    the same way they keep `auction_cache` current. Only the leader runs the
+    closer, so every worker also drops auctions past their end when it
+    meets them in a lookup.
+    """
+
+    def __init__(self, k: int = 10, session_factory=SessionLocal) -> None:
+        self._index = PrefixIndex(k)
+        self._ends: dict[int, datetime] = {}
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    @property
+    def k(self) -> int:
+        return self._index.k
+
+    def load(self, db: Optional[Session] = None) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            own_session = db is None
+            db = db or self._session_factory()
+            try:
+                bid_counts = (
+                    select(Bid.product_id, func.count().label("bid_count"))
+                    .join(Product, Product.id == Bid.product_id)
+                    .where(Product.status == ProductStatus.ACTIVE)
+                    .group_by(Bid.product_id)
+                    .subquery()
+                )
+                stmt = (
+                    select(
+                        Product.id,
+                        Product.title,
+                        Product.auction_end_at,
+                        func.coalesce(bid_counts.c.bid_count, 0),
+                    )
+                    .outerjoin(bid_counts, bid_counts.c.product_id == Product.id)
+                    .where(Product.status == ProductStatus.ACTIVE)
+                    .execution_options(yield_per=10_000)
+                )
+                for product_id, title, auction_end_at, bid_count in db.execute(stmt):
+                    self._ends[product_id] = auction_end_at
+                    self._index.add(product_id, title, bid_count)
+            finally:
+                if own_session:
+                    db.close()
+            self._loaded = True
+            logger.info("Built suggest index for %d active products", len(self._index))
+
+    def suggest(self, db: Session, prefix: str, limit: int) -> list[tuple[int, str, float]]:
+        self.load(db)
+        now = datetime.utcnow()
+        while True:
+            hits = self._index.search(prefix, limit)
+            ended = [product_id for product_id, _, _ in hits if self._ends.get(product_id, now) <= now]
+            if not ended:
+                return hits
+            for product_id in ended:
+                self.remove(product_id)
+
+    def update_product(self, product: Product) -> None:
+        """Re-index a product after it was created or edited."""
+        if not self._loaded:
+            return
+        if product.status != ProductStatus.ACTIVE:
+            self.remove(product.id)
+            return
+        self._ends[product.id] = product.auction_end_at
+        if product.id in self._index:
+            # Keep the bid count earned so far; a new title just moves it in the trie
+            self._index.add(product.id, product.title, self._index.score(product.id))
+        else:
+            self._index.add(product.id, product.title)
+
+    def record_bids(self, product_id: int, count: int = 1, auction_end_at: Optional[datetime] = None) -> None:
+        if not self._loaded:
+            return
+        if auction_end_at is not None and product_id in self._ends:
+            self._ends[product_id] = auction_end_at
+        self._index.bump(product_id, count)
+
+    def remove(self, product_id: int) -> None:
+        if self._loaded:
+            self._index.remove(product_id)
+            self._ends.pop(product_id, None)
+
+
+suggest_index = SuggestIndex(k=settings.SUGGEST_MAX_LIMIT)
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.models import User, UserRole
+from app.utils.ttl_cache import TTLCache
+
+
+@dataclass(frozen=True)
+class UserIdentity:
+    """The columns of a `User` that authentication hands to endpoints.
+
+    Immutable and detached from any session, so one instance can be shared
+    by every request made with the same account. An identity built from
+    token claims alone carries only `id` and `role`.
+    """
+
+    id: int
+    role: UserRole
+    email: Optional[str] = None
+    full_name: Optional[str] = None
+    phone_number: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    @classmethod
+    def from_user(cls, user: User) -> UserIdentity:
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            phone_number=user.phone_number,
+            role=user.role,
+            created_at=user.created_at,
+        )
+
+    @classmethod
+    def from_claims(cls, user_id: int, role: UserRole) -> UserIdentity:
+        return cls(id=user_id, role=role)
+
+
+class UserCache:
+    """Authenticated users by id, so a request does not need its own `SELECT` from users.
+
+    Updates and deletes made through the ORM in this process evict the user
+    once their transaction commits; other workers, and bulk `UPDATE`s, are
+    caught up by the TTL.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float) -> None:
+        self._entries = TTLCache(maxsize, ttl_seconds)
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def get(self, user_id: int) -> Optional[UserIdentity]:
+        return self._entries.get(user_id)
+
+    def generation(self) -> int:
+        """Read before loading a user from the database, and pass to `put`."""
+        return self._generation
+
+    def put(self, user: User, generation: int) -> UserIdentity:
+        identity = UserIdentity.from_user(user)
+        with self._lock:
+            # Something was invalidated while this user was loaded; the row may predate that commit
+            if generation == self._generation:
+                self._entries.set(user.id, identity)
+        return identity
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(user_id)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return self._entries.stats()
+
+
+user_cache = UserCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL_SECONDS)
+
+
+_CHANGED_USERS = "user_cache_changed_ids"
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _collect_changed_user(mapper, connection, target: User) -> None:
+    # Evicting at flush would let another request re-cache the row before this change commits
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_CHANGED_USERS, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_changed_users(session: Session) -> None:
+    for user_id in session.info.pop(_CHANGED_USERS, ()):
+        user_cache.invalidate(user_id)
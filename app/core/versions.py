@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models import VersionCounter
+
+CATEGORIES = "categories"
+
+
+def current_version(db: Session, name: str) -> int:
+    value = db.query(VersionCounter.value).filter(VersionCounter.name == name).scalar()
+    return value or 0
+
+
+def bump_version(db: Session, name: str) -> None:
+    """Increment counter `name` as part of the caller's transaction."""
+    result = db.execute(
+        update(VersionCounter)
+        .where(VersionCounter.name == name)
+        .values(value=VersionCounter.value + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        db.add(VersionCounter(name=name, value=1))
+        db.flush()
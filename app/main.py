@@ -3,7 +3,16 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
 
-from app.api import auth, addresses, analytics, bids, categories, favorites, orders, payments, products
+from app.api import auth, addresses, analytics, bids, categories, deps, events, favorites, orders, payments, products
+from app.core.auction_closer import auction_closer
+from app.core.config import settings
+from app.core.events import event_broker
+from app.core.leader import LeaderJob
+from app.core.revocation import revocation_list
+from app.core.result_cache import result_cache
+from app.core.singleflight import single_flight
+from app.core.suggest import suggest_index
+from app.core.user_cache import user_cache
 
 app = FastAPI(
     title="BidBay API",
@@ -32,6 +41,27 @@ app.include_router(bids.router)
 app.include_router(favorites.router)
 app.include_router(orders.router)
 app.include_router(payments.router)
+app.include_router(events.router)
+
+
+# Each uvicorn worker runs these, but only the lease holder runs the job itself
+background_jobs = []
+if settings.AUCTION_CLOSER_ENABLED:
+    background_jobs.append(LeaderJob("auction-closer", auction_closer.start, auction_closer.stop))
+
+
+@app.on_event("startup")
+def start_background_jobs():
+    suggest_index.load()
+    for job in background_jobs:
+        job.start()
+
+
+@app.on_event("shutdown")
+def stop_background_jobs():
+    for job in background_jobs:
+        job.stop()
+    event_broker.close()
 
 
 @app.get("/", include_in_schema=False)
@@ -42,3 +72,16 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/health/cache")
+def cache_stats():
+    return {
+        "product_lists": result_cache.stats(),
+        "product_detail": products.product_detail_cache.stats(),
+        "product_facets": products.product_facet_cache.stats(),
+        "users": user_cache.stats(),
+        "tokens": deps.token_cache.stats(),
+        "revocations": revocation_list.stats(),
+        "single_flight": single_flight.stats(),
+    }
@@ -7,6 +7,9 @@ from app.models.bid import Bid, BidStatus
 from app.models.favorite import Favorite
 from app.models.order import Order, OrderStatus
 from app.models.payment import Payment, PaymentStatus
+from app.models.version_counter import VersionCounter
+from app.models.revoked_token import RevokedToken
+from app.models.refresh_token import RefreshToken
 
 __all__ = [
     "User",
@@ -23,4 +26,7 @@ __all__ = [
     "OrderStatus",
     "Payment",
     "PaymentStatus",
+    "VersionCounter",
+    "RevokedToken",
+    "RefreshToken",
 ]
@@ -1,6 +1,7 @@
 import enum
 from datetime import datetime
 from decimal import Decimal
+from typing import Optional
 
 from sqlalchemy import Enum, DateTime, ForeignKey, Numeric, Index, CheckConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -23,6 +24,8 @@ class Bid(Base):
     product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), nullable=False, index=True)
     bidder_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
     amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+    # Proxy ceiling: the engine bids on the bidder's behalf up to this amount
+    max_amount: Mapped[Optional[Decimal]] = mapped_column(Numeric(12, 2), nullable=True)
     status: Mapped[BidStatus] = mapped_column(Enum(BidStatus), nullable=False, default=BidStatus.PENDING)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
 
@@ -35,6 +38,8 @@ class Bid(Base):
     __table_args__ = (
         Index("ix_bids_product_amount", "product_id", "amount"),
         Index("ix_bids_product_bidder_created", "product_id", "bidder_id", "created_at"),
+        Index("ix_bids_product_created_id", "product_id", "created_at", "id"),
+        Index("ix_bids_bidder_created_id", "bidder_id", "created_at", "id"),
         CheckConstraint("amount > 0", name="ck_bids_amount_positive"),
     )
 
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, PrimaryKeyConstraint, func
+from sqlalchemy import DateTime, ForeignKey, Index, PrimaryKeyConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -16,6 +16,7 @@ class Favorite(Base):
     # Composite primary key
     __table_args__ = (
         PrimaryKeyConstraint("user_id", "product_id"),
+        Index("ix_favorites_user_created_product", "user_id", "created_at", "product_id"),
     )
 
     # Relationships
@@ -2,7 +2,7 @@ import enum
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import Enum, DateTime, ForeignKey, Numeric, func
+from sqlalchemy import Enum, DateTime, ForeignKey, Index, Numeric, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -35,5 +35,11 @@ class Order(Base):
     bid = relationship("Bid", back_populates="order")
     payment = relationship("Payment", back_populates="order", uselist=False)
 
+    # Keyset pagination of a buyer's orders and a seller's sales
+    __table_args__ = (
+        Index("ix_orders_buyer_created_id", "buyer_id", "created_at", "id"),
+        Index("ix_orders_seller_created_id", "seller_id", "created_at", "id"),
+    )
+
     def __repr__(self) -> str:
         return f"<Order(id={self.id}, product_id={self.product_id}, status={self.status})>"
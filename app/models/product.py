@@ -5,7 +5,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import String, Text, Enum, DateTime, ForeignKey, Numeric, Index, func
+from sqlalchemy import String, Text, Enum, DateTime, ForeignKey, Integer, Numeric, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -33,6 +33,20 @@ class Product(Base):
         Enum(ProductStatus), nullable=False, default=ProductStatus.ACTIVE, index=True
     )
     accepted_bid_id: Mapped[Optional[int]] = mapped_column(ForeignKey("bids.id"), nullable=True)
+    # Denormalized leader, advanced only by the conditional UPDATE in place_bid
+    current_price: Mapped[Decimal] = mapped_column(
+        Numeric(12, 2),
+        nullable=False,
+        default=lambda ctx: ctx.get_current_parameters()["starting_price"],
+    )
+    leading_bid_id: Mapped[Optional[int]] = mapped_column(ForeignKey("bids.id"), nullable=True)
+    # Denormalized count of bid rows, advanced with the leader in place_bid; backs the "most bids" sort
+    bid_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # Soft close: a bid in the final window pushes auction_end_at out to now + extension
+    soft_close_window_seconds: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    soft_close_extension_seconds: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # Bumped by every write that changes what a product read returns: edits, images, bids, closing
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
 
     # Relationships
@@ -41,12 +55,30 @@ class Product(Base):
     images = relationship("ProductImage", back_populates="product", cascade="all, delete-orphan")
     bids = relationship("Bid", back_populates="product", foreign_keys="Bid.product_id")
     accepted_bid = relationship("Bid", foreign_keys=[accepted_bid_id], post_update=True)
+    leading_bid = relationship("Bid", foreign_keys=[leading_bid_id], post_update=True)
     favorites = relationship("Favorite", back_populates="product", cascade="all, delete-orphan")
     orders = relationship("Order", back_populates="product")
 
     # Composite indexes for common queries
     __table_args__ = (
         Index("ix_products_status_auction_end", "status", "auction_end_at"),
+        # Keyset pagination on (created_at, id), unfiltered and per list filter
+        Index("ix_products_created_id", "created_at", "id"),
+        Index("ix_products_status_created_id", "status", "created_at", "id"),
+        Index("ix_products_seller_created_id", "seller_id", "created_at", "id"),
+        Index("ix_products_category_created_id", "category_id", "created_at", "id"),
+        # Keyset pagination for the other list sorts. InnoDB appends the primary key to every
+        # secondary index, so ix_products_status_auction_end and the auction_end_at index already
+        # serve "ending soon". Seller lists are small enough to sort from the seller index.
+        Index("ix_products_category_end_id", "category_id", "auction_end_at", "id"),
+        Index("ix_products_price_id", "current_price", "id"),
+        Index("ix_products_status_price_id", "status", "current_price", "id"),
+        Index("ix_products_category_price_id", "category_id", "current_price", "id"),
+        Index("ix_products_bids_id", "bid_count", "id"),
+        Index("ix_products_status_bids_id", "status", "bid_count", "id"),
+        Index("ix_products_category_bids_id", "category_id", "bid_count", "id"),
+        # FULLTEXT on MySQL for app/core/search.py; a plain index elsewhere
+        Index("ft_products_title_description", "title", "description", mysql_prefix="FULLTEXT"),
     )
 
     def __repr__(self) -> str:
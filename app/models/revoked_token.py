@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class RevokedToken(Base):
+    """An access token refused before its expiry, by its `jti` claim.
+
+    Rows are append-only; `id` orders them so workers can pick up new ones
+    incrementally (see app/core/revocation.py). Once `expires_at` has
+    passed the token is refused anyway and the row can be deleted.
+    """
+
+    __tablename__ = "revoked_tokens"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    jti: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    revoked_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<RevokedToken(id={self.id}, jti={self.jti}, user_id={self.user_id})>"
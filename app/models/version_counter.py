@@ -0,0 +1,16 @@
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class VersionCounter(Base):
+    """A named counter bumped whenever a set of rows changes, e.g. "categories"."""
+
+    __tablename__ = "version_counters"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    value: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    def __repr__(self) -> str:
+        return f"<VersionCounter(name={self.name}, value={self.value})>"
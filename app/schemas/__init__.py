@@ -1,15 +1,29 @@
-from app.schemas.token import Token, TokenPayload
+from app.schemas.token import RefreshRequest, Token, TokenPayload
 from app.schemas.user import UserBase, UserCreate, UserLogin, UserResponse, UserUpdate
 from app.schemas.address import AddressCreate, AddressResponse
 from app.schemas.category import CategoryCreate, CategoryResponse
-from app.schemas.product import ProductCreate, ProductResponse, ProductUpdate
+from app.schemas.product import (
+    CategoryFacet,
+    PriceFacet,
+    ProductCreate,
+    ProductDetailResponse,
+    ProductFacets,
+    ProductResponse,
+    ProductSort,
+    ProductSuggestion,
+    ProductUpdate,
+    SellerSummary,
+    StatusFacet,
+)
 from app.schemas.product_image import ProductImageCreate, ProductImageResponse
-from app.schemas.bid import BidCreate, BidResponse
+from app.schemas.bid import BidBatchResult, BidCreate, BidResponse, BidSummary, OwnBidResponse
 from app.schemas.favorite import FavoriteCreate, FavoriteResponse
 from app.schemas.order import OrderResponse
 from app.schemas.payment import PaymentCreate, PaymentResponse
+from app.schemas.pagination import Page
 
 __all__ = [
+    "RefreshRequest",
     "Token",
     "TokenPayload",
     "UserBase",
@@ -21,16 +35,28 @@ __all__ = [
     "AddressResponse",
     "CategoryCreate",
     "CategoryResponse",
+    "CategoryFacet",
+    "PriceFacet",
     "ProductCreate",
+    "ProductDetailResponse",
+    "ProductFacets",
     "ProductResponse",
+    "ProductSort",
+    "ProductSuggestion",
     "ProductUpdate",
+    "SellerSummary",
+    "StatusFacet",
     "ProductImageCreate",
     "ProductImageResponse",
+    "BidBatchResult",
     "BidCreate",
     "BidResponse",
+    "BidSummary",
+    "OwnBidResponse",
     "FavoriteCreate",
     "FavoriteResponse",
     "OrderResponse",
     "PaymentCreate",
     "PaymentResponse",
+    "Page",
 ]
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from datetime import datetime
 from decimal import Decimal
+from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from app.models.bid import BidStatus
 
@@ -14,7 +15,13 @@ class BidBase(BaseModel):
 
 
 class BidCreate(BidBase):
-    pass
+    max_amount: Optional[Decimal] = Field(None, gt=0)
+
+    @model_validator(mode="after")
+    def check_max_amount(self) -> "BidCreate":
+        if self.max_amount is not None and self.max_amount < self.amount:
+            raise ValueError("max_amount must be at least amount")
+        return self
 
 
 class BidResponse(BidBase):
@@ -24,3 +31,26 @@ class BidResponse(BidBase):
     created_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class BidSummary(BaseModel):
+    """A bid as anyone may see it: no bidder and no proxy ceiling."""
+
+    id: int
+    amount: Decimal
+    status: BidStatus
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class OwnBidResponse(BidResponse):
+    """A bid as its bidder sees it. The proxy ceiling is never shown to anyone else."""
+
+    max_amount: Optional[Decimal] = None
+
+
+class BidBatchResult(BaseModel):
+    status_code: int
+    bid: Optional[OwnBidResponse] = None
+    detail: Optional[str] = None
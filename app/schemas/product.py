@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import enum
 from datetime import datetime
 from decimal import Decimal
 from typing import Optional
@@ -7,9 +8,17 @@ from typing import Optional
 from pydantic import BaseModel, Field
 
 from app.models.product import ProductStatus
+from app.schemas.bid import BidSummary
 from app.schemas.product_image import ProductImageResponse
 
 
+class ProductSort(str, enum.Enum):
+    NEWEST = "newest"
+    ENDING_SOON = "ending_soon"
+    PRICE_LOW = "price_low"
+    MOST_BIDS = "most_bids"
+
+
 class ProductBase(BaseModel):
     category_id: int
     title: str = Field(..., min_length=1, max_length=255)
@@ -17,6 +26,8 @@ class ProductBase(BaseModel):
     starting_price: Decimal = Field(..., gt=0)
     min_increment: Decimal = Field(Decimal("1.00"), gt=0)
     auction_end_at: datetime
+    soft_close_window_seconds: int = Field(0, ge=0)
+    soft_close_extension_seconds: int = Field(0, ge=0)
 
 
 class ProductCreate(ProductBase):
@@ -30,6 +41,8 @@ class ProductUpdate(BaseModel):
     starting_price: Optional[Decimal] = Field(None, gt=0)
     min_increment: Optional[Decimal] = Field(None, gt=0)
     auction_end_at: Optional[datetime] = None
+    soft_close_window_seconds: Optional[int] = Field(None, ge=0)
+    soft_close_extension_seconds: Optional[int] = Field(None, ge=0)
     status: Optional[ProductStatus] = None
 
 
@@ -38,7 +51,57 @@ class ProductResponse(ProductBase):
     seller_id: int
     status: ProductStatus
     accepted_bid_id: Optional[int] = None
+    current_price: Decimal
+    leading_bid_id: Optional[int] = None
+    bid_count: int = 0
     created_at: datetime
     images: list[ProductImageResponse] = Field(default_factory=list)
 
     model_config = {"from_attributes": True}
+
+
+class SellerSummary(BaseModel):
+    id: int
+    full_name: str
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class ProductDetailResponse(ProductResponse):
+    version: int
+    high_bid: Optional[BidSummary] = None
+    bid_count: int
+    bidder_count: int
+    favorite_count: int
+    is_favorited: bool
+    seller: SellerSummary
+
+
+class CategoryFacet(BaseModel):
+    category_id: int
+    count: int
+
+
+class StatusFacet(BaseModel):
+    status: ProductStatus
+    count: int
+
+
+class PriceFacet(BaseModel):
+    min: Decimal
+    max: Optional[Decimal] = None  # None for the open-ended top range
+    count: int
+
+
+class ProductFacets(BaseModel):
+    total: int
+    categories: list[CategoryFacet]
+    statuses: list[StatusFacet]
+    price_ranges: list[PriceFacet]
+
+
+class ProductSuggestion(BaseModel):
+    id: int
+    title: str
+    bid_count: int
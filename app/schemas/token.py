@@ -4,11 +4,22 @@ from typing import Optional
 
 from pydantic import BaseModel
 
+from app.models.user import UserRole
+
 
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
 
 
 class TokenPayload(BaseModel):
     sub: Optional[int] = None
+    role: Optional[UserRole] = None
+    jti: Optional[str] = None
+    exp: Optional[int] = None
+    sid: Optional[str] = None  # the refresh token family the access token was issued for
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import hashlib
+import math
+
+
+class BloomFilter:
+    """Fixed-size set of strings that may report false positives but never false negatives.
+
+    Sized for `capacity` items at `error_rate` false positives; past that
+    the rate climbs, so callers rebuild a larger filter. Each lookup hashes
+    the item once and derives every bit position from that digest.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        self.capacity = max(1, capacity)
+        self.bits = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / self.capacity * math.log(2)))
+        self._array = bytearray((self.bits + 7) // 8)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, item: str) -> bool:
+        array = self._array
+        return all(array[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def add(self, item: str) -> None:
+        for p in self._positions(item):
+            self._array[p >> 3] |= 1 << (p & 7)
+        self._count += 1
+
+    def _positions(self, item: str) -> list[int]:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response, status
+
+# Let clients keep a copy but revalidate it on every use
+CACHE_CONTROL = "no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """A strong ETag for a response fully determined by `parts`."""
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether `If-None-Match` names `etag`, using the weak comparison RFC 9110 prescribes for it."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+_TOKEN = re.compile(r"[^\W_]+")
+
+# Title matches count this many times a description match
+TITLE_WEIGHT = 3
+
+# InnoDB's default FULLTEXT stopwords, so both search backends ignore the same words
+STOPWORDS = frozenset(
+    "a about an are as at be by com de en for from how i in is it la of on or that the this to was what "
+    "when where who will with und www".split()
+)
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    return _TOKEN.findall(text.lower()) if text else []
+
+
+@dataclass(frozen=True)
+class _Doc:
+    length: int
+    terms: tuple[str, ...]
+    status: Optional[str]
+    category_id: Optional[int]
+    seller_id: Optional[int]
+
+
+class InvertedIndex:
+    """In-memory full-text index with BM25 ranking and exact-match filters.
+
+    Each term maps to the documents containing it and their weighted term
+    frequency, so a query only touches the postings of its own terms. Terms
+    are OR-ed, like MySQL's natural language mode; documents matching more
+    and rarer terms rank higher.
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._postings: dict[str, dict[int, int]] = {}
+        self._docs: dict[int, _Doc] = {}
+        self._by_category: dict[int, set[int]] = {}
+        self._by_seller: dict[int, set[int]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(
+        self,
+        doc_id: int,
+        title: str,
+        description: Optional[str] = None,
+        status: Optional[str] = None,
+        category_id: Optional[int] = None,
+        seller_id: Optional[int] = None,
+    ) -> None:
+        """Index a document, replacing any previous version of it."""
+        counts = Counter(t for t in tokenize(description) if t not in STOPWORDS)
+        for term in tokenize(title):
+            if term not in STOPWORDS:
+                counts[term] += TITLE_WEIGHT
+        doc = _Doc(sum(counts.values()), tuple(counts), status, category_id, seller_id)
+        with self._lock:
+            self._remove(doc_id)
+            self._docs[doc_id] = doc
+            self._total_length += doc.length
+            for term, tf in counts.items():
+                self._postings.setdefault(term, {})[doc_id] = tf
+            if category_id is not None:
+                self._by_category.setdefault(category_id, set()).add(doc_id)
+            if seller_id is not None:
+                self._by_seller.setdefault(seller_id, set()).add(doc_id)
+
+    def remove(self, doc_id: int) -> None:
+        with self._lock:
+            self._remove(doc_id)
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        status: Optional[str] = None,
+        category_id: Optional[int] = None,
+        seller_id: Optional[int] = None,
+        after: Optional[tuple[float, int]] = None,
+    ) -> list[tuple[float, int]]:
+        """Return up to `limit` (score, doc_id) pairs, best first, ranked below `after` if given."""
+        with self._lock:
+            terms = [self._postings[t] for t in set(tokenize(query)) if t in self._postings]
+            if not terms:
+                return []
+            # Rarest first: they carry the most weight and the fewest postings
+            terms.sort(key=len)
+            n = len(self._docs)
+            idfs = [math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for p in terms]
+
+            subset = self._filter_subset(category_id, seller_id)
+            if subset is not None and len(subset) < sum(len(p) for p in terms):
+                scores = self._score_subset(terms, idfs, subset, status)
+            else:
+                scores = self._score_postings(terms, idfs, limit, status, category_id, seller_id, after)
+
+        ranked = ((score, doc_id) for doc_id, score in scores.items())
+        if after is not None:
+            ranked = (key for key in ranked if key < after)
+        return heapq.nlargest(limit, ranked)
+
+    def matching(self, query: str) -> set[int]:
+        """Every document containing at least one of the query's terms, unranked."""
+        with self._lock:
+            postings = [self._postings[t] for t in set(tokenize(query)) if t in self._postings]
+            return set().union(*postings)
+
+    def _filter_subset(self, category_id: Optional[int], seller_id: Optional[int]) -> Optional[set[int]]:
+        sets = []
+        if category_id is not None:
+            sets.append(self._by_category.get(category_id, set()))
+        if seller_id is not None:
+            sets.append(self._by_seller.get(seller_id, set()))
+        if not sets:
+            return None
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:]) if len(sets) > 1 else sets[0]
+
+    def _bm25(self, idf: float, tf: int, length: int) -> float:
+        k1, b = self.k1, self.b
+        return idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length * len(self._docs) / self._total_length))
+
+    def _score_subset(
+        self, terms: list[dict[int, int]], idfs: list[float], subset: set[int], status: Optional[str]
+    ) -> dict[int, float]:
+        """Score a small, pre-filtered set of documents by probing each term's postings."""
+        scores = {}
+        for doc_id in subset:
+            doc = self._docs[doc_id]
+            if status is not None and doc.status != status:
+                continue
+            score = 0.0
+            for postings, idf in zip(terms, idfs):
+                tf = postings.get(doc_id)
+                if tf:
+                    score += self._bm25(idf, tf, doc.length)
+            if score:
+                scores[doc_id] = score
+        return scores
+
+    def _score_postings(
+        self,
+        terms: list[dict[int, int]],
+        idfs: list[float],
+        limit: int,
+        status: Optional[str],
+        category_id: Optional[int],
+        seller_id: Optional[int],
+        after: Optional[tuple[float, int]],
+    ) -> dict[int, float]:
+        """Score every document in the terms' postings, skipping what cannot reach the top `limit`."""
+        docs = self._docs
+        k1 = self.k1
+        filtered = status is not None or category_id is not None or seller_id is not None
+
+        def eligible(doc_id: int) -> bool:
+            doc = docs[doc_id]
+            return (
+                (status is None or doc.status == status)
+                and (category_id is None or doc.category_id == category_id)
+                and (seller_id is None or doc.seller_id == seller_id)
+            )
+
+        # Upper bound on what the terms from i on can still add to a score (tf -> infinity)
+        remaining = [0.0] * (len(terms) + 1)
+        for i in range(len(terms) - 1, -1, -1):
+            remaining[i] = remaining[i + 1] + idfs[i] * (k1 + 1)
+
+        bm25 = self._bm25
+        scores: dict[int, float] = {}
+        for i, (postings, idf) in enumerate(zip(terms, idfs)):
+            # MaxScore: once the current top `limit` cannot be beaten by a document
+            # that only matches the remaining terms, those terms just rescore candidates
+            if after is None and len(postings) > len(scores) >= limit:
+                top = heapq.nlargest(limit, (v for d, v in scores.items() if not filtered or eligible(d)))
+                if len(top) == limit and top[-1] > remaining[i]:
+                    for doc_id, score in scores.items():
+                        tf = postings.get(doc_id)
+                        if tf:
+                            scores[doc_id] = score + bm25(idf, tf, docs[doc_id].length)
+                    continue
+            for doc_id, tf in postings.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + bm25(idf, tf, docs[doc_id].length)
+
+        if filtered:
+            return {doc_id: score for doc_id, score in scores.items() if eligible(doc_id)}
+        return scores
+
+    def _remove(self, doc_id: int) -> None:
+        doc = self._docs.pop(doc_id, None)
+        if doc is None:
+            return
+        self._total_length -= doc.length
+        for term in doc.terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        for groups, key in ((self._by_category, doc.category_id), (self._by_seller, doc.seller_id)):
+            if key is not None:
+                group = groups[key]
+                group.discard(doc_id)
+                if not group:
+                    del groups[key]
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Optional, Sequence
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query as OrmQuery
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+CursorParam = Query(None, description="Opaque cursor from the previous page's next_cursor")
+LimitParam = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT)
+
+
+def encode_key(values: list) -> str:
+    """Pack a sort key into an opaque, URL-safe cursor."""
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_key(cursor: str) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    if not isinstance(values, list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _from_json(column: Any, value: Any) -> Any:
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    return python_type(value)
+
+
+def paginate(query: OrmQuery, created_at_column: Any, id_column: Any, cursor: Optional[str], limit: int) -> dict:
+    """Return one page of `query`, newest first, as a `Page` envelope.
+
+    Keyset pagination on `(created_at, id)`: the cursor is the last row's key
+    and the next page starts strictly below it, so with an index ending in
+    those two columns every page is a short index range scan, however deep.
+    """
+    return paginate_by(query, (created_at_column, id_column), cursor, limit, descending=True)
+
+
+def paginate_by(query: OrmQuery, columns: Sequence[Any], cursor: Optional[str], limit: int, descending: bool) -> dict:
+    """Return one page of `query` ordered by `columns`, all ascending or all descending.
+
+    The general form of `paginate`. The last column must be unique, usually
+    the primary key, so the key of the last row is an exact place to resume.
+    """
+    if cursor:
+        values = decode_key(cursor)
+        try:
+            if len(values) != len(columns):
+                raise ValueError
+            key = [_from_json(column, value) for column, value in zip(columns, values)]
+        except (ValueError, TypeError, ArithmeticError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        query = query.filter(tuple_(*columns) < tuple_(*key) if descending else tuple_(*columns) > tuple_(*key))
+    order = [column.desc() if descending else column.asc() for column in columns]
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_key([_to_json(getattr(last, column.key)) for column in columns])
+    return {"items": rows, "next_cursor": next_cursor, "limit": limit}
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import heapq
+import threading
+from typing import Optional
+
+from app.utils.inverted_index import tokenize
+
+# A leaf splits into child nodes once it holds more keys than this
+BURST_SIZE = 32
+
+
+def normalize(text: Optional[str]) -> str:
+    return " ".join(tokenize(text))
+
+
+class _Node:
+    __slots__ = ("children", "bucket", "ids", "top")
+
+    def __init__(self) -> None:
+        self.children: Optional[dict[str, _Node]] = None  # None for a leaf
+        self.bucket: list[tuple[str, int]] = []  # leaf only: (key, doc_id) for keys longer than the node's depth
+        self.ids: set[int] = set()  # documents whose key ends exactly here
+        self.top: Optional[list[int]] = None  # inner nodes: best `k` documents below; None when stale
+
+
+class PrefixIndex:
+    """Burst trie over titles answering "top `k` titles starting with this prefix".
+
+    A title is reachable from the start of each of its words, so "leica m6
+    camera" completes "lei", "m6" and "cam". Keys start out in a flat bucket
+    and only branch into per-character nodes once more than `BURST_SIZE`
+    share a prefix, which keeps the node count near the number of distinct
+    busy prefixes rather than the number of characters indexed.
+
+    Inner nodes keep their own top `k` documents by score, so a lookup is a
+    walk of at most `len(prefix)` nodes and then either that cached list or
+    a scan of one small bucket. Scores may only grow between `add` calls,
+    which keeps the cached lists exact on `bump`; `remove` marks the lists
+    it touches stale and they are rebuilt from their subtree on next use.
+    """
+
+    def __init__(self, k: int = 10) -> None:
+        self.k = k
+        self._lock = threading.Lock()
+        self._root = _Node()
+        self._titles: dict[int, str] = {}  # as given, for display
+        self._keys: dict[int, tuple[str, ...]] = {}
+        self._scores: dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def __contains__(self, doc_id: int) -> bool:
+        return doc_id in self._titles
+
+    def add(self, doc_id: int, title: str, score: float = 0.0) -> None:
+        """Index a title, replacing any previous version of it."""
+        words = normalize(title).split(" ")
+        keys = tuple({" ".join(words[i:]) for i in range(len(words)) if words[i]})
+        with self._lock:
+            self._remove(doc_id)
+            self._titles[doc_id] = title
+            self._keys[doc_id] = keys
+            self._scores[doc_id] = score
+            for key in keys:
+                self._insert(key, doc_id)
+
+    def bump(self, doc_id: int, amount: float = 1.0) -> None:
+        """Raise a document's score, e.g. when it receives bids."""
+        with self._lock:
+            if doc_id not in self._scores:
+                return
+            self._scores[doc_id] += amount
+            for key in self._keys[doc_id]:
+                node, depth = self._root, 0
+                while node.children is not None:
+                    self._offer(node, doc_id)
+                    if depth == len(key):
+                        break
+                    node = node.children[key[depth]]
+                    depth += 1
+
+    def remove(self, doc_id: int) -> None:
+        with self._lock:
+            self._remove(doc_id)
+
+    def score(self, doc_id: int) -> float:
+        return self._scores.get(doc_id, 0.0)
+
+    def search(self, prefix: str, limit: Optional[int] = None) -> list[tuple[int, str, float]]:
+        """Return up to `limit` (doc_id, title, score) for titles with a word starting with `prefix`."""
+        limit = min(limit or self.k, self.k)
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        with self._lock:
+            node, depth = self._root, 0
+            while depth < len(prefix) and node.children is not None:
+                node = node.children.get(prefix[depth])
+                if node is None:
+                    return []
+                depth += 1
+
+            if node.children is None:
+                matches = {doc_id for key, doc_id in node.bucket if key.startswith(prefix)}
+                if depth == len(prefix):
+                    matches |= node.ids
+                ids = heapq.nsmallest(limit, matches, key=self._rank)
+            else:
+                if node.top is None:
+                    node.top = heapq.nsmallest(self.k, self._collect(node), key=self._rank)
+                ids = node.top[:limit]
+            return [(doc_id, self._titles[doc_id], self._scores[doc_id]) for doc_id in ids]
+
+    def _rank(self, doc_id: int) -> tuple[float, int]:
+        # Highest score first, newest first among equals
+        return (-self._scores[doc_id], -doc_id)
+
+    def _offer(self, node: _Node, doc_id: int) -> None:
+        top = node.top
+        if top is None:
+            return
+        if doc_id in top:
+            top.sort(key=self._rank)
+        elif len(top) < self.k or self._rank(doc_id) < self._rank(top[-1]):
+            top.append(doc_id)
+            top.sort(key=self._rank)
+            del top[self.k:]
+
+    def _insert(self, key: str, doc_id: int) -> None:
+        node, depth = self._root, 0
+        while node.children is not None:
+            self._offer(node, doc_id)
+            if depth == len(key):
+                node.ids.add(doc_id)
+                return
+            child = node.children.get(key[depth])
+            if child is None:
+                child = node.children[key[depth]] = _Node()
+            node = child
+            depth += 1
+        if depth == len(key):
+            node.ids.add(doc_id)
+            return
+        node.bucket.append((key, doc_id))
+        if len(node.bucket) > BURST_SIZE:
+            self._burst(node, depth)
+
+    def _burst(self, node: _Node, depth: int) -> None:
+        bucket, node.bucket = node.bucket, []
+        node.children = {}
+        for key, doc_id in bucket:
+            child = node.children.get(key[depth])
+            if child is None:
+                child = node.children[key[depth]] = _Node()
+            if len(key) == depth + 1:
+                child.ids.add(doc_id)
+            else:
+                child.bucket.append((key, doc_id))
+        for child in node.children.values():
+            if len(child.bucket) > BURST_SIZE:
+                self._burst(child, depth + 1)
+
+    def _collect(self, node: _Node) -> set[int]:
+        found: set[int] = set()
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            found |= node.ids
+            if node.children is None:
+                found.update(doc_id for _, doc_id in node.bucket)
+            else:
+                stack.extend(node.children.values())
+        return found
+
+    def _remove(self, doc_id: int) -> None:
+        if self._titles.pop(doc_id, None) is None:
+            return
+        for key in self._keys.pop(doc_id):
+            path, node, depth = [], self._root, 0
+            while node.children is not None and depth < len(key):
+                if node.top is not None and doc_id in node.top:
+                    node.top = None
+                path.append(node)
+                node = node.children[key[depth]]
+                depth += 1
+            if node.top is not None and doc_id in node.top:
+                node.top = None
+            if depth == len(key):
+                node.ids.discard(doc_id)
+            else:
+                node.bucket.remove((key, doc_id))
+            # Prune the branch back to the last node still in use
+            while path and not node.ids and not node.bucket and not node.children:
+                parent = path.pop()
+                del parent.children[key[len(path)]]
+                node = parent
+        del self._scores[doc_id]
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Optional, Sequence
+
+
+@dataclass(frozen=True)
+class ProxyBid:
+    bidder_id: int
+    amount: Decimal
+    max_amount: Decimal
+    seq: int
+
+
+@dataclass(frozen=True)
+class ProxyResolution:
+    winner: ProxyBid
+    price: Decimal
+
+
+def resolve_proxy_bids(
+    incumbent: Optional[ProxyBid],
+    challengers: Sequence[ProxyBid],
+    current_price: Decimal,
+    min_increment: Decimal,
+) -> ProxyResolution:
+    """Settle competing ceilings the way a bidding war between proxies would end.
+
+    The highest ceiling wins, earliest `seq` on ties, and pays one increment over
+    the runner-up's ceiling, capped at its own ceiling and never below the amount
+    it entered. A bidder never bids against themselves: only each bidder's
+    strongest entry competes, and a leader who only raised their ceiling keeps
+    the current price. The incumbent's `amount` is the current price.
+    Linear in the number of entries; no bidding rounds are simulated.
+    """
+    strongest: dict[int, ProxyBid] = {}
+    for bid in ([incumbent] if incumbent else []) + list(challengers):
+        held = strongest.get(bid.bidder_id)
+        if held is None or bid.max_amount > held.max_amount:
+            strongest[bid.bidder_id] = bid
+
+    winner: Optional[ProxyBid] = None
+    runner_up: Optional[ProxyBid] = None
+    for bid in strongest.values():
+        if winner is None or _outranks(bid, winner):
+            winner, runner_up = bid, winner
+        elif runner_up is None or _outranks(bid, runner_up):
+            runner_up = bid
+
+    still_leads = incumbent is not None and winner.bidder_id == incumbent.bidder_id
+    price = current_price if still_leads else winner.amount
+    if runner_up is not None:
+        price = max(price, min(winner.max_amount, runner_up.max_amount + min_increment))
+    return ProxyResolution(winner=winner, price=price)
+
+
+def _outranks(bid: ProxyBid, other: ProxyBid) -> bool:
+    return (bid.max_amount, -bid.seq) > (other.max_amount, -other.seq)
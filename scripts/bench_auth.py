@@ -0,0 +1,86 @@
+"""
+Authentication overhead benchmark for BidBay.
+Calls the `get_current_user` dependency with one reused access token, the
+way a client's requests arrive, and reports its per-request cost with the
+token and user caches turned off and on. A disabled cache is emptied
+before every call, so each call pays for the work that cache saves.
+
+Usage:
+    cd BidBay
+    conda run -n bidbay python -m scripts.bench_auth --requests 20000
+"""
+
+import argparse
+import statistics
+import time
+
+from app.api.deps import get_current_user, token_cache
+from app.core.database import SessionLocal
+from app.core.security import create_access_token, get_password_hash
+from app.core.user_cache import user_cache
+from app.models import User, UserRole
+
+MODES = {
+    "none": {"token": False, "user": False},
+    "user": {"token": False, "user": True},
+    "token": {"token": True, "user": False},
+    "token+user": {"token": True, "user": True},
+}
+
+
+def run(mode: str, token: str, requests: int) -> None:
+    caches = MODES[mode]
+    token_cache.clear()
+    user_cache.clear()
+    latencies = []
+    db = SessionLocal()
+    try:
+        for _ in range(requests):
+            if not caches["token"]:
+                token_cache.clear()
+            if not caches["user"]:
+                user_cache.clear()
+            started = time.perf_counter()
+            get_current_user(db, token)
+            latencies.append(time.perf_counter() - started)
+            # A request ends its transaction; don't let the session's identity map serve the next lookup
+            db.rollback()
+    finally:
+        db.close()
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1e6
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1e6
+    print(
+        f"{mode:<11} requests={requests:<6} mean={statistics.fmean(latencies) * 1e6:8.1f}us "
+        f"p50={p50:8.1f}us p99={p99:8.1f}us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--requests", type=int, default=10_000)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    user = User(
+        email=f"bench_auth_{int(time.time() * 1000)}@bidbay.com",
+        password_hash=get_password_hash("password123"),
+        full_name="Bench Auth",
+        role=UserRole.BUYER,
+    )
+    db.add(user)
+    db.commit()
+    token = create_access_token(data={"sub": user.id, "role": user.role.value})
+    try:
+        for mode in args.modes:
+            run(mode, token, args.requests)
+    finally:
+        db.delete(user)
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Bid placement benchmark for BidBay.
+Drives `place_bid` from concurrent bidder threads against the configured
+database and reports throughput and p50/p99 latency per write mode.
+
+Usage:
+    cd BidBay
+    conda run -n bidbay python -m scripts.bench_bids --modes direct sequencer --bidders 32 --products 1
+    conda run -n bidbay python -m scripts.bench_bids --modes direct group --bidders 1 10 100 --products 50
+"""
+
+import argparse
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from fastapi import HTTPException
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.api.bids import place_bid
+from app.core.auction_cache import auction_cache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.security import get_password_hash
+from app.models import Bid, Category, Product, ProductStatus, RefreshToken, User, UserRole
+from app.schemas import BidCreate
+
+
+MODES = {
+    "direct": {"BID_SEQUENCER_ENABLED": False, "BID_GROUP_COMMIT_ENABLED": False},
+    "sequencer": {"BID_SEQUENCER_ENABLED": True, "BID_GROUP_COMMIT_ENABLED": False},
+    "group": {"BID_SEQUENCER_ENABLED": False, "BID_GROUP_COMMIT_ENABLED": True},
+}
+
+
+def create_fixtures(db, bidders: int, products: int) -> dict:
+    """Create a seller, bidders and fresh products for one benchmark run."""
+    suffix = f"{int(time.time() * 1000)}{random.randint(0, 999)}"
+    password_hash = get_password_hash("password123")
+    seller = User(email=f"bench_seller_{suffix}@bidbay.com", password_hash=password_hash,
+                  full_name="Bench Seller", role=UserRole.SELLER)
+    users = [
+        User(email=f"bench_buyer{i}_{suffix}@bidbay.com", password_hash=password_hash,
+             full_name=f"Bench Buyer {i}", role=UserRole.BUYER)
+        for i in range(bidders)
+    ]
+    db.add_all([seller, *users])
+    category = Category(name=f"Bench Category {suffix}")
+    db.add(category)
+    db.commit()
+
+    lots = [
+        Product(
+            seller_id=seller.id,
+            category_id=category.id,
+            title=f"Bench Lot {i} {suffix}",
+            starting_price=Decimal("10.00"),
+            min_increment=Decimal("1.00"),
+            auction_end_at=datetime.utcnow() + timedelta(hours=1),
+            status=ProductStatus.ACTIVE,
+        )
+        for i in range(products)
+    ]
+    db.add_all(lots)
+    db.commit()
+    fixtures = {
+        "user_ids": [seller.id] + [u.id for u in users],
+        "bidder_ids": [u.id for u in users],
+        "emails": {u.id: u.email for u in users},
+        "product_ids": [p.id for p in lots],
+        "category_id": category.id,
+    }
+    db.commit()
+    return fixtures
+
+
+def drop_fixtures(db, fixtures: dict) -> None:
+    product_ids = fixtures["product_ids"]
+    db.query(Product).filter(Product.id.in_(product_ids)).update(
+        {Product.leading_bid_id: None, Product.accepted_bid_id: None}, synchronize_session=False
+    )
+    db.query(Bid).filter(Bid.product_id.in_(product_ids)).delete(synchronize_session=False)
+    db.query(Product).filter(Product.id.in_(product_ids)).delete(synchronize_session=False)
+    db.query(Category).filter(Category.id == fixtures["category_id"]).delete(synchronize_session=False)
+    # Users logged in by bench_login_storm hold refresh tokens
+    db.query(RefreshToken).filter(RefreshToken.user_id.in_(fixtures["user_ids"])).delete(synchronize_session=False)
+    db.query(User).filter(User.id.in_(fixtures["user_ids"])).delete(synchronize_session=False)
+    db.commit()
+    for product_id in product_ids:
+        auction_cache.invalidate(product_id)
+
+
+def bidder(user_id: int, product_ids: list, bids: int, start: threading.Barrier) -> tuple[list, dict]:
+    latencies = []
+    outcomes = {"accepted": 0, "rejected": 0, "conflict": 0, "error": 0}
+    db = SessionLocal()
+    user = db.query(User).filter(User.id == user_id).one()
+    db.expunge(user)
+    db.close()
+    start.wait()
+    for _ in range(bids):
+        product_id = random.choice(product_ids)
+        db = SessionLocal()
+        started = time.perf_counter()
+        try:
+            state = auction_cache.load(db, product_id)
+            amount = state.min_required + state.min_increment * random.randint(0, 3)
+            started = time.perf_counter()
+            place_bid(BidCreate(product_id=product_id, amount=amount), db, user)
+            outcomes["accepted"] += 1
+        except HTTPException as exc:
+            outcomes["conflict" if exc.status_code == 409 else "rejected"] += 1
+        except SQLAlchemyError:
+            # Typically a pool checkout timeout once bidders outnumber connections
+            outcomes["error"] += 1
+        finally:
+            latencies.append(time.perf_counter() - started)
+            db.close()
+    return latencies, outcomes
+
+
+def run(mode: str, bidders: int, products: int, bids: int) -> None:
+    for key, value in MODES[mode].items():
+        setattr(settings, key, value)
+
+    db = SessionLocal()
+    fixtures = create_fixtures(db, bidders, products)
+    try:
+        start = threading.Barrier(bidders + 1, timeout=60)
+        with ThreadPoolExecutor(max_workers=bidders) as pool:
+            futures = [
+                pool.submit(bidder, user_id, fixtures["product_ids"], bids, start)
+                for user_id in fixtures["bidder_ids"]
+            ]
+            start.wait()
+            began = time.perf_counter()
+            results = [f.result() for f in futures]
+            elapsed = time.perf_counter() - began
+    finally:
+        drop_fixtures(db, fixtures)
+        db.close()
+
+    latencies = sorted(l for lat, _ in results for l in lat)
+    totals = {k: sum(o[k] for _, o in results) for k in ("accepted", "rejected", "conflict", "error")}
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(
+        f"{mode:<12} bidders={bidders:<4} products={products:<3} "
+        f"attempts/s={len(latencies) / elapsed:8.1f} accepted/s={totals['accepted'] / elapsed:8.1f} "
+        f"p50={p50:7.2f}ms p99={p99:7.2f}ms "
+        f"accepted={totals['accepted']} rejected={totals['rejected']} conflict={totals['conflict']} "
+        f"error={totals['error']}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=sorted(MODES), default=["direct", "sequencer", "group"])
+    parser.add_argument("--bidders", nargs="+", type=int, default=[1, 10, 100])
+    parser.add_argument("--products", type=int, default=1, help="1 simulates a single hot lot")
+    parser.add_argument("--bids", type=int, default=25, help="bids per bidder")
+    args = parser.parse_args()
+
+    for bidders in args.bidders:
+        for mode in args.modes:
+            run(mode, bidders, args.products, args.bids)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Live event fan-out benchmark for BidBay.
+Starts the API in a uvicorn subprocess, holds thousands of idle SSE
+connections on one product, then places bids over HTTP and reports how long
+each BidPlaced event takes to reach every subscriber, along with the
+server's memory per connection.
+
+Usage:
+    cd BidBay
+    conda run -n bidbay python -m scripts.bench_events --connections 5000 --bids 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from app.core.database import SessionLocal
+from scripts.bench_bids import create_fixtures, drop_fixtures
+
+
+def rss_kb(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+async def subscriber(host: str, port: int, product_id: int, ready: asyncio.Event, received: list) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(
+        f"GET /events/products/{product_id} HTTP/1.1\r\nHost: {host}\r\nAccept: text/event-stream\r\n\r\n".encode()
+    )
+    await writer.drain()
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            if line.startswith(b"event: Snapshot"):
+                ready.set()
+            elif line.startswith(b"event: BidPlaced"):
+                received.append(time.perf_counter())
+    finally:
+        writer.close()
+
+
+async def run(args, fixtures: dict) -> None:
+    base = f"http://{args.host}:{args.port}"
+    product_id = fixtures["product_ids"][0]
+    async with httpx.AsyncClient(base_url=base, timeout=60) as client:
+        tokens = []
+        for user_id in fixtures["bidder_ids"]:
+            email = fixtures["emails"][user_id]
+            res = await client.post("/auth/login", data={"username": email, "password": "password123"})
+            res.raise_for_status()
+            tokens.append(res.json()["access_token"])
+
+        baseline = rss_kb(args.server_pid)
+        readers = []
+        streams = []
+        started = time.perf_counter()
+        for start in range(0, args.connections, 500):
+            batch = []
+            for _ in range(start, min(start + 500, args.connections)):
+                ready, received = asyncio.Event(), []
+                streams.append(received)
+                readers.append(asyncio.create_task(subscriber(args.host, args.port, product_id, ready, received)))
+                batch.append(ready.wait())
+            await asyncio.gather(*batch)
+        connected = time.perf_counter() - started
+        await asyncio.sleep(1)
+        per_connection = (rss_kb(args.server_pid) - baseline) / args.connections
+        print(
+            f"connections={args.connections} connect_time={connected:.2f}s "
+            f"server_rss_per_connection={per_connection:.1f}KB"
+        )
+
+        last_arrivals = []
+        median_arrivals = []
+        amount = 10
+        for i in range(args.bids):
+            sent = time.perf_counter()
+            res = await client.post(
+                "/bids/",
+                json={"product_id": product_id, "amount": str(amount)},
+                headers={"Authorization": f"Bearer {tokens[i % len(tokens)]}"},
+            )
+            res.raise_for_status()
+            amount += 1
+            while min(len(r) for r in streams) <= i:
+                await asyncio.sleep(0.001)
+            arrivals = sorted(r[i] - sent for r in streams)
+            last_arrivals.append(arrivals[-1] * 1000)
+            median_arrivals.append(statistics.median(arrivals) * 1000)
+
+        print(
+            f"bids={args.bids} fan-out to {args.connections}: "
+            f"median subscriber p50={statistics.median(median_arrivals):.1f}ms "
+            f"last subscriber p50={statistics.median(last_arrivals):.1f}ms max={max(last_arrivals):.1f}ms"
+        )
+        for task in readers:
+            task.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=5000)
+    parser.add_argument("--bids", type=int, default=20)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    fixtures = create_fixtures(db, bidders=2, products=1)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", args.host, "--port", str(args.port),
+         "--log-level", "warning"],
+        env={**os.environ, "AUCTION_CLOSER_ENABLED": "false"},
+    )
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"http://{args.host}:{args.port}/health").raise_for_status()
+                break
+            except httpx.HTTPError:
+                time.sleep(0.1)
+        args.server_pid = server.pid
+        asyncio.run(run(args, fixtures))
+    finally:
+        server.terminate()
+        server.wait()
+        drop_fixtures(db, fixtures)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Login storm benchmark for BidBay.
+Starts the API under uvicorn, hammers POST /auth/login from many clients,
+and meanwhile measures GET /products/{id} and POST /bids/ latency from a
+few well-behaved clients. Compares hashing on the request threads
+(PASSWORD_HASH_WORKERS=0, the old behaviour) with the bounded hasher.
+
+Usage:
+    cd BidBay
+    conda run -n bidbay python -m scripts.bench_login_storm --stormers 64 --seconds 10
+    conda run -n bidbay python -m scripts.bench_login_storm --modes bounded --workers 4 --queue 16
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from decimal import Decimal
+
+import httpx
+
+from app.core.database import SessionLocal
+from app.core.security import create_access_token
+from scripts.bench_bids import create_fixtures, drop_fixtures
+
+
+def start_server(port: int, env: dict) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env={**os.environ, **env},
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                return server
+        except httpx.TransportError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("uvicorn did not start")
+
+
+def stormer(base: str, email: str, stop: threading.Event, outcomes: Counter) -> None:
+    with httpx.Client(base_url=base, timeout=60) as client:
+        while not stop.is_set():
+            try:
+                status = client.post("/auth/login", data={"username": email, "password": "password123"}).status_code
+            except httpx.TransportError:
+                status = "error"
+            outcomes[status] += 1
+
+
+def prober(base: str, token: str, product_id: int, stop: threading.Event, latencies: dict) -> None:
+    headers = {"Authorization": f"Bearer {token}"}
+    with httpx.Client(base_url=base, timeout=60) as client:
+        while not stop.is_set():
+            started = time.perf_counter()
+            product = client.get(f"/products/{product_id}").json()
+            latencies["product"].append(time.perf_counter() - started)
+
+            amount = Decimal(product["current_price"]) + Decimal(product["min_increment"])
+            started = time.perf_counter()
+            client.post("/bids/", json={"product_id": product_id, "amount": str(amount)}, headers=headers)
+            latencies["bid"].append(time.perf_counter() - started)
+            time.sleep(0.05)
+
+
+def measure(base: str, fixtures: dict, probers: int, stormers: int, seconds: float) -> tuple[dict, Counter]:
+    stop = threading.Event()
+    latencies = {"product": [], "bid": []}
+    outcomes: Counter = Counter()
+    email = fixtures["emails"][fixtures["bidder_ids"][0]]
+    threads = [
+        threading.Thread(target=stormer, args=(base, email, stop, outcomes)) for _ in range(stormers)
+    ] + [
+        threading.Thread(
+            target=prober,
+            args=(base, create_access_token({"sub": bidder_id}), fixtures["product_ids"][i % len(fixtures["product_ids"])],
+                  stop, latencies),
+        )
+        for i, bidder_id in enumerate(fixtures["bidder_ids"][1:probers + 1])
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return latencies, outcomes
+
+
+def report(mode: str, phase: str, latencies: dict, outcomes: Counter, seconds: float) -> None:
+    parts = []
+    for name, values in latencies.items():
+        values = sorted(values)
+        p50 = statistics.median(values) * 1000
+        p99 = values[min(len(values) - 1, int(len(values) * 0.99))] * 1000
+        parts.append(f"{name} p50={p50:7.1f}ms p99={p99:7.1f}ms")
+    logins = " ".join(f"{status}={count}" for status, count in sorted(outcomes.items(), key=str))
+    print(f"{mode:<8} {phase:<6} {'  '.join(parts)}  logins/s={sum(outcomes.values()) / seconds:6.1f} {logins}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=["inline", "bounded"], default=["inline", "bounded"])
+    parser.add_argument("--stormers", type=int, default=64, help="concurrent login clients")
+    parser.add_argument("--probers", type=int, default=4, help="concurrent product/bid clients")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=2, help="PASSWORD_HASH_WORKERS in bounded mode")
+    parser.add_argument("--queue", type=int, default=8, help="PASSWORD_HASH_QUEUE in bounded mode")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    fixtures = create_fixtures(db, bidders=args.probers + 1, products=args.probers)
+    base = f"http://127.0.0.1:{args.port}"
+    try:
+        for mode in args.modes:
+            env = {
+                "PASSWORD_HASH_WORKERS": "0" if mode == "inline" else str(args.workers),
+                "PASSWORD_HASH_QUEUE": str(args.queue),
+                "AUCTION_CLOSER_ENABLED": "false",
+            }
+            server = start_server(args.port, env)
+            try:
+                for phase, stormers in (("idle", 0), ("storm", args.stormers)):
+                    latencies, outcomes = measure(base, fixtures, args.probers, stormers, args.seconds)
+                    report(mode, phase, latencies, outcomes, args.seconds)
+            finally:
+                server.terminate()
+                server.wait()
+    finally:
+        drop_fixtures(db, fixtures)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
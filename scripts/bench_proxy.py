@@ -0,0 +1,57 @@
+"""
+Proxy bid resolution benchmark for BidBay.
+Times `resolve_proxy_bids` with many competing ceilings and reports how many
+client-side increment re-bids a single resolution replaces. No database needed.
+
+Usage:
+    cd BidBay
+    conda run -n bidbay python -m scripts.bench_proxy --proxies 10 1000 100000
+"""
+
+import argparse
+import random
+import time
+from decimal import Decimal
+
+from app.utils.proxy_bidding import ProxyBid, resolve_proxy_bids
+
+
+START_PRICE = Decimal("100.00")
+MIN_INCREMENT = Decimal("1.00")
+
+
+def make_proxies(count: int) -> list[ProxyBid]:
+    return [
+        ProxyBid(
+            bidder_id=i + 1,
+            amount=START_PRICE + MIN_INCREMENT,
+            max_amount=START_PRICE + Decimal(random.randint(1, 100_000)) / 100,
+            seq=i,
+        )
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--proxies", nargs="+", type=int, default=[10, 100, 1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    incumbent = ProxyBid(bidder_id=0, amount=START_PRICE, max_amount=START_PRICE, seq=-1)
+    for count in args.proxies:
+        proxies = make_proxies(count)
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            resolution = resolve_proxy_bids(incumbent, proxies, START_PRICE, MIN_INCREMENT)
+        per_call = (time.perf_counter() - started) / args.repeat
+        rebids = int((resolution.price - START_PRICE) / MIN_INCREMENT)
+        print(
+            f"proxies={count:<8} resolve={per_call * 1e3:9.3f}ms "
+            f"per_proxy={per_call / count * 1e6:6.2f}us price={resolution.price} "
+            f"replaced_rebids~{rebids}"
+        )
+
+
+if __name__ == "__main__":
+    main()
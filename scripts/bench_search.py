@@ -0,0 +1,97 @@
+"""
+Product search benchmark for BidBay.
+Indexes a synthetic catalogue in the in-process inverted index used when
+SEARCH_BACKEND=memory and compares query latency with a linear
+substring scan, which is what `title ILIKE '%q%'` costs the database.
+
+Usage:
+    cd BidBay
+    conda run -n bidbay python -m scripts.bench_search --products 1000000 --queries 200
+"""
+
+import argparse
+import itertools
+import random
+import statistics
+import time
+import tracemalloc
+
+from app.utils.inverted_index import InvertedIndex
+
+STATUSES = ["ACTIVE", "CLOSED", "SOLD", "EXPIRED"]
+
+
+def make_vocabulary(size: int, rng: random.Random) -> list[str]:
+    syllables = ["ka", "lo", "mi", "ra", "te", "vo", "su", "ne", "di", "po", "ba", "ge", "fu", "zi", "ho", "ja"]
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def zipf_weights(size: int) -> list[float]:
+    """Cumulative Zipf-like word frequencies, as in real product titles."""
+    return list(itertools.accumulate(1 / (rank + 1) for rank in range(size)))
+
+
+def make_catalogue(products: int, vocabulary: list[str], rng: random.Random):
+    weights = zipf_weights(len(vocabulary))
+    for product_id in range(1, products + 1):
+        title = " ".join(rng.choices(vocabulary, cum_weights=weights, k=rng.randint(3, 7)))
+        description = " ".join(rng.choices(vocabulary, cum_weights=weights, k=rng.randint(6, 14)))
+        yield product_id, title, description, rng.choice(STATUSES), rng.randint(1, 50), rng.randint(1, 5000)
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(args.vocabulary, rng)
+    catalogue = list(make_catalogue(args.products, vocabulary, rng))
+
+    index = InvertedIndex()
+    tracemalloc.start()
+    started = time.perf_counter()
+    for product_id, title, description, status, category_id, seller_id in catalogue:
+        index.add(product_id, title, description, status, category_id, seller_id)
+    build_seconds = time.perf_counter() - started
+    index_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"products={args.products} build={build_seconds:.1f}s index_memory={index_bytes / 2**20:.0f}MiB")
+
+    # Queries of one to three words drawn from the same distribution as titles
+    weights = zipf_weights(len(vocabulary))
+    queries = [" ".join(rng.choices(vocabulary, cum_weights=weights, k=rng.randint(1, 3))) for _ in range(args.queries)]
+
+    cases = {
+        "index": lambda q: index.search(q, args.limit),
+        "index+status": lambda q: index.search(q, args.limit, status="ACTIVE"),
+        "index+seller": lambda q: index.search(q, args.limit, seller_id=42),
+        "substring scan": lambda q: [p for p in catalogue if q in p[1]][:args.limit],
+    }
+    for name, run in cases.items():
+        sample = queries if name != "substring scan" else queries[:20]
+        latencies = []
+        for q in sample:
+            started = time.perf_counter()
+            run(q)
+            latencies.append((time.perf_counter() - started) * 1000)
+        print(
+            f"{name:<15} queries={len(sample):<4} p50={statistics.median(latencies):8.2f}ms "
+            f"p99={percentile(latencies, 0.99):8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
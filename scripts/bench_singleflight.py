@@ -0,0 +1,113 @@
+"""
+Single-flight benchmark for BidBay.
+Releases N concurrent readers of the same hot product at once, each with its
+own session, and counts the SQL statements the database receives with
+request coalescing on and off. With it on, the count should stay flat as
+readers are added.
+
+Usage:
+    cd BidBay
+    conda run -n bidbay python -m scripts.bench_singleflight --readers 1 10 50 100 200
+    conda run -n bidbay python -m scripts.bench_singleflight --endpoints detail --latency-ms 5
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import Request, Response
+from sqlalchemy import event
+
+from app.api.analytics import trending_products
+from app.api.products import get_product, get_product_detail, product_detail_cache
+from app.core.database import SessionLocal, engine
+from app.core.singleflight import single_flight
+from scripts.bench_bids import create_fixtures, drop_fixtures
+
+
+def plain_request() -> Request:
+    return Request({"type": "http", "method": "GET", "headers": []})
+
+
+ENDPOINTS = {
+    "product": lambda db, product_id: get_product(product_id, plain_request(), Response(), db),
+    "detail": lambda db, product_id: get_product_detail(product_id, db, None),
+    "trending": lambda db, product_id: trending_products(db, min_favorites=1),
+}
+
+
+class StatementCounter:
+    """Counts statements sent to the engine, optionally sleeping to mimic a network round trip."""
+
+    def __init__(self, latency_ms: float) -> None:
+        self.latency = latency_ms / 1000
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        with self._lock:
+            self.count += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+
+def reader(endpoint: str, product_id: int, start: threading.Barrier) -> float:
+    db = SessionLocal()
+    try:
+        start.wait()
+        started = time.perf_counter()
+        ENDPOINTS[endpoint](db, product_id)
+        return time.perf_counter() - started
+    finally:
+        db.close()
+
+
+def run(endpoint: str, readers: int, product_id: int, enabled: bool, counter: StatementCounter) -> None:
+    single_flight.enabled = enabled
+    # Every reader should miss, as they all would right after the product changes
+    product_detail_cache.clear()
+    counter.count = 0
+
+    start = threading.Barrier(readers, timeout=60)
+    with ThreadPoolExecutor(max_workers=readers) as pool:
+        began = time.perf_counter()
+        latencies = sorted(pool.map(lambda _: reader(endpoint, product_id, start), range(readers)))
+        elapsed = time.perf_counter() - began
+
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(
+        f"{endpoint:<9} single_flight={'on' if enabled else 'off':<3} readers={readers:<4} "
+        f"statements={counter.count:<5} per_reader={counter.count / readers:5.2f} "
+        f"p50={p50:7.2f}ms p99={p99:7.2f}ms wall={elapsed * 1000:7.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", nargs="+", choices=sorted(ENDPOINTS), default=["product", "detail"])
+    parser.add_argument("--readers", nargs="+", type=int, default=[1, 10, 50, 100, 200])
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="simulated round trip per statement")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    fixtures = create_fixtures(db, bidders=0, products=1)
+    counter = StatementCounter(args.latency_ms)
+    event.listen(engine, "before_cursor_execute", counter)
+    enabled = single_flight.enabled
+    try:
+        for endpoint in args.endpoints:
+            for readers in args.readers:
+                for on in (False, True):
+                    run(endpoint, readers, fixtures["product_ids"][0], on, counter)
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+        single_flight.enabled = enabled
+        drop_fixtures(db, fixtures)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
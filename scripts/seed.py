@@ -142,8 +142,8 @@ def clear_database(db):
     db.query(Payment).delete()
     db.query(Order).delete()
     db.query(Favorite).delete()
-    # Clear accepted_bid_id FK before deleting bids (circular dependency)
-    db.query(Product).update({Product.accepted_bid_id: None})
+    # Clear bid FKs on products before deleting bids (circular dependency)
+    db.query(Product).update({Product.accepted_bid_id: None, Product.leading_bid_id: None})
     db.query(Bid).delete()
     db.query(ProductImage).delete()
     db.query(Product).delete()
@@ -312,6 +312,9 @@ def seed_bids(db, users: dict, products: list) -> list:
             db.add(bid)
             bids.append(bid)
             current_price = bid_amount
+            product.current_price = bid_amount
+            product.bid_count += 1
+            product.leading_bid = bid
 
     db.commit()
     print(f"  Created {len(bids)} bids.")
@@ -368,6 +371,9 @@ def seed_completed_auctions(db, users: dict, products: list):
         # Update product
         product.status = ProductStatus.SOLD
         product.accepted_bid_id = winning_bid.id
+        product.leading_bid_id = winning_bid.id
+        product.current_price = winning_amount
+        product.bid_count += 1
 
         # Create order
         order = Order(
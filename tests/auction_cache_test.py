@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+import sys
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi import HTTPException
+
+import app.api.bids as bids_api
+from app.core.auction_cache import AuctionStateCache
+from app.core.database import SessionLocal
+from app.core.security import get_password_hash
+from app.models import Bid, Category, Product, ProductStatus, User, UserRole
+from app.schemas import BidCreate
+
+
+def print_step(message: str) -> None:
+    print(f"[STEP] {message}")
+
+
+@contextmanager
+def worker(cache: AuctionStateCache):
+    """Place bids as a process whose auction cache is `cache`."""
+    previous, bids_api.auction_cache = bids_api.auction_cache, cache
+    try:
+        yield
+    finally:
+        bids_api.auction_cache = previous
+
+
+def bid(db, user: User, product_id: int, amount: str, max_amount: str | None = None):
+    bid_in = BidCreate(
+        product_id=product_id,
+        amount=Decimal(amount),
+        max_amount=Decimal(max_amount) if max_amount else None,
+    )
+    try:
+        return bids_api.place_bid(bid_in, db, user)
+    except HTTPException as exc:
+        db.rollback()
+        return exc
+
+
+def main() -> None:
+    db = SessionLocal()
+    created = {"product_ids": [], "category_id": None, "user_ids": []}
+    suffix = int(datetime.utcnow().timestamp())
+    try:
+        print_step("Create seller, two buyers and products")
+        password_hash = get_password_hash("password123")
+        seller = User(email=f"cache_seller_{suffix}@bidbay.com", password_hash=password_hash,
+                      full_name="Cache Seller", role=UserRole.SELLER)
+        buyer1 = User(email=f"cache_buyer1_{suffix}@bidbay.com", password_hash=password_hash,
+                      full_name="Cache Buyer 1", role=UserRole.BUYER)
+        buyer2 = User(email=f"cache_buyer2_{suffix}@bidbay.com", password_hash=password_hash,
+                      full_name="Cache Buyer 2", role=UserRole.BUYER)
+        db.add_all([seller, buyer1, buyer2])
+        category = Category(name=f"Cache Category {suffix}")
+        db.add(category)
+        db.commit()
+        created["user_ids"] = [seller.id, buyer1.id, buyer2.id]
+        created["category_id"] = category.id
+        products = [
+            Product(
+                seller_id=seller.id,
+                category_id=category.id,
+                title=f"Cache Test Product {i} {suffix}",
+                starting_price=Decimal("10.00"),
+                min_increment=Decimal("1.00"),
+                auction_end_at=datetime.utcnow() + end_in,
+                status=ProductStatus.ACTIVE,
+                soft_close_window_seconds=window,
+                soft_close_extension_seconds=window,
+            )
+            for i, (end_in, window) in enumerate(
+                [(timedelta(hours=1), 0), (timedelta(seconds=2), 0), (timedelta(hours=1), 0), (timedelta(hours=1), 10)]
+            )
+        ]
+        db.add_all(products)
+        db.commit()
+        created["product_ids"] = [p.id for p in products]
+        product_id, short_id, other_id, soft_id = created["product_ids"]
+
+        worker_a, worker_b = AuctionStateCache(sweep_seconds=0), AuctionStateCache(sweep_seconds=0)
+
+        print_step("A stale leader in one worker's cache does not decide a rejection")
+        with worker(worker_a):
+            assert isinstance(bid(db, buyer2, product_id, "10", "50"), Bid)
+        with worker(worker_b):
+            assert isinstance(bid(db, buyer1, product_id, "60"), Bid)
+        # Worker A still believes buyer2 leads at 10 with a 50 ceiling; buyer1 really leads at 60
+        assert worker_a.get(product_id).leading_bidder_id == buyer2.id
+        with worker(worker_a):
+            result = bid(db, buyer2, product_id, "11", "50")
+        print(f"[INFO] stale worker answered: {result.detail}")
+        assert result.status_code == 400 and result.detail == "Bid must be at least 61.00", result.detail
+        assert worker_a.get(product_id).leading_bidder_id == buyer1.id
+
+        print_step("Entries for ended auctions are misses and get purged")
+        with worker(worker_a):
+            assert isinstance(bid(db, buyer1, short_id, "10"), Bid)
+        assert worker_a.get(short_id) is not None
+        time.sleep(2.5)
+        assert worker_a.get(short_id) is None
+        worker_a.load(db, other_id)
+        db.rollback()
+        assert len(worker_a) == 2, len(worker_a)
+        with worker(worker_a):
+            result = bid(db, buyer2, short_id, "20")
+        assert result.status_code == 400 and result.detail == "Auction is not active", result.detail
+
+        print_step("A late bid extended through one worker is accepted by another after the original end")
+        worker_a, worker_b = AuctionStateCache(sweep_seconds=0), AuctionStateCache(sweep_seconds=0)
+        db.query(Product).filter(Product.id == soft_id).update(
+            {Product.auction_end_at: datetime.utcnow() + timedelta(seconds=3)}
+        )
+        db.commit()
+        original_end = worker_b.load(db, soft_id).auction_end_at
+        db.rollback()
+        with worker(worker_a):
+            assert isinstance(bid(db, buyer1, soft_id, "10"), Bid)
+        assert worker_a.get(soft_id).auction_end_at > original_end
+        # Worker B still holds the original end time
+        assert worker_b.get(soft_id).auction_end_at == original_end
+        time.sleep(max(0.0, (original_end - datetime.utcnow()).total_seconds()) + 0.5)
+        with worker(worker_b):
+            result = bid(db, buyer2, soft_id, "11")
+        assert isinstance(result, Bid), result.detail
+        assert worker_b.get(soft_id).leading_bidder_id == buyer2.id
+
+        print_step("Auction cache test completed successfully")
+    finally:
+        print_step("Cleaning up auction cache test data")
+        db.rollback()
+        if created["product_ids"]:
+            db.query(Product).filter(Product.id.in_(created["product_ids"])).update(
+                {Product.leading_bid_id: None}, synchronize_session=False
+            )
+            db.query(Bid).filter(Bid.product_id.in_(created["product_ids"])).delete(synchronize_session=False)
+            db.query(Product).filter(Product.id.in_(created["product_ids"])).delete(synchronize_session=False)
+        if created["category_id"]:
+            db.query(Category).filter(Category.id == created["category_id"]).delete()
+        if created["user_ids"]:
+            db.query(User).filter(User.id.in_(created["user_ids"])).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
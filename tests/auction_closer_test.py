@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+import sys
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.api.bids import place_bid
+from app.core.auction_closer import AuctionCloser
+from app.core.database import SessionLocal
+from app.core.security import get_password_hash
+from app.models import Bid, BidStatus, Category, Order, OrderStatus, Product, ProductStatus, User, UserRole
+from app.schemas import BidCreate
+
+
+def print_step(message: str) -> None:
+    print(f"[STEP] {message}")
+
+
+class RecordingCloser(AuctionCloser):
+    """Remembers every chunk it was asked to close, in order."""
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.chunks: list[list[int]] = []
+
+    def _close_chunk(self, product_ids: list[int]) -> int:
+        self.chunks.append(list(product_ids))
+        return super()._close_chunk(product_ids)
+
+
+def wait_for(condition, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.1)
+
+
+def set_end(product_id: int, auction_end_at: datetime) -> None:
+    """Move an auction's end from its own session, the way another worker would."""
+    other = SessionLocal()
+    try:
+        other.query(Product).filter(Product.id == product_id).update({Product.auction_end_at: auction_end_at})
+        other.commit()
+    finally:
+        other.close()
+
+
+def main() -> None:
+    db = SessionLocal()
+    created = {"product_ids": [], "category_id": None, "user_ids": []}
+    suffix = int(datetime.utcnow().timestamp())
+    closer = RecordingCloser(sweep_seconds=3600)
+    try:
+        print_step("A closer that is not running keeps no schedule")
+        closer.schedule(1, datetime.utcnow())
+        assert closer._scheduled == {} and closer._heap == []
+
+        print_step("Create seller, buyer and three auctions")
+        password_hash = get_password_hash("password123")
+        seller = User(email=f"closer_seller_{suffix}@bidbay.com", password_hash=password_hash,
+                      full_name="Closer Seller", role=UserRole.SELLER)
+        buyer = User(email=f"closer_buyer_{suffix}@bidbay.com", password_hash=password_hash,
+                     full_name="Closer Buyer", role=UserRole.BUYER)
+        db.add_all([seller, buyer])
+        category = Category(name=f"Closer Category {suffix}")
+        db.add(category)
+        db.commit()
+        created["user_ids"] = [seller.id, buyer.id]
+        created["category_id"] = category.id
+        products = [
+            Product(
+                seller_id=seller.id,
+                category_id=category.id,
+                title=f"Closer Test Product {i} {suffix}",
+                starting_price=Decimal("10.00"),
+                min_increment=Decimal("1.00"),
+                auction_end_at=datetime.utcnow() + timedelta(hours=1),
+                status=ProductStatus.ACTIVE,
+            )
+            for i in range(3)
+        ]
+        db.add_all(products)
+        db.commit()
+        created["product_ids"] = [p.id for p in products]
+        unsold_id, sold_id, extended_id = created["product_ids"]
+        bid = place_bid(BidCreate(product_id=sold_id, amount=Decimal("25.00")), db, buyer)
+        bid_id = bid.id
+
+        # Created last but due first, so the heap and not insertion order decides
+        now = datetime.utcnow()
+        set_end(extended_id, now + timedelta(seconds=2))
+        set_end(sold_id, now + timedelta(seconds=2.5))
+        set_end(unsold_id, now + timedelta(seconds=3))
+
+        print_step("Starting loads every active auction into the schedule")
+        closer.start()
+        wait_for(lambda: all(product_id in closer._scheduled for product_id in created["product_ids"]))
+
+        print_step("An auction extended elsewhere is rescheduled instead of closed")
+        set_end(extended_id, datetime.utcnow() + timedelta(seconds=5))
+
+        def all_closed() -> bool:
+            db.rollback()
+            return db.query(Product).filter(
+                Product.id.in_(created["product_ids"]), Product.status == ProductStatus.ACTIVE
+            ).count() == 0
+
+        wait_for(all_closed)
+        ours = [
+            product_id
+            for chunk in closer.chunks
+            for product_id in chunk
+            if product_id in created["product_ids"]
+        ]
+        print(f"[INFO] close attempts: {ours}")
+        assert ours == [extended_id, sold_id, unsold_id, extended_id], ours
+
+        print_step("Auction with a leader closes with an order; one without expires")
+        statuses = {p.id: p.status for p in db.query(Product).filter(Product.id.in_(created["product_ids"]))}
+        assert statuses == {
+            unsold_id: ProductStatus.EXPIRED,
+            sold_id: ProductStatus.CLOSED,
+            extended_id: ProductStatus.EXPIRED,
+        }, statuses
+        order = db.query(Order).filter(Order.product_id == sold_id).one()
+        assert order.bid_id == bid_id and order.buyer_id == buyer.id and order.total_amount == Decimal("25.00")
+        assert order.status == OrderStatus.AWAITING_PAYMENT
+        assert db.get(Bid, bid_id).status == BidStatus.ACCEPTED
+        assert db.get(Product, sold_id).accepted_bid_id == bid_id
+        assert db.query(Order).filter(Order.product_id.in_([unsold_id, extended_id])).count() == 0
+
+        print_step("Stopping drops the schedule")
+        closer.stop()
+        assert closer._scheduled == {} and closer._heap == []
+
+        print_step("Auction closer test completed successfully")
+    finally:
+        print_step("Cleaning up auction closer test data")
+        closer.stop()
+        db.rollback()
+        if created["product_ids"]:
+            db.query(Order).filter(Order.product_id.in_(created["product_ids"])).delete(synchronize_session=False)
+            db.query(Product).filter(Product.id.in_(created["product_ids"])).update(
+                {Product.leading_bid_id: None, Product.accepted_bid_id: None}, synchronize_session=False
+            )
+            db.query(Bid).filter(Bid.product_id.in_(created["product_ids"])).delete(synchronize_session=False)
+            db.query(Product).filter(Product.id.in_(created["product_ids"])).delete(synchronize_session=False)
+        if created["category_id"]:
+            db.query(Category).filter(Category.id == created["category_id"]).delete()
+        if created["user_ids"]:
+            db.query(User).filter(User.id.in_(created["user_ids"])).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
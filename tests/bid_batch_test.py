@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sqlalchemy.exc import OperationalError
+
+import app.api.bids as bids_api
+from app.core.auction_cache import auction_cache
+from app.core.database import SessionLocal
+from app.core.security import get_password_hash
+from app.models import Bid, BidStatus, Category, Product, ProductStatus, User, UserRole
+from app.schemas import BidCreate
+
+
+def print_step(message: str) -> None:
+    print(f"[STEP] {message}")
+
+
+@contextmanager
+def staging(replacement):
+    """Stage bids through `replacement(stage, db, state, entries)` instead of `_stage_bids`."""
+    original = bids_api._stage_bids
+    bids_api._stage_bids = lambda db, state, entries: replacement(original, db, state, entries)
+    try:
+        yield
+    finally:
+        bids_api._stage_bids = original
+
+
+def main() -> None:
+    db = SessionLocal()
+    created = {"product_ids": [], "category_id": None, "user_ids": []}
+    suffix = int(datetime.utcnow().timestamp())
+    try:
+        print_step("Create seller, buyers and products")
+        password_hash = get_password_hash("password123")
+        seller = User(email=f"batch_seller_{suffix}@bidbay.com", password_hash=password_hash,
+                      full_name="Batch Seller", role=UserRole.SELLER)
+        buyers = [
+            User(email=f"batch_buyer{i}_{suffix}@bidbay.com", password_hash=password_hash,
+                 full_name=f"Batch Buyer {i}", role=UserRole.BUYER)
+            for i in range(3)
+        ]
+        db.add_all([seller, *buyers])
+        category = Category(name=f"Batch Category {suffix}")
+        db.add(category)
+        db.commit()
+        created["user_ids"] = [seller.id] + [b.id for b in buyers]
+        created["category_id"] = category.id
+        products = [
+            Product(
+                seller_id=seller.id,
+                category_id=category.id,
+                title=f"Batch Test Product {i} {suffix}",
+                starting_price=Decimal("10.00"),
+                min_increment=Decimal("1.00"),
+                auction_end_at=datetime.utcnow() + timedelta(hours=1),
+                status=ProductStatus.ACTIVE,
+            )
+            for i in range(3)
+        ]
+        db.add_all(products)
+        db.commit()
+        created["product_ids"] = sorted(p.id for p in products)
+        p1, p2, p3 = created["product_ids"]
+        b1, b2, b3 = (b.id for b in buyers)
+
+        print_step("A database error while staging rolls back the group and places each product on its own")
+        attempts: list[int] = []
+
+        def deadlock_once(stage, db_, state, entries):
+            attempts.append(state.product_id)
+            if len(attempts) == 2:
+                raise OperationalError("UPDATE products", {}, Exception("1213 Deadlock found"))
+            return stage(db_, state, entries)
+
+        # Arrival order is reversed and one product does not exist
+        items = [
+            (b1, BidCreate(product_id=p3, amount=Decimal("11.00"))),
+            (b2, BidCreate(product_id=p1, amount=Decimal("12.00"))),
+            (b3, BidCreate(product_id=p2, amount=Decimal("13.00"))),
+            (b1, BidCreate(product_id=999_999_999, amount=Decimal("13.00"))),
+        ]
+        with staging(deadlock_once):
+            results = bids_api._place_bids_many(db, items)
+        print(f"[INFO] staging attempts: {attempts}")
+        # Staged in id order; the group fails on its second product and every product is retried alone
+        assert attempts == [p1, p2, p1, p2, p3], attempts
+        assert all(isinstance(r, Bid) for r in results[:3]), results
+        assert results[3].status_code == 404
+        for product_id, price in [(p1, "12.00"), (p2, "13.00"), (p3, "11.00")]:
+            db.expire_all()
+            product = db.get(Product, product_id)
+            assert product.current_price == Decimal(price) and product.bid_count == 1, (product_id, product.current_price)
+            state = auction_cache.load(db, product_id)
+            assert state.leading_bid_id == product.leading_bid_id and state.current_price == Decimal(price)
+        db.rollback()
+
+        print_step("Each bid in a batch gets its own result, in request order")
+        batch = bids_api.place_bids_batch(
+            [
+                BidCreate(product_id=p2, amount=Decimal("14.00")),
+                BidCreate(product_id=999_999_999, amount=Decimal("14.00")),
+                BidCreate(product_id=p2, amount=Decimal("20.00")),
+                BidCreate(product_id=p1, amount=Decimal("12.00")),
+            ],
+            db,
+            buyers[0],
+        )
+        print(f"[INFO] {[(r.status_code, r.detail) for r in batch]}")
+        assert [r.status_code for r in batch] == [201, 404, 201, 400], batch
+        # Both bids on p2 settle together: the higher one leads, the lower one is stored as outbid
+        assert batch[0].bid.status == BidStatus.OUTBID and batch[0].bid.amount == Decimal("14.00")
+        assert batch[2].bid.status == BidStatus.PENDING and batch[2].bid.amount == Decimal("20.00")
+        assert batch[3].detail == "Bid must be at least 13.00"
+        db.expire_all()
+        assert db.get(Product, p2).leading_bid_id == batch[2].bid.id
+        db.rollback()
+
+        print_step("An unexpected failure on one product is a 500 in its slot; the others stay committed")
+
+        def fail_p2(stage, db_, state, entries):
+            if state.product_id == p2:
+                raise RuntimeError("boom")
+            return stage(db_, state, entries)
+
+        with staging(fail_p2):
+            batch = bids_api.place_bids_batch(
+                [BidCreate(product_id=p1, amount=Decimal("30.00")), BidCreate(product_id=p2, amount=Decimal("30.00"))],
+                db,
+                buyers[2],
+            )
+        assert [r.status_code for r in batch] == [201, 500], batch
+        assert batch[1].detail == "Internal server error"
+        db.expire_all()
+        assert db.get(Product, p1).current_price == Decimal("30.00")
+        assert db.get(Product, p2).current_price == Decimal("20.00")
+        db.rollback()
+
+        print_step("A product retried after a lost race fails alone as well")
+        raced: list[int] = []
+
+        def race_then_fail(stage, db_, state, entries):
+            if state.product_id != p2:
+                return stage(db_, state, entries)
+            raced.append(state.product_id)
+            if len(raced) == 1:
+                return bids_api._Settlement(state=state, results=[None] * len(entries), lost_race=True)
+            raise RuntimeError("boom")
+
+        with staging(race_then_fail):
+            batch = bids_api.place_bids_batch(
+                [BidCreate(product_id=p3, amount=Decimal("31.00")), BidCreate(product_id=p2, amount=Decimal("31.00"))],
+                db,
+                buyers[2],
+            )
+        assert [r.status_code for r in batch] == [201, 500] and len(raced) == 2, (batch, raced)
+        db.expire_all()
+        assert db.get(Product, p3).current_price == Decimal("31.00")
+        db.rollback()
+
+        print_step("Bid batch test completed successfully")
+    finally:
+        print_step("Cleaning up bid batch test data")
+        db.rollback()
+        if created["product_ids"]:
+            db.query(Product).filter(Product.id.in_(created["product_ids"])).update(
+                {Product.leading_bid_id: None}, synchronize_session=False
+            )
+            db.query(Bid).filter(Bid.product_id.in_(created["product_ids"])).delete(synchronize_session=False)
+            db.query(Product).filter(Product.id.in_(created["product_ids"])).delete(synchronize_session=False)
+            for product_id in created["product_ids"]:
+                auction_cache.invalidate(product_id)
+        if created["category_id"]:
+            db.query(Category).filter(Category.id == created["category_id"]).delete()
+        if created["user_ids"]:
+            db.query(User).filter(User.id.in_(created["user_ids"])).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
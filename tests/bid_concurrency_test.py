@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+import random
+import sys
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi import HTTPException
+
+from app.api.bids import place_bid
+from app.core.auction_cache import auction_cache
+from app.core.database import SessionLocal
+from app.core.security import get_password_hash
+from app.models import Bid, BidStatus, Category, Product, ProductStatus, User, UserRole
+from app.schemas import BidCreate
+
+
+PRODUCT_COUNT = 4
+BIDDER_COUNT = 12
+BIDS_PER_BIDDER = 40
+
+
+def print_step(message: str) -> None:
+    print(f"[STEP] {message}")
+
+
+def bidder_loop(user_id: int, product_ids: list[int]) -> dict:
+    counts = {"accepted": 0, "rejected": 0, "conflict": 0}
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.id == user_id).one()
+        attempts = idle = 0
+        while attempts < BIDS_PER_BIDDER and idle < 200:
+            # Bidding where this bidder already leads would only raise its ceiling, not the price
+            states = [auction_cache.load(db, product_id) for product_id in product_ids]
+            open_states = [state for state in states if state.leading_bidder_id != user_id]
+            if not open_states:
+                # Leading everywhere; give the other bidders a turn
+                db.rollback()
+                idle += 1
+                time.sleep(0.01)
+                continue
+            attempts, idle = attempts + 1, 0
+            state = random.choice(open_states)
+            product_id = state.product_id
+            amount = state.min_required + state.min_increment * random.randint(0, 2)
+            try:
+                place_bid(BidCreate(product_id=product_id, amount=amount), db, user)
+                counts["accepted"] += 1
+            except HTTPException as exc:
+                db.rollback()
+                counts["conflict" if exc.status_code == 409 else "rejected"] += 1
+    finally:
+        db.close()
+    return counts
+
+
+def check_invariants(db, product: Product) -> None:
+    bids = db.query(Bid).filter(Bid.product_id == product.id).order_by(Bid.id.asc()).all()
+    if not bids:
+        assert product.leading_bid_id is None
+        assert product.current_price == product.starting_price
+        return
+
+    leader = max(bids, key=lambda b: b.amount)
+    assert product.leading_bid_id == leader.id, (product.leading_bid_id, leader.id)
+    assert product.current_price == leader.amount, (product.current_price, leader.amount)
+
+    pending = [b for b in bids if b.status == BidStatus.PENDING]
+    assert [b.id for b in pending] == [leader.id], [b.id for b in pending]
+
+    # Bids are committed in price order, each clearing the previous one by the increment
+    assert bids[0].amount >= product.starting_price
+    for previous, current in zip(bids, bids[1:]):
+        assert current.amount >= previous.amount + product.min_increment, (previous, current)
+
+
+def main() -> None:
+    db = SessionLocal()
+    suffix = int(datetime.utcnow().timestamp())
+    created = {"user_ids": [], "product_ids": [], "category_id": None}
+    try:
+        print_step("Create seller, bidders and products")
+        password_hash = get_password_hash("password123")
+        seller = User(
+            email=f"stress_seller_{suffix}@bidbay.com",
+            password_hash=password_hash,
+            full_name="Stress Seller",
+            role=UserRole.SELLER,
+        )
+        bidders = [
+            User(
+                email=f"stress_buyer{i}_{suffix}@bidbay.com",
+                password_hash=password_hash,
+                full_name=f"Stress Buyer {i}",
+                role=UserRole.BUYER,
+            )
+            for i in range(BIDDER_COUNT)
+        ]
+        db.add_all([seller, *bidders])
+        db.commit()
+        created["user_ids"] = [seller.id] + [b.id for b in bidders]
+
+        category = Category(name=f"Stress Category {suffix}")
+        db.add(category)
+        db.commit()
+        created["category_id"] = category.id
+
+        products = [
+            Product(
+                seller_id=seller.id,
+                category_id=category.id,
+                title=f"Stress Product {i} {suffix}",
+                starting_price=Decimal("100.00"),
+                min_increment=Decimal("5.00"),
+                auction_end_at=datetime.utcnow() + timedelta(days=1),
+                status=ProductStatus.ACTIVE,
+            )
+            for i in range(PRODUCT_COUNT)
+        ]
+        db.add_all(products)
+        db.commit()
+        created["product_ids"] = [p.id for p in products]
+        bidder_ids = [b.id for b in bidders]
+        db.commit()
+
+        print_step(f"Run {BIDDER_COUNT} concurrent bidders across {PRODUCT_COUNT} products")
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=BIDDER_COUNT) as pool:
+            results = list(pool.map(lambda user_id: bidder_loop(user_id, created["product_ids"]), bidder_ids))
+        elapsed = time.perf_counter() - started
+
+        totals = {key: sum(r[key] for r in results) for key in ("accepted", "rejected", "conflict")}
+        attempts = sum(totals.values())
+        print(
+            f"[INFO] attempts={attempts} accepted={totals['accepted']} rejected={totals['rejected']} "
+            f"conflict={totals['conflict']} elapsed={elapsed:.2f}s"
+        )
+        print(f"[INFO] {attempts / elapsed:.1f} bids/sec attempted, {totals['accepted'] / elapsed:.1f} bids/sec accepted")
+
+        print_step("Verify price and leader invariants")
+        db.expire_all()
+        for product in db.query(Product).filter(Product.id.in_(created["product_ids"])).all():
+            check_invariants(db, product)
+        accepted = db.query(Bid).filter(Bid.product_id.in_(created["product_ids"])).count()
+        assert accepted == totals["accepted"], (accepted, totals["accepted"])
+
+        print_step("Bid concurrency test completed successfully")
+    finally:
+        print_step("Cleaning up bid concurrency test data")
+        db.rollback()
+        if created["product_ids"]:
+            db.query(Product).filter(Product.id.in_(created["product_ids"])).update(
+                {Product.leading_bid_id: None, Product.accepted_bid_id: None}, synchronize_session=False
+            )
+            db.query(Bid).filter(Bid.product_id.in_(created["product_ids"])).delete(synchronize_session=False)
+            db.query(Product).filter(Product.id.in_(created["product_ids"])).delete(synchronize_session=False)
+        if created["category_id"]:
+            db.query(Category).filter(Category.id == created["category_id"]).delete()
+        if created["user_ids"]:
+            db.query(User).filter(User.id.in_(created["user_ids"])).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+        for product_id in created["product_ids"]:
+            auction_cache.invalidate(product_id)
+
+
+if __name__ == "__main__":
+    main()
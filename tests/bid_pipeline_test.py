@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import sys
+import threading
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from pydantic import ValidationError
+
+from app.core.config import Settings
+from app.core.group_commit import GroupCommitter
+from app.core.sequencer import KeyedSequencer
+
+
+KEYS = 4
+ITEMS_PER_KEY = 50
+
+
+def print_step(message: str) -> None:
+    print(f"[STEP] {message}")
+
+
+def check_sequencer_order() -> None:
+    lock = threading.Lock()
+    seen: dict[int, list[int]] = {key: [] for key in range(KEYS)}
+    running: set[int] = set()
+    batches = []
+
+    def handler(key, items):
+        with lock:
+            assert key not in running, f"two batches for key {key} ran at once"
+            running.add(key)
+        time.sleep(0.001)
+        with lock:
+            seen[key].extend(items)
+            batches.append(len(items))
+            running.discard(key)
+        return [item * 10 for item in items]
+
+    sequencer = KeyedSequencer(handler, max_workers=KEYS, max_batch=8)
+    futures = []
+    for i in range(ITEMS_PER_KEY):
+        for key in range(KEYS):
+            futures.append((i, sequencer.submit(key, i)))
+    for i, future in futures:
+        assert future.result(timeout=10) == i * 10
+    sequencer.shutdown()
+    for key, items in seen.items():
+        assert items == list(range(ITEMS_PER_KEY)), (key, items)
+    assert max(batches) <= 8 and len(batches) < KEYS * ITEMS_PER_KEY, batches
+    print(f"[INFO] {len(batches)} batches for {KEYS * ITEMS_PER_KEY} items")
+
+
+def check_sequencer_errors() -> None:
+    def handler(key, items):
+        if key == "broken":
+            raise RuntimeError("database went away")
+        return [ValueError(f"bad {item}") if item < 0 else item for item in items]
+
+    sequencer = KeyedSequencer(handler, max_workers=2)
+    good, bad, broken = sequencer.submit("k", 1), sequencer.submit("k", -1), sequencer.submit("broken", 1)
+    assert good.result(timeout=10) == 1
+    assert isinstance(bad.exception(timeout=10), ValueError)
+    assert str(broken.exception(timeout=10)) == "database went away"
+    sequencer.shutdown()
+
+
+def check_group_commit() -> None:
+    batches = []
+
+    def handler(items):
+        batches.append(list(items))
+        if "fail-all" in items:
+            raise RuntimeError("commit failed")
+        return [ValueError(item) if item.startswith("bad") else item.upper() for item in items]
+
+    committer = GroupCommitter(handler, window_seconds=0.05, max_batch=4)
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        futures = list(pool.map(committer.submit, ["a", "b", "bad-c", "d", "e", "f"]))
+    assert futures[0].result(timeout=10) == "A" and futures[5].result(timeout=10) == "F"
+    assert isinstance(futures[2].exception(timeout=10), ValueError)
+    assert all(len(batch) <= 4 for batch in batches) and len(batches) < 6, batches
+    print(f"[INFO] batches: {batches}")
+
+    failing = committer.submit("fail-all")
+    assert str(failing.exception(timeout=10)) == "commit failed"
+    committer.shutdown()
+
+
+def main() -> None:
+    print_step("Sequencer runs each key's items in submission order, one batch at a time")
+    check_sequencer_order()
+
+    print_step("Sequencer hands per-item errors and whole-batch failures back to callers")
+    check_sequencer_errors()
+
+    print_step("Group committer batches items within a window and routes results and errors per item")
+    check_group_commit()
+
+    print_step("Settings refuse the sequencer and group commit together")
+    try:
+        Settings(DATABASE_URL="sqlite://", SECRET_KEY="x", BID_SEQUENCER_ENABLED=True, BID_GROUP_COMMIT_ENABLED=True)
+        raise AssertionError("conflicting bid writers were accepted")
+    except ValidationError as exc:
+        assert "cannot both be set" in str(exc)
+
+    print_step("Bid pipeline test completed successfully")
+
+
+if __name__ == "__main__":
+    main()
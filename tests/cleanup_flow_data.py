@@ -30,13 +30,16 @@ def main() -> None:
         bids = db.query(Bid).filter(Bid.bidder_id.in_(user_ids)).all() if user_ids else []
         bid_ids = [b.id for b in bids]
 
-        print_step("Clear accepted_bid_id references")
+        print_step("Clear accepted_bid_id and leading_bid_id references")
         if bid_ids:
             db.query(Product).filter(Product.accepted_bid_id.in_(bid_ids)).update(
                 {Product.accepted_bid_id: None}, synchronize_session=False
             )
+            db.query(Product).filter(Product.leading_bid_id.in_(bid_ids)).update(
+                {Product.leading_bid_id: None}, synchronize_session=False
+            )
         db.query(Product).filter(Product.title == FLOW_PRODUCT_TITLE).update(
-            {Product.accepted_bid_id: None}, synchronize_session=False
+            {Product.accepted_bid_id: None, Product.leading_bid_id: None}, synchronize_session=False
         )
         db.commit()
 
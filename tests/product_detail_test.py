@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.api.bids import place_bid
+from app.api.products import get_product_detail
+from app.core.database import SessionLocal
+from app.core.security import get_password_hash
+from app.models import Bid, Category, Product, ProductStatus, User, UserRole
+from app.schemas import BidCreate
+
+
+def print_step(message: str) -> None:
+    print(f"[STEP] {message}")
+
+
+def main() -> None:
+    db = SessionLocal()
+    created = {"product_id": None, "category_id": None, "user_ids": []}
+    suffix = int(datetime.utcnow().timestamp())
+    try:
+        print_step("Create seller, buyer and product")
+        seller = User(
+            email=f"detail_seller_{suffix}@bidbay.com",
+            password_hash=get_password_hash("password123"),
+            full_name="Detail Seller",
+            role=UserRole.SELLER,
+        )
+        buyer = User(
+            email=f"detail_buyer_{suffix}@bidbay.com",
+            password_hash=get_password_hash("password123"),
+            full_name="Detail Buyer",
+            role=UserRole.BUYER,
+        )
+        db.add_all([seller, buyer])
+        category = Category(name=f"Detail Category {suffix}")
+        db.add(category)
+        db.commit()
+        created["user_ids"] = [seller.id, buyer.id]
+        created["category_id"] = category.id
+        product = Product(
+            seller_id=seller.id,
+            category_id=category.id,
+            title=f"Detail Test Product {suffix}",
+            starting_price=Decimal("10.00"),
+            min_increment=Decimal("1.00"),
+            auction_end_at=datetime.utcnow() + timedelta(days=1),
+            status=ProductStatus.ACTIVE,
+        )
+        db.add(product)
+        db.commit()
+        created["product_id"] = product.id
+        print(f"[INFO] Product created: id={product.id}")
+
+        print_step("Place a proxy bid with a secret ceiling")
+        bid = place_bid(BidCreate(product_id=product.id, amount=Decimal("11.00"), max_amount=Decimal("500.00")), db, buyer)
+        print(f"[INFO] Bid placed: id={bid.id}, amount={bid.amount}, max_amount={bid.max_amount}")
+
+        print_step("Anonymous detail shows the high bid without bidder or ceiling")
+        detail = get_product_detail(product.id, db, None).model_dump(mode="json")
+        high_bid = detail["high_bid"]
+        print(f"[INFO] high_bid={high_bid}")
+        assert set(high_bid) == {"id", "amount", "status", "created_at"}, high_bid
+        assert high_bid["id"] == bid.id and Decimal(high_bid["amount"]) == Decimal("11.00")
+        assert "500" not in str(detail)
+
+        print_step("Product detail test completed successfully")
+    finally:
+        print_step("Cleaning up product detail test data")
+        db.rollback()
+        if created["product_id"]:
+            db.query(Product).filter(Product.id == created["product_id"]).update({Product.leading_bid_id: None})
+            db.query(Bid).filter(Bid.product_id == created["product_id"]).delete()
+            db.query(Product).filter(Product.id == created["product_id"]).delete()
+        if created["category_id"]:
+            db.query(Category).filter(Category.id == created["category_id"]).delete()
+        if created["user_ids"]:
+            db.query(User).filter(User.id.in_(created["user_ids"])).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
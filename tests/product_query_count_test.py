@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi import Request, Response
+from sqlalchemy import event
+
+from app.api.products import get_product, list_products
+from app.core.database import SessionLocal, engine
+from app.core.security import get_password_hash
+from app.models import Category, Product, ProductImage, ProductStatus, User, UserRole
+from app.schemas import Page, ProductResponse, ProductSort
+
+
+PRODUCT_COUNT = 30
+IMAGES_PER_PRODUCT = 3
+
+
+def print_step(message: str) -> None:
+    print(f"[STEP] {message}")
+
+
+def plain_request() -> Request:
+    return Request({"type": "http", "method": "GET", "headers": []})
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def list_and_serialize(category_id: int, limit: int) -> tuple[int, Page[ProductResponse]]:
+    """Run list_products and serialize it the way FastAPI would; return the SQL statement count."""
+    db = SessionLocal()
+    try:
+        with count_statements() as statements:
+            result = list_products(
+                plain_request(),
+                Response(),
+                db,
+                status_filter=None,
+                category_id=category_id,
+                seller_id=None,
+                q=None,
+                sort=ProductSort.NEWEST,
+                cursor=None,
+                limit=limit,
+            )
+            if isinstance(result, Response):  # rendered by the result cache
+                page = Page[ProductResponse].model_validate_json(result.body)
+            else:
+                page = Page[ProductResponse].model_validate(result)
+        return len(statements), page
+    finally:
+        db.close()
+
+
+def main() -> None:
+    db = SessionLocal()
+    created = {"seller_id": None, "category_id": None}
+    suffix = int(datetime.utcnow().timestamp())
+    try:
+        print_step("Create seller, category and products with images")
+        seller = User(
+            email=f"query_count_seller_{suffix}@bidbay.com",
+            password_hash=get_password_hash("password123"),
+            full_name="Query Count Seller",
+            role=UserRole.SELLER,
+        )
+        category = Category(name=f"Query Count Category {suffix}")
+        db.add_all([seller, category])
+        db.commit()
+        created["seller_id"] = seller.id
+        created["category_id"] = category.id
+
+        for i in range(PRODUCT_COUNT):
+            product = Product(
+                seller_id=seller.id,
+                category_id=category.id,
+                title=f"Query Count Product {suffix}-{i}",
+                starting_price=Decimal("10.00"),
+                auction_end_at=datetime.utcnow() + timedelta(days=1),
+                status=ProductStatus.ACTIVE,
+            )
+            product.images = [
+                ProductImage(image_url=f"https://img.bidbay.com/{suffix}/{i}/{n}.jpg", position=n)
+                for n in range(IMAGES_PER_PRODUCT)
+            ]
+            db.add(product)
+        db.commit()
+        print(f"[INFO] Created {PRODUCT_COUNT} products with {IMAGES_PER_PRODUCT} images each")
+
+        print_step("Statement count of list_products does not grow with page size")
+        counts = {}
+        for limit in (1, 10, PRODUCT_COUNT):
+            counts[limit], page = list_and_serialize(category.id, limit)
+            assert len(page.items) == limit
+            assert all(len(item.images) == IMAGES_PER_PRODUCT for item in page.items)
+            print(f"[INFO] limit={limit}: {counts[limit]} statements")
+        assert len(set(counts.values())) == 1, counts
+        assert counts[PRODUCT_COUNT] <= 2, counts
+
+        print_step("get_product loads its images in a bounded number of statements")
+        product_id = page.items[0].id
+        with count_statements() as statements:
+            response = ProductResponse.model_validate(get_product(product_id, plain_request(), Response(), db))
+        assert len(response.images) == IMAGES_PER_PRODUCT
+        # Version, product and images; the version comes first so coalesced reads are never older than it
+        assert len(statements) <= 3, statements
+        print(f"[INFO] get_product: {len(statements)} statements")
+
+        print_step("Product query count test completed successfully")
+    finally:
+        print_step("Cleaning up query count test data")
+        db.rollback()
+        if created.get("seller_id"):
+            product_ids = [p.id for p in db.query(Product.id).filter(Product.seller_id == created["seller_id"])]
+            db.query(ProductImage).filter(ProductImage.product_id.in_(product_ids)).delete(synchronize_session=False)
+            db.query(Product).filter(Product.id.in_(product_ids)).delete(synchronize_session=False)
+            db.query(User).filter(User.id == created["seller_id"]).delete()
+        if created.get("category_id"):
+            db.query(Category).filter(Category.id == created["category_id"]).delete()
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.models import Bid, BidStatus
+from app.schemas import BidResponse, OwnBidResponse
+from app.utils.proxy_bidding import ProxyBid, resolve_proxy_bids
+
+
+INCREMENT = Decimal("1.00")
+
+
+def print_step(message: str) -> None:
+    print(f"[STEP] {message}")
+
+
+def check(incumbent, challengers, current_price, expected_winner, expected_price) -> None:
+    resolution = resolve_proxy_bids(incumbent, challengers, Decimal(current_price), INCREMENT)
+    assert resolution.winner == expected_winner, resolution
+    assert resolution.price == Decimal(expected_price), resolution
+    print(f"[INFO] winner=bidder {resolution.winner.bidder_id} price={resolution.price}")
+
+
+def main() -> None:
+    leader = ProxyBid(bidder_id=1, amount=Decimal("10.00"), max_amount=Decimal("50.00"), seq=-1)
+
+    print_step("First bid on an empty auction pays what it entered")
+    first = ProxyBid(bidder_id=2, amount=Decimal("15.00"), max_amount=Decimal("40.00"), seq=0)
+    check(None, [first], "10.00", first, "15.00")
+
+    print_step("Leader's proxy defends one increment over the challenger's ceiling")
+    weaker = ProxyBid(bidder_id=2, amount=Decimal("20.00"), max_amount=Decimal("30.00"), seq=0)
+    check(leader, [weaker], "10.00", leader, "31.00")
+
+    print_step("Challenger with a higher ceiling takes the lead one increment over the leader's ceiling")
+    stronger = ProxyBid(bidder_id=2, amount=Decimal("20.00"), max_amount=Decimal("100.00"), seq=0)
+    check(leader, [stronger], "10.00", stronger, "51.00")
+
+    print_step("Equal ceilings go to the earlier bid, capped at its ceiling")
+    equal = ProxyBid(bidder_id=2, amount=Decimal("20.00"), max_amount=Decimal("50.00"), seq=0)
+    check(leader, [equal], "10.00", leader, "50.00")
+    early = ProxyBid(bidder_id=3, amount=Decimal("20.00"), max_amount=Decimal("60.00"), seq=0)
+    late = ProxyBid(bidder_id=4, amount=Decimal("25.00"), max_amount=Decimal("60.00"), seq=1)
+    check(leader, [late, early], "10.00", early, "60.00")
+
+    print_step("Winner never pays less than it entered")
+    high_entry = ProxyBid(bidder_id=2, amount=Decimal("40.00"), max_amount=Decimal("40.00"), seq=0)
+    low_ceiling = ProxyBid(bidder_id=3, amount=Decimal("20.00"), max_amount=Decimal("30.00"), seq=1)
+    check(None, [high_entry, low_ceiling], "10.00", high_entry, "40.00")
+
+    print_step("Leader raising their own ceiling keeps the current price")
+    raise_own = ProxyBid(bidder_id=1, amount=Decimal("11.00"), max_amount=Decimal("80.00"), seq=0)
+    check(leader, [raise_own], "10.00", raise_own, "10.00")
+    ceiling_only = ProxyBid(bidder_id=1, amount=Decimal("1.00"), max_amount=Decimal("80.00"), seq=0)
+    check(leader, [ceiling_only], "10.00", ceiling_only, "10.00")
+    rival = ProxyBid(bidder_id=2, amount=Decimal("20.00"), max_amount=Decimal("60.00"), seq=1)
+    check(leader, [ceiling_only, rival], "10.00", ceiling_only, "61.00")
+
+    print_step("Many challengers settle in one pass against the strongest two")
+    crowd = [
+        ProxyBid(bidder_id=10 + i, amount=Decimal("11.00"), max_amount=Decimal(20 + i), seq=i) for i in range(20)
+    ]
+    check(leader, crowd, "10.00", leader, "40.00")
+
+    print_step("Proxy ceiling is visible to the bidder only")
+    bid = Bid(id=1, product_id=1, bidder_id=2, amount=Decimal("11.00"), max_amount=Decimal("500.00"),
+              status=BidStatus.PENDING, created_at=datetime.utcnow())
+    assert "max_amount" not in BidResponse.model_validate(bid).model_dump()
+    assert OwnBidResponse.model_validate(bid).max_amount == Decimal("500.00")
+
+    print_step("Proxy bidding test completed successfully")
+
+
+if __name__ == "__main__":
+    main()
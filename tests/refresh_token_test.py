@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi import HTTPException
+from fastapi.security import OAuth2PasswordRequestForm
+
+from app.api.auth import login, logout, refresh
+from app.api.deps import get_current_user
+from app.core.database import SessionLocal
+from app.core.refresh_tokens import issue_refresh_token, revoke_refresh_family
+from app.core.security import get_password_hash
+from app.models import RefreshToken, RevokedToken, User, UserRole
+from app.schemas import RefreshRequest
+
+
+def print_step(message: str) -> None:
+    print(f"[STEP] {message}")
+
+
+def assert_refused(db, refresh_token: str) -> None:
+    try:
+        refresh(RefreshRequest(refresh_token=refresh_token), db)
+    except HTTPException as exc:
+        assert exc.status_code == 401, exc.detail
+        return
+    raise AssertionError("refresh token was accepted")
+
+
+def main() -> None:
+    db = SessionLocal()
+    created = {"user_id": None}
+    suffix = int(datetime.utcnow().timestamp())
+    email = f"refresh_{suffix}@bidbay.com"
+    form = OAuth2PasswordRequestForm(username=email, password="password123")
+    try:
+        print_step("Create user and log in")
+        user = User(
+            email=email,
+            password_hash=get_password_hash("password123"),
+            full_name="Refresh User",
+            role=UserRole.BUYER,
+        )
+        db.add(user)
+        db.commit()
+        created["user_id"] = user.id
+        first = login(form, db)
+        assert first.refresh_token
+        print(f"[INFO] User created and logged in: id={user.id}")
+
+        print_step("Refresh token is stored only as a hash")
+        assert db.query(RefreshToken).filter(RefreshToken.token_hash == first.refresh_token).count() == 0
+        assert db.query(RefreshToken).filter(RefreshToken.user_id == user.id).count() == 1
+
+        print_step("Refresh rotates: new access token works, new refresh token differs")
+        second = refresh(RefreshRequest(refresh_token=first.refresh_token), db)
+        assert second.refresh_token != first.refresh_token
+        assert get_current_user(db, second.access_token).id == user.id
+
+        print_step("Refresh token works exactly once; replay revokes the whole family")
+        assert_refused(db, first.refresh_token)
+        assert_refused(db, second.refresh_token)
+        family = db.query(RefreshToken).filter(RefreshToken.user_id == user.id).all()
+        assert len(family) == 2 and all(row.revoked_at is not None for row in family)
+        db.rollback()
+
+        print_step("Another session of the same user is unaffected by the replay")
+        other = login(form, db)
+        assert refresh(RefreshRequest(refresh_token=other.refresh_token), db).refresh_token
+
+        print_step("Unknown, expired and revoked refresh tokens are refused")
+        assert_refused(db, "not-a-refresh-token")
+        expired, _ = issue_refresh_token(db, user.id)
+        db.flush()
+        newest = db.query(RefreshToken).filter(RefreshToken.user_id == user.id).order_by(RefreshToken.id.desc()).first()
+        newest.expires_at = datetime.utcnow() - timedelta(seconds=1)
+        db.commit()
+        assert_refused(db, expired)
+        revoked, family_id = issue_refresh_token(db, user.id)
+        revoke_refresh_family(db, family_id)
+        db.commit()
+        assert_refused(db, revoked)
+
+        print_step("Logout revokes the session's refresh tokens")
+        session = login(form, db)
+        logout(db, session.access_token)
+        assert_refused(db, session.refresh_token)
+
+        print_step("Refresh token test completed successfully")
+    finally:
+        print_step("Cleaning up refresh token test data")
+        db.rollback()
+        if created["user_id"]:
+            db.query(RefreshToken).filter(RefreshToken.user_id == created["user_id"]).delete()
+            db.query(RevokedToken).filter(RevokedToken.user_id == created["user_id"]).delete()
+            db.query(User).filter(User.id == created["user_id"]).delete()
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi import HTTPException
+
+from app.api.auth import logout
+from app.api.deps import get_current_user, require_role, token_cache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.revocation import RevocationList
+from app.core.security import create_access_token, get_password_hash
+from app.models import RevokedToken, User, UserRole
+from app.utils.bloom import BloomFilter
+
+
+def print_step(message: str) -> None:
+    print(f"[STEP] {message}")
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def revoke(user_id: int, jti: str, expires_at: datetime) -> None:
+    """Insert a revocation from its own session, the way another worker would."""
+    other = SessionLocal()
+    try:
+        other.add(RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at))
+        other.commit()
+    finally:
+        other.close()
+
+
+def main() -> None:
+    db = SessionLocal()
+    created = {"user_id": None}
+    suffix = int(datetime.utcnow().timestamp())
+    prefix = f"revtest-{suffix}-"
+    try:
+        print_step("Create user")
+        user = User(
+            email=f"revocation_{suffix}@bidbay.com",
+            password_hash=get_password_hash("password123"),
+            full_name="Revocation User",
+            role=UserRole.BUYER,
+        )
+        db.add(user)
+        db.commit()
+        created["user_id"] = user.id
+        print(f"[INFO] User created: id={user.id}")
+
+        print_step("A trusted role claim admits the caller without loading the user")
+        token = create_access_token({"sub": user.id, "role": user.role.value})
+        settings.AUTH_TRUST_TOKEN_ROLE = True
+        try:
+            claimed = require_role([UserRole.BUYER])(db, token)
+            assert claimed.id == user.id and claimed.role == UserRole.BUYER and claimed.email is None
+            assert require_role([UserRole.BUYER], fresh=True)(db, token).email == user.email
+            try:
+                require_role([UserRole.SELLER])(db, token)
+                raise AssertionError("buyer claim was admitted as a seller")
+            except HTTPException as exc:
+                assert exc.status_code == 403
+        finally:
+            settings.AUTH_TRUST_TOKEN_ROLE = False
+        db.rollback()
+
+        print_step("Logged-out token is refused even though its payload is cached")
+        token = create_access_token({"sub": user.id, "role": user.role.value})
+        assert get_current_user(db, token).id == user.id
+        hits = token_cache.hits
+        assert get_current_user(db, token).id == user.id
+        assert token_cache.hits == hits + 1, "second request should be served from the token cache"
+        logout(db, token)
+        hits = token_cache.hits
+        try:
+            get_current_user(db, token)
+            raise AssertionError("revoked token was accepted")
+        except HTTPException as exc:
+            assert exc.status_code == 401
+        assert token_cache.hits == hits + 1, "the refused request still read its payload from the cache"
+        db.rollback()
+
+        clock = FakeClock()
+        revocations = RevocationList(capacity=16, error_rate=0.01, sync_seconds=5, clock=clock)
+        assert not revocations.is_revoked(db, f"{prefix}warmup")
+        db.rollback()
+
+        print_step("Filter hits that are not in the table fall through to the exact check")
+        # add() puts a jti in the filter without a row, exactly what a false positive looks like
+        revocations.add(f"{prefix}ghost")
+        table_checks = revocations.table_checks
+        assert not revocations.is_revoked(db, f"{prefix}ghost")
+        assert revocations.table_checks == table_checks + 1
+        db.rollback()
+
+        print_step("Sync picks up revocations committed by another session")
+        expires_at = datetime.utcnow() + timedelta(hours=1)
+        revoke(user.id, f"{prefix}remote", expires_at)
+        assert not revocations.is_revoked(db, f"{prefix}remote"), "applied before the sync interval passed"
+        db.rollback()
+        clock.now += 5
+        assert revocations.is_revoked(db, f"{prefix}remote")
+        print(f"[INFO] {revocations.stats()}")
+        db.rollback()
+
+        print_step("Rebuild past capacity keeps only unexpired revocations")
+        overflow = revocations.stats()["capacity"] + 1
+        expired_at = datetime.utcnow() - timedelta(minutes=1)
+        for i in range(overflow):
+            revoke(user.id, f"{prefix}expired-{i}", expired_at)
+        clock.now += 5
+        assert not revocations.is_revoked(db, f"{prefix}warmup")
+        db.rollback()
+        unexpired = db.query(RevokedToken).filter(RevokedToken.expires_at > datetime.utcnow()).count()
+        stats = revocations.stats()
+        print(f"[INFO] {stats}, unexpired rows={unexpired}")
+        assert stats["entries"] == unexpired, stats
+        assert revocations.is_revoked(db, f"{prefix}remote")
+        db.rollback()
+
+        print_step("Bloom filter has no false negatives and about the configured false positive rate")
+        bloom = BloomFilter(1000, 0.01)
+        for i in range(1000):
+            bloom.add(f"member-{i}")
+        assert all(f"member-{i}" in bloom for i in range(1000))
+        false_positives = sum(f"stranger-{i}" in bloom for i in range(10000))
+        print(f"[INFO] false positives: {false_positives}/10000")
+        assert false_positives < 300, false_positives
+
+        print_step("Revocation test completed successfully")
+    finally:
+        print_step("Cleaning up revocation test data")
+        db.rollback()
+        if created["user_id"]:
+            db.query(RevokedToken).filter(RevokedToken.user_id == created["user_id"]).delete()
+            db.query(User).filter(User.id == created["user_id"]).delete()
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
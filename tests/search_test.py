@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi import HTTPException
+
+from app.api.products import product_facets
+from app.core.database import SessionLocal
+from app.core.search import SearchFilters, search_backend
+from app.core.security import get_password_hash
+from app.models import Category, Product, ProductStatus, User, UserRole
+from app.utils.inverted_index import InvertedIndex
+
+
+def print_step(message: str) -> None:
+    print(f"[STEP] {message}")
+
+
+def search(db, q: str, cursor: str | None = None, limit: int = 20, **filters) -> dict:
+    result = search_backend.search(db, q, SearchFilters(**filters), cursor, limit)
+    db.rollback()
+    return result
+
+
+def ids(page: dict) -> list[int]:
+    return [p.id for p in page["items"]]
+
+
+def main() -> None:
+    db = SessionLocal()
+    created = {"product_ids": [], "category_id": None, "user_id": None}
+    suffix = int(datetime.utcnow().timestamp())
+    # Words no other product uses, so results are only this test's products
+    word, other = f"lantern{suffix}", f"copper{suffix}"
+    try:
+        print_step("Create seller and category")
+        seller = User(email=f"search_seller_{suffix}@bidbay.com", password_hash=get_password_hash("password123"),
+                      full_name="Search Seller", role=UserRole.SELLER)
+        db.add(seller)
+        category = Category(name=f"Search Category {suffix}")
+        db.add(category)
+        db.commit()
+        created["user_id"] = seller.id
+        created["category_id"] = category.id
+        # Warm the index before products exist, so the rest depends on commit-time updates
+        search(db, word)
+
+        def product(title: str, description: str | None = None) -> Product:
+            return Product(
+                seller_id=seller.id,
+                category_id=category.id,
+                title=title,
+                description=description,
+                starting_price=Decimal("10.00"),
+                min_increment=Decimal("1.00"),
+                auction_end_at=datetime.utcnow() + timedelta(days=1),
+                status=ProductStatus.ACTIVE,
+            )
+
+        print_step("Products are searchable once committed, not when flushed or rolled back")
+        draft = product(f"Brass {word}")
+        db.add(draft)
+        db.flush()
+        assert ids(search_backend.search(db, word, SearchFilters(), None, 20)) == []
+        db.rollback()
+        assert ids(search(db, word)) == []
+
+        in_title = product(f"Brass {word}", "Old ship lamp")
+        in_description = product("Ship lamp", f"Works like a {word}")
+        both = product(f"{word} {other}", f"A {other} {word}")
+        db.add_all([in_title, in_description, both])
+        db.commit()
+        created["product_ids"] = [in_title.id, in_description.id, both.id]
+        assert set(ids(search(db, word))) == set(created["product_ids"])
+
+        print_step("Results are ranked by BM25, title matches above description matches")
+        ranked = ids(search(db, f"{word} {other}"))
+        print(f"[INFO] ranking: {ranked}")
+        assert ranked == [both.id, in_title.id, in_description.id], ranked
+
+        print_step("Cursors page through the same order without repeats")
+        pages, cursor = [], None
+        while True:
+            page = search(db, f"{word} {other}", cursor, limit=1)
+            pages.extend(ids(page))
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert pages == ranked, pages
+        try:
+            search(db, word, "not-a-cursor")
+            raise AssertionError("invalid cursor was accepted")
+        except HTTPException as exc:
+            assert exc.status_code == 400
+
+        print_step("Committed updates and status filters are applied")
+        in_description.description = "Works like a candle"
+        in_title.status = ProductStatus.EXPIRED
+        db.commit()
+        assert ids(search(db, word)) == [both.id, in_title.id]
+        assert ids(search(db, word, status=ProductStatus.ACTIVE)) == [both.id]
+
+        print_step("Facets with q count only the matching products")
+        facets = product_facets(db, None, None, None, word)
+        assert facets.total == 2, facets
+        assert {(f.status, f.count) for f in facets.statuses} == {(ProductStatus.ACTIVE, 1), (ProductStatus.EXPIRED, 1)}
+        assert product_facets(db, ProductStatus.ACTIVE, category.id, None, word).total == 1
+        db.rollback()
+
+        print_step("Deleted products leave the index")
+        db.delete(both)
+        db.commit()
+        created["product_ids"].remove(both.id)
+        assert ids(search(db, other)) == []
+
+        print_step("BM25: rarer terms and shorter documents score higher")
+        index = InvertedIndex()
+        index.add(1, "red chair")
+        index.add(2, "red table")
+        index.add(3, "blue chair with a long description of its wooden legs")
+        index.add(4, "red lamp")
+        hits = index.search("red chair", 10)
+        assert [doc_id for _, doc_id in hits] == [1, 3, 4, 2], hits
+        assert index.search("red chair", 10, after=hits[1]) == hits[2:]
+
+        print_step("Search test completed successfully")
+    finally:
+        print_step("Cleaning up search test data")
+        db.rollback()
+        if created["product_ids"]:
+            db.query(Product).filter(Product.id.in_(created["product_ids"])).delete(synchronize_session=False)
+        if created["category_id"]:
+            db.query(Category).filter(Category.id == created["category_id"]).delete()
+        if created["user_id"]:
+            db.query(User).filter(User.id == created["user_id"]).delete()
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.database import SessionLocal
+from app.core.suggest import SuggestIndex
+from app.models import Product, ProductStatus
+from app.utils.prefix_index import BURST_SIZE, PrefixIndex
+
+
+def print_step(message: str) -> None:
+    print(f"[STEP] {message}")
+
+
+def brute_force(index: PrefixIndex, titles: dict[int, str], prefix: str, limit: int) -> list[int]:
+    """What `search` must return, computed by scanning every title."""
+    matches = [
+        doc_id for doc_id, title in titles.items()
+        if any(word.startswith(prefix) for word in title.lower().split())
+    ]
+    return sorted(matches, key=lambda doc_id: (-index.score(doc_id), -doc_id))[:limit]
+
+
+def node_at(index: PrefixIndex, prefix: str):
+    node = index._root
+    for char in prefix:
+        node = node.children[char]
+    return node
+
+
+def main() -> None:
+    print_step("Keys stay in one bucket until more than BURST_SIZE share it")
+    index = PrefixIndex(k=5)
+    titles: dict[int, str] = {}
+    # Every title has two words, so two keys
+    for doc_id in range(BURST_SIZE // 2):
+        titles[doc_id] = f"camera {doc_id}"
+        index.add(doc_id, titles[doc_id], score=doc_id % 7)
+    assert index._root.children is None and len(index._root.bucket) == BURST_SIZE
+    titles[100] = "camera 100"
+    index.add(100, titles[100])
+    assert index._root.children is not None and index._root.bucket == []
+
+    print_step("A busy prefix keeps splitting, one character per level")
+    for doc_id in range(101, 101 + 2 * BURST_SIZE):
+        titles[doc_id] = f"camcorder {doc_id}"
+        index.add(doc_id, titles[doc_id], score=doc_id % 5)
+    assert node_at(index, "cam").children is not None
+    for prefix in ["c", "cam", "camc", "came", "1", "10"]:
+        assert [doc_id for doc_id, _, _ in index.search(prefix)] == brute_force(index, titles, prefix, 5), prefix
+
+    print_step("Inner nodes cache their top k and keep it exact as scores grow")
+    cam = node_at(index, "cam")
+    first = [doc_id for doc_id, _, _ in index.search("cam")]
+    assert cam.top == first
+    index.bump(100, 50)
+    assert cam.top is not None and cam.top[0] == 100, cam.top
+    assert [doc_id for doc_id, _, _ in index.search("cam")] == brute_force(index, titles, "cam", 5)
+
+    print_step("Removing a document marks the lists holding it stale; they rebuild on the next lookup")
+    index.remove(100)
+    del titles[100]
+    assert cam.top is None
+    assert [doc_id for doc_id, _, _ in index.search("cam")] == brute_force(index, titles, "cam", 5)
+    assert cam.top is not None and 100 not in cam.top
+
+    print_step("Suggestions drop ended auctions lazily and follow bid counts")
+    db = SessionLocal()
+    try:
+        suggest = SuggestIndex(k=5, session_factory=SessionLocal)
+        suggest.load(db)
+        db.rollback()
+        suffix = int(datetime.utcnow().timestamp())
+        word = f"zeiss{suffix}"
+        now = datetime.utcnow()
+        # Transient products: the index reads their columns and never touches the database for them
+        lots = {
+            "ended": Product(id=2_000_000_001, title=f"{word} ended", status=ProductStatus.ACTIVE,
+                             auction_end_at=now - timedelta(seconds=1)),
+            "quiet": Product(id=2_000_000_002, title=f"{word} quiet", status=ProductStatus.ACTIVE,
+                             auction_end_at=now + timedelta(hours=1)),
+            "busy": Product(id=2_000_000_003, title=f"{word} busy", status=ProductStatus.ACTIVE,
+                            auction_end_at=now + timedelta(hours=1)),
+        }
+        for product in lots.values():
+            suggest.update_product(product)
+        suggest.record_bids(lots["ended"].id, 10)
+        hits = [product_id for product_id, _, _ in suggest.suggest(db, word, 5)]
+        assert hits == [lots["busy"].id, lots["quiet"].id], hits
+        assert lots["ended"].id not in suggest._index
+
+        suggest.record_bids(lots["quiet"].id, 3)
+        hits = [product_id for product_id, _, _ in suggest.suggest(db, word, 5)]
+        assert hits == [lots["quiet"].id, lots["busy"].id], hits
+
+        # A bid that extends the auction moves its end, so it is not dropped at the old one
+        extended = now + timedelta(hours=2)
+        suggest.record_bids(lots["busy"].id, 1, extended)
+        assert suggest._ends[lots["busy"].id] == extended
+
+        lots["busy"].status = ProductStatus.CLOSED
+        suggest.update_product(lots["busy"])
+        assert [product_id for product_id, _, _ in suggest.suggest(db, word, 5)] == [lots["quiet"].id]
+    finally:
+        db.rollback()
+        db.close()
+
+    print_step("Suggest test completed successfully")
+
+
+if __name__ == "__main__":
+    main()